@@ -50,6 +50,24 @@ if not CAMERAS:
     else:
         CAMERAS = [REMOTE_CAMERA_URL]
 
+def get_camera_options(index, entry):
+    """
+    Normalizes a CAMERAS entry into a dict with at least 'source' and 'name'.
+    Entries are either a plain source (index / URL) or an object with per-camera
+    settings, e.g. {"source": "rtsp://...", "name": "Caja", "analysis_fps": 5}.
+    """
+    if isinstance(entry, dict):
+        options = dict(entry)
+    else:
+        options = {'source': entry}
+    options.setdefault('name', f"Camera_{index+1}")
+    return options
+
+# Frames kept per camera in the shared memory ring buffer
+FRAME_BUFFER_SLOTS = get_env('FRAME_BUFFER_SLOTS', 4, int)
+# Max seconds a camera group waits for a new frame before re-checking its state
+FRAME_WAIT_TIMEOUT = get_env('FRAME_WAIT_TIMEOUT', 0.1, float)
+
 # Database
 POSTGRES_USER = get_env('POSTGRES_USER', 'admin')
 POSTGRES_PASSWORD = get_env('POSTGRES_PASSWORD', 'admin')
@@ -65,13 +83,83 @@ DATABASE_URL = get_env('DATABASE_URL', _default_db_url)
 SNAPSHOTS_DIR = get_env('SNAPSHOTS_DIR', 'data/snapshots')
 
 # General parameters
-FRAME_SKIP = get_env('FRAME_SKIP', 1, int)  # Capture every frame, adjust for testing
+FRAME_SKIP = get_env('FRAME_SKIP', 1, int)  # Analyze 1 of every N frames (others are grabbed but not decoded)
+ANALYSIS_FPS = get_env('ANALYSIS_FPS', 0, float)  # Max analyzed frames per second per camera (0 = no limit)
+STREAM_STATS_INTERVAL = get_env('STREAM_STATS_INTERVAL', 60, int)  # Seconds between capture/analysis fps reports
 CONFIDENCE_THRESHOLD = get_env('CONFIDENCE_THRESHOLD', 0.4, float)
+DETECTOR_BACKEND = get_env('DETECTOR_BACKEND', 'pytorch')  # pytorch, onnx (ONNX Runtime), openvino or onnx_int8; exported once to data/models
+
+INFERENCE_IMGSZ = get_env('INFERENCE_IMGSZ', 640, int)  # Detector input size (per camera: "imgsz" in CAMERAS_JSON)
+CAPTURE_RESIZE_WIDTH = get_env('CAPTURE_RESIZE_WIDTH', 0, int)  # Downscale frames to this width in the capture thread (0 = native)
+
+# Zone ROI inference: 'off' (full frame), 'crop' (padded box around all zones) or 'tiles' (one box per zone cluster)
+ZONE_ROI_MODE = get_env('ZONE_ROI_MODE', 'off')
+ZONE_ROI_PADDING = get_env('ZONE_ROI_PADDING', 0.15, float)  # Padding around zones, as a fraction of the frame height
+ZONE_ROI_MAX_TILES = get_env('ZONE_ROI_MAX_TILES', 4, int)
+
+# Zone membership: 'shapely' (polygon tests) or 'raster' (precomputed bitmask image, O(1) lookups)
+ZONE_CHECK_MODE = get_env('ZONE_CHECK_MODE', 'shapely')
+ZONE_RASTER_CELL = get_env('ZONE_RASTER_CELL', 1, int)  # Raster cell size in pixels
+ZONES_RELOAD_INTERVAL = get_env('ZONES_RELOAD_INTERVAL', 2.0, float)  # Seconds between checks of the zones file for edits (0 = never)
 HEADLESS = get_env('HEADLESS', 'False').lower() == 'true'
 
+# Motion gating: skip detection on static scenes without active tracks
+MOTION_GATING = get_env('MOTION_GATING', 'True').lower() == 'true'
+MOTION_WIDTH = get_env('MOTION_WIDTH', 160, int)  # Width (px) of the downscaled frame used for differencing
+MOTION_THRESHOLD = get_env('MOTION_THRESHOLD', 25, int)  # Gray level change that counts as motion
+MOTION_MIN_AREA = get_env('MOTION_MIN_AREA', 0.002, float)  # Fraction of changed pixels needed to trigger detection
+MOTION_HEARTBEAT = get_env('MOTION_HEARTBEAT', 10.0, float)  # Seconds between forced detections on static scenes
+
+# Occupancy-adaptive analysis rate (per camera: "adaptive_rate" in CAMERAS_JSON)
+ADAPTIVE_RATE = get_env('ADAPTIVE_RATE', 'False').lower() == 'true'
+IDLE_FPS = get_env('IDLE_FPS', 1.0, float)  # No tracks
+STATIONARY_FPS = get_env('STATIONARY_FPS', 3.0, float)  # Only people standing still away from zone edges
+ACTIVE_FPS = get_env('ACTIVE_FPS', 0.0, float)  # Someone moving or near a zone edge (0 = configured rate)
+BOUNDARY_MARGIN = get_env('BOUNDARY_MARGIN', 50.0, float)  # Pixels from a zone edge that count as "near"
+MOVING_SPEED = get_env('MOVING_SPEED', 30.0, float)  # Pixels per second that count as moving
+
+# Keyframe detection: run YOLO on 1 of every N analyzed frames and propagate tracks in between
+# (per camera: "keyframe_interval" in CAMERAS_JSON)
+KEYFRAME_INTERVAL = get_env('KEYFRAME_INTERVAL', 1, int)
+TRACK_PROPAGATION = get_env('TRACK_PROPAGATION', 'velocity')  # 'velocity' (constant velocity) or 'flow' (sparse optical flow)
+
+# Tracking records: 'frames' (every track, zone and frame) or 'transitions' (enter/exit plus
+# position samples every 1/ZONE_SAMPLE_FPS seconds while inside a zone)
+ZONE_EVENTS = get_env('ZONE_EVENTS', 'frames')
+ZONE_SAMPLE_FPS = get_env('ZONE_SAMPLE_FPS', 1.0, float)  # 0 = only transitions
+# Zone flapping: smoothed centroids and enter/exit hysteresis
+ZONE_SMOOTHING = get_env('ZONE_SMOOTHING', 1.0, float)  # Weight of the new centroid in its moving average (1 = no smoothing)
+ZONE_MIN_FRAMES = get_env('ZONE_MIN_FRAMES', 1, int)  # Consecutive frames before an enter/exit counts
+ZONE_MIN_DWELL = get_env('ZONE_MIN_DWELL', 0.0, float)  # Seconds before an enter/exit counts
+# Visits aggregated in the camera process (enter/exit, duration, activity) and sent to the 'visits' table
+DWELL_AGGREGATION = get_env('DWELL_AGGREGATION', 'False').lower() == 'true'
+DWELL_CHECKPOINT_INTERVAL = get_env('DWELL_CHECKPOINT_INTERVAL', 60.0, float)  # Seconds between updates of open visits
+TRACK_STATE_TTL = get_env('TRACK_STATE_TTL', 30.0, float)  # Seconds a lost track keeps its zone/identity state before it is closed
+
+# Inference servers: 0 = every camera group loads its own detector,
+# N = N detector processes shared by all groups (frames passed via shared memory)
+INFERENCE_SERVERS = get_env('INFERENCE_SERVERS', 0, int)
+INFERENCE_MAX_BATCH = get_env('INFERENCE_MAX_BATCH', 16, int)  # Max frames per detector batch
+INFERENCE_MAX_WAIT = get_env('INFERENCE_MAX_WAIT', 0.02, float)  # Max seconds the first frame waits for a batch to fill
+INFERENCE_THREADS = get_env('INFERENCE_THREADS', 0, int)  # torch threads per server (0 = torch default)
+INFERENCE_TIMEOUT = get_env('INFERENCE_TIMEOUT', 5.0, float)  # Seconds a group waits for a server answer
+
 # Face Recognition
 FACE_RECOGNITION_TOLERANCE = get_env('FACE_RECOGNITION_TOLERANCE', 0.5, float)  # Lower is stricter (0.6 default, 0.5 recommended)
 FACE_RECOGNITION_MIN_MATCHES = get_env('FACE_RECOGNITION_MIN_MATCHES', 3, int)  # Consecutive recognitions to confirm identity
+FACE_DETECTION_MODEL = get_env('FACE_DETECTION_MODEL', 'hog')  # 'hog' (CPU), 'cnn' (GPU, faces of a batch located together) or 'dnn' (OpenCV YuNet, CPU)
+FACE_DNN_MODEL = get_env('FACE_DNN_MODEL', '')  # YuNet .onnx for 'dnn' (default: data/models/face_detection_yunet.onnx)
+FACE_HEAD_FRACTION = get_env('FACE_HEAD_FRACTION', 1.0, float)  # Top part of the person box searched for a face (0.4 recommended)
+FACE_LOCATE_SIZE = get_env('FACE_LOCATE_SIZE', 0, int)  # Downscale the searched region to this longest side (0 = full size, 160 recommended)
+FACE_MIN_SIZE = get_env('FACE_MIN_SIZE', 0, int)  # Faces smaller than this (px) are not encoded, retried next frame (0 = off, 40 recommended)
+FACE_MIN_SHARPNESS = get_env('FACE_MIN_SHARPNESS', 0.0, float)  # Min Laplacian variance of the face (0 = off, 50 recommended)
+FACE_MAX_YAW = get_env('FACE_MAX_YAW', 0.0, float)  # Max nose offset from the eyes' midpoint, in eye distances (0 = off, 0.35 recommended)
+FACE_GALLERY_INDEX = get_env('FACE_GALLERY_INDEX', 'exact')  # 'exact' or 'ivf' (approximate, for thousands of employees)
+FACE_GALLERY_NPROBE = get_env('FACE_GALLERY_NPROBE', 8, int)  # IVF lists searched per face
+FACE_WORKERS = get_env('FACE_WORKERS', 0, int)  # Face recognition processes shared by all groups (0 = in the camera loop)
+FACE_QUEUE_SIZE = get_env('FACE_QUEUE_SIZE', 32, int)  # Max face requests waiting for the workers
+FACE_MAX_PENDING = get_env('FACE_MAX_PENDING', 64, int)  # Max faces in flight per camera group
+FACE_REQUEST_MAX_AGE = get_env('FACE_REQUEST_MAX_AGE', 2.0, float)  # Seconds before a waiting face request is dropped
 VERIFICATION_INTERVAL = get_env('VERIFICATION_INTERVAL', 30, int)  # Frame interval to re-verify identity
 
 # Security
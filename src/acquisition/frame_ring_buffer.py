@@ -0,0 +1,137 @@
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+
+class FrameRingBuffer:
+    """
+    Fixed-size ring of frames living in a single shared memory block.
+
+    Layout: [seq: int64 x slots][timestamps: float64 x slots][head: int64][frames: uint8 x slots x H x W x C]
+
+    The capture thread writes into the next free slot after the newest frame and
+    then publishes it, skipping the slots its readers still hold; readers (inference, snapshot writers, other processes that
+    attach by name) address frames by slot index and get numpy views into
+    the shared block, so no frame is ever copied or pickled.
+    A slot whose sequence number is -1 is being written.
+    """
+
+    def __init__(self, frame_shape, slots=4, name=None, create=True):
+        self.frame_shape = tuple(int(v) for v in frame_shape)
+        self.slots = int(slots)
+        self.frame_nbytes = int(np.prod(self.frame_shape))
+
+        header_nbytes = self.slots * 8 * 2 + 8
+        # Keep frame data 64-byte aligned
+        self._frames_offset = (header_nbytes + 63) // 64 * 64
+        size = self._frames_offset + self.slots * self.frame_nbytes
+
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            # Before 3.13 attaching also registers the block with this process'
+            # resource tracker, which would unlink it when we exit.
+            try:
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+            except Exception:
+                pass
+        self.name = self.shm.name
+        self.owner = create
+
+        buf = self.shm.buf
+        self._seq = np.ndarray((self.slots,), dtype=np.int64, buffer=buf, offset=0)
+        self._timestamps = np.ndarray((self.slots,), dtype=np.float64, buffer=buf, offset=self.slots * 8)
+        self._head = np.ndarray((1,), dtype=np.int64, buffer=buf, offset=self.slots * 16)
+        self._frames = np.ndarray((self.slots,) + self.frame_shape, dtype=np.uint8,
+                                  buffer=buf, offset=self._frames_offset)
+
+        if create:
+            self._seq[:] = -1
+            self._timestamps[:] = 0.0
+            self._head[0] = -1
+
+    @classmethod
+    def attach(cls, name, frame_shape, slots):
+        """Attaches to a buffer created by another process (see descriptor())."""
+        return cls(frame_shape, slots=slots, name=name, create=False)
+
+    def descriptor(self):
+        """Picklable description used by other processes to attach()."""
+        return {'name': self.name, 'frame_shape': self.frame_shape, 'slots': self.slots}
+
+    # --- Writer side ---
+
+    def reserve(self, held=()):
+        """
+        Returns (slot, view) for the next frame; the slot is marked as being written.
+        The newest frame and the slots in `held` (frames readers still use) are never
+        reused; returns (None, None) if no other slot is free.
+        """
+        latest = self.latest_slot()
+        start = -1 if latest is None else latest
+        for step in range(1, self.slots + 1):
+            slot = (start + step) % self.slots
+            if slot != latest and slot not in held:
+                self._seq[slot] = -1
+                return slot, self._frames[slot]
+        return None, None
+
+    def commit(self, slot, timestamp=None):
+        """Publishes a reserved slot as the newest frame. Returns its sequence number."""
+        seq = int(self._head[0]) + 1
+        self._timestamps[slot] = time.time() if timestamp is None else timestamp
+        self._seq[slot] = seq
+        self._head[0] = seq
+        return seq
+
+    def write(self, frame, timestamp=None):
+        """Copies an already decoded frame into the next slot and publishes it."""
+        slot, view = self.reserve()
+        np.copyto(view, frame)
+        return self.commit(slot, timestamp)
+
+    # --- Reader side ---
+
+    def latest_slot(self):
+        """Slot index of the newest published frame, or None if nothing was written yet."""
+        head = int(self._head[0])
+        if head < 0:
+            return None
+        # Slots are not written in order when some are held
+        slots = np.flatnonzero(self._seq == head)
+        return int(slots[0]) if slots.size else None
+
+    def head_seq(self):
+        return int(self._head[0])
+
+    def frame(self, slot):
+        """Zero-copy view of the frame stored in `slot`."""
+        return self._frames[slot]
+
+    def seq(self, slot):
+        return int(self._seq[slot])
+
+    def timestamp(self, slot):
+        return float(self._timestamps[slot])
+
+    def is_current(self, slot, seq):
+        """True while `slot` still holds frame `seq` (i.e. it was not overwritten)."""
+        return int(self._seq[slot]) == seq
+
+    def matches(self, frame):
+        return frame is not None and frame.shape == self.frame_shape and frame.dtype == np.uint8
+
+    def close(self):
+        # Views handed out to readers keep the mapping alive; the OS frees it
+        # once the last one is garbage collected.
+        self._seq = self._timestamps = self._head = self._frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -1,18 +1,58 @@
 import cv2
 import time
-from threading import Thread, Lock
+import numpy as np
+from threading import Thread, Lock, Condition
+
+from src.acquisition.frame_ring_buffer import FrameRingBuffer
 
 class VideoStreamService:
-    def __init__(self, source, name="Camera"):
+    def __init__(self, source, name="Camera", buffer_slots=4, frame_ready=None, frame_skip=1, analysis_fps=0,
+                 resize_width=0):
         self.source = source
         self.name = name
         self.stream = None
         self.stopped = False
-        self.frame = None
         self.grabbed = False
         self.lock = Lock()
         self.is_reconnecting = False
 
+        # Frames live in a shared memory ring, created once the resolution is known.
+        # It needs room for the newest frame, the one held by the reader and the one being written
+        self.buffer_slots = max(3, int(buffer_slots))
+        self.buffer = None
+
+        # Monotonic frame id (survives reconnects and ring re-creation)
+        self.frame_id = -1
+        self.frame_timestamp = None
+        self._latest = (None, None)  # (buffer, slot) of frame_id
+        self._latest_seq = -1        # Ring sequence number of frame_id
+        self.last_read_id = -1
+        self.last_read_ref = (None, None, -1)  # (buffer, slot, seq) of the frame returned by read_new()
+        self._held = (None, None)              # (buffer, slot) not overwritten until the next read_new()
+
+        # Notified on every new frame; may be shared by several services
+        self.frame_ready = frame_ready if frame_ready is not None else Condition()
+
+        # Decimation: frames that will not be analyzed are grab()bed but never decoded
+        self.frame_skip = max(1, int(frame_skip or 1))
+        self.analysis_fps = float(analysis_fps or 0)
+        self._skip_counter = 0
+        self._next_due = 0.0
+
+        # Optional downscale done here, so the camera process never sees full-size frames.
+        # scale = (native width / stored width, native height / stored height)
+        self.resize_width = int(resize_width or 0)
+        self.scale = (1.0, 1.0)
+        self._decoded = None  # Reused decode buffer when resizing
+
+        # Counters for stream_stats()
+        self.grabbed_count = 0
+        self.analyzed_count = 0
+        self._stats_since = time.time()
+        self._stats_grabbed = 0
+        self._stats_analyzed = 0
+        self.effective_fps = 0.0
+
     def start(self):
         self.stopped = False
         t = Thread(target=self.update, args=(), daemon=True)
@@ -28,20 +68,111 @@ class VideoStreamService:
                 self._reconnect()
                 continue
 
-            grabbed, frame = self.stream.read()
+            grabbed = self.stream.grab()
+            if grabbed:
+                self.grabbed_count += 1
+                if self._should_analyze(time.time()):
+                    grabbed = self._retrieve()
 
             if not grabbed:
                 print(f"[{self.name}] Connection lost/End of stream. Reconnecting...")
                 self._reconnect()
                 continue
 
-            with self.lock:
-                self.grabbed = grabbed
-                self.frame = frame
-
         # Cleanup on stop
         if self.stream:
             self.stream.release()
+        self._release_buffer()
+
+    def _should_analyze(self, now):
+        """Applies frame_skip and analysis_fps to the frame that was just grabbed."""
+        self._skip_counter += 1
+        if self._skip_counter < self.frame_skip:
+            return False
+        if self.analysis_fps > 0:
+            if now < self._next_due:
+                return False
+            self._next_due = max(self._next_due, now) + 1.0 / self.analysis_fps
+        self._skip_counter = 0
+        return True
+
+    def _retrieve(self):
+        """Decodes the grabbed frame, straight into the next ring slot when possible."""
+        if self.resize_width:
+            # Decode into a scratch buffer, _publish resizes it into the ring
+            retrieved, frame = self.stream.retrieve(self._decoded)
+            if retrieved:
+                self._decoded = frame
+                self._publish(frame)
+        elif self.buffer is None:
+            retrieved, frame = self.stream.retrieve()
+            if retrieved:
+                self._publish(frame)
+        else:
+            slot, target = self._reserve(self.buffer)
+            if slot is None:
+                return True # No free slot: the frame is dropped
+            retrieved, frame = self.stream.retrieve(target)
+            if retrieved:
+                if frame is target:
+                    self._announce(self.buffer, slot)
+                else:
+                    self._publish(frame)
+        if retrieved:
+            self.analyzed_count += 1
+        return retrieved
+
+    def _output_shape(self, frame):
+        h, w = frame.shape[:2]
+        if not self.resize_width or w <= self.resize_width:
+            return frame.shape
+        height = int(round(h * self.resize_width / w))
+        return (height, self.resize_width) + frame.shape[2:]
+
+    def _publish(self, frame):
+        """
+        Copies (or downscales) a frame OpenCV allocated itself into the ring.
+        Used for the first frame, resolution changes and when resize_width is set.
+        """
+        shape = self._output_shape(frame)
+        if self.buffer is None or self.buffer.frame_shape != shape:
+            self._release_buffer()
+            self.buffer = FrameRingBuffer(shape, slots=self.buffer_slots)
+            self.scale = (frame.shape[1] / shape[1], frame.shape[0] / shape[0])
+        slot, target = self._reserve(self.buffer)
+        if slot is None:
+            return
+        if shape == frame.shape:
+            np.copyto(target, frame)
+        else:
+            cv2.resize(frame, (shape[1], shape[0]), dst=target, interpolation=cv2.INTER_AREA)
+        self._announce(self.buffer, slot)
+
+    def _reserve(self, buffer):
+        """Next slot to write, never the one holding the frame last returned by read_new()."""
+        with self.lock:
+            held_buffer, held_slot = self._held
+            return buffer.reserve(held=(held_slot,) if held_buffer is buffer else ())
+
+    def _announce(self, buffer, slot):
+        """Commits a written slot, assigns it the next frame id and wakes up readers."""
+        timestamp = time.time()
+        seq = buffer.commit(slot, timestamp)
+        with self.lock:
+            self.frame_id += 1
+            self.frame_timestamp = timestamp
+            self._latest = (buffer, slot)
+            self._latest_seq = seq
+            self.grabbed = True
+        with self.frame_ready:
+            self.frame_ready.notify_all()
+
+    def _release_buffer(self):
+        if self.buffer is not None:
+            with self.lock:
+                self._latest = (None, None)
+                self.buffer.close()
+                self.buffer = None
 
     def _connect(self):
         """Initial connection attempt."""
@@ -51,9 +182,7 @@ class VideoStreamService:
             if self.stream.isOpened():
                 grabbed, frame = self.stream.read()
                 if grabbed:
-                    with self.lock:
-                        self.grabbed = True
-                        self.frame = frame
+                    self._publish(frame)
                     print(f"[{self.name}] Connected.")
                 else:
                     print(f"[{self.name}] Connected but no frame.")
@@ -83,9 +212,7 @@ class VideoStreamService:
                 if self.stream.isOpened():
                     grabbed, frame = self.stream.read()
                     if grabbed:
-                        with self.lock:
-                            self.grabbed = True
-                            self.frame = frame
+                        self._publish(frame)
                         print(f"[{self.name}] Reconnected!")
                         self.is_reconnecting = False
                         return
@@ -98,11 +225,68 @@ class VideoStreamService:
             # Wait before next attempt
             time.sleep(2)
 
-    def read(self):
+    def latest(self):
+        """Returns (buffer, slot) for the newest frame, or (None, None) if the camera is down."""
         with self.lock:
-            if self.grabbed:
-                return self.frame
+            if not self.grabbed:
+                return None, None
+            return self._latest
+
+    def read(self):
+        """Zero-copy view of the newest frame (valid until the ring wraps around)."""
+        buffer, slot = self.latest()
+        if buffer is None:
             return None
+        return buffer.frame(slot)
+
+    def has_new(self):
+        """True if a frame newer than the last read_new() is available."""
+        with self.lock:
+            return self.grabbed and self.frame_id > self.last_read_id
+
+    def read_new(self, timeout=None):
+        """
+        Returns (frame, frame_id, timestamp) for a frame not returned before,
+        or None if no new frame arrived (optionally waiting up to `timeout` seconds).
+        The capture thread does not overwrite the frame until the next read_new(),
+        however long it is in use.
+        """
+        if timeout:
+            with self.frame_ready:
+                self.frame_ready.wait_for(lambda: self.stopped or self.has_new(), timeout=timeout)
+
+        with self.lock:
+            if not self.grabbed or self.frame_id <= self.last_read_id:
+                return None
+            buffer, slot = self._latest
+            frame_id = self.frame_id
+            timestamp = self.frame_timestamp
+            self.last_read_id = frame_id
+            self.last_read_ref = (buffer, slot, self._latest_seq)
+            self._held = (buffer, slot)
+        return buffer.frame(slot), frame_id, timestamp
+
+    def is_current(self, ref):
+        """
+        True while the frame of `ref` (buffer, slot, seq), e.g. last_read_ref, is still
+        in the ring. Views of a frame that is no longer current may be torn.
+        """
+        buffer, slot, seq = ref
+        with self.lock:
+            return buffer is not None and buffer is self.buffer and buffer.is_current(slot, seq)
+
+    def stream_stats(self):
+        """Capture and effective analysis fps since the previous call."""
+        now = time.time()
+        elapsed = max(now - self._stats_since, 1e-6)
+        capture_fps = (self.grabbed_count - self._stats_grabbed) / elapsed
+        self.effective_fps = (self.analyzed_count - self._stats_analyzed) / elapsed
+        self._stats_since = now
+        self._stats_grabbed = self.grabbed_count
+        self._stats_analyzed = self.analyzed_count
+        return {'capture_fps': capture_fps, 'analysis_fps': self.effective_fps}
 
     def stop(self):
         self.stopped = True
+        with self.frame_ready:
+            self.frame_ready.notify_all()
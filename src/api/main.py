@@ -153,8 +153,10 @@ def get_cameras(current_user: dict = Depends(get_current_active_user)):
     if not config or not hasattr(config, 'CAMERAS') or not config.CAMERAS:
         return []
 
-    for i, source in enumerate(config.CAMERAS):
-        cam_id = f"Camera_{i+1}"
+    for i, entry in enumerate(config.CAMERAS):
+        options = config.get_camera_options(i, entry)
+        cam_id = options['name']
+        source = options['source']
 
         # Check permission
         if allowed_cameras != "all" and cam_id not in allowed_cameras:
@@ -0,0 +1,80 @@
+# src/detection/batch_scheduler.py
+
+import time
+import numpy as np
+
+class BatchScheduler:
+    """
+    Deadline-based micro-batching in front of PersonDetector.
+
+    A batch is closed when it holds `max_batch` frames or when the first frame
+    has waited `max_wait` seconds, whichever comes first. Per-batch fill ratio,
+    queueing delay and inference latency are kept for stats().
+    """
+
+    def __init__(self, max_batch=16, max_wait=0.02, idle_timeout=0.1):
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max_wait
+        self.idle_timeout = idle_timeout
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._sizes = []
+        self._waits = []
+        self._latencies = []
+        self._since = time.time()
+
+    def collect(self, poll, size=len):
+        """
+        poll(timeout) returns a (possibly empty) list of new items, waiting at most
+        `timeout` seconds. size(items) counts the frames they carry.
+        Returns the items of the next batch (empty if nothing arrived while idle).
+        """
+        items = list(poll(self.idle_timeout))
+        if not items:
+            return []
+
+        start = time.perf_counter()
+        deadline = start + self.max_wait
+        while size(items) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            items.extend(poll(remaining))
+
+        self._waits.append(time.perf_counter() - start)
+        return items
+
+    def record(self, batch_size, latency):
+        """Registers a finished batch of `batch_size` frames that took `latency` seconds."""
+        self._sizes.append(batch_size)
+        self._latencies.append(latency)
+
+    def stats(self):
+        """Batch statistics since the previous call."""
+        elapsed = max(time.time() - self._since, 1e-6)
+        sizes = np.array(self._sizes, dtype=np.float64)
+        latencies = np.array(self._latencies, dtype=np.float64) * 1000
+        waits = np.array(self._waits, dtype=np.float64) * 1000
+        self._reset_stats()
+
+        if sizes.size == 0:
+            return {'batches': 0, 'frames_per_sec': 0.0, 'avg_batch': 0.0, 'fill_ratio': 0.0,
+                    'avg_wait_ms': 0.0, 'avg_latency_ms': 0.0, 'p95_latency_ms': 0.0}
+
+        return {
+            'batches': int(sizes.size),
+            'frames_per_sec': float(sizes.sum() / elapsed),
+            'avg_batch': float(sizes.mean()),
+            'fill_ratio': float(sizes.mean() / self.max_batch),
+            'avg_wait_ms': float(waits.mean()) if waits.size else 0.0,
+            'avg_latency_ms': float(latencies.mean()),
+            'p95_latency_ms': float(np.percentile(latencies, 95)),
+        }
+
+    @staticmethod
+    def format_stats(stats):
+        return (f"{stats['batches']} batches | {stats['frames_per_sec']:.1f} frames/s | "
+                f"avg batch {stats['avg_batch']:.1f} (fill {stats['fill_ratio']:.0%}) | "
+                f"wait {stats['avg_wait_ms']:.1f} ms | latency {stats['avg_latency_ms']:.1f} ms "
+                f"(p95 {stats['p95_latency_ms']:.1f} ms)")
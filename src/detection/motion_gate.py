@@ -0,0 +1,55 @@
+# src/detection/motion_gate.py
+
+import time
+import cv2
+import numpy as np
+
+class MotionGate:
+    """
+    Cheap motion check run before person detection.
+
+    Frames are shrunk to `width` pixels, converted to gray and compared against a
+    running-average background. A camera only needs YOLO when something moved,
+    when it still has active tracks, or when the heartbeat interval expired.
+    """
+
+    def __init__(self, width=160, threshold=25, min_area=0.002, heartbeat=10.0, learning_rate=0.05):
+        self.width = width
+        self.threshold = threshold
+        self.min_area = min_area
+        self.heartbeat = heartbeat
+        self.learning_rate = learning_rate
+        self.background = None
+        self.last_detection = 0.0
+        self.motion_ratio = 0.0
+
+    def _prepare(self, frame):
+        h, w = frame.shape[:2]
+        height = max(1, int(h * self.width / w))
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def has_motion(self, frame):
+        """Updates the background model and returns True if enough pixels changed."""
+        gray = self._prepare(frame)
+        if self.background is None or self.background.shape != gray.shape:
+            self.background = gray.astype(np.float32)
+            self.motion_ratio = 1.0
+            return True
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        self.motion_ratio = np.count_nonzero(diff > self.threshold) / diff.size
+        cv2.accumulateWeighted(gray, self.background, self.learning_rate)
+        return self.motion_ratio >= self.min_area
+
+    def should_detect(self, frame, has_tracks=False, now=None):
+        """Decides whether this frame goes into the detection batch."""
+        if now is None:
+            now = time.time()
+        motion = self.has_motion(frame)
+        if motion or has_tracks or now - self.last_detection >= self.heartbeat:
+            self.last_detection = now
+            return True
+        return False
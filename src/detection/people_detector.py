@@ -1,23 +1,30 @@
 import cv2
 import os
+import sys
 import json
 from ultralytics import YOLO
 
+# main2.py only puts src/ on the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.zones.zone_checker import camera_zones
+
 class PeopleDetector:
-    def __init__(self, source=0, zonas_path="data/zonas/zonas.json", model_path="yolov8n.pt"):
+    def __init__(self, source=0, zonas_path="data/zonas/zonas.json", model_path="yolov8n.pt", camera=None):
         self.source = source  # 0 para webcam, o URL de cámara IP
         self.model = YOLO(model_path)
-        self.zonas = self.load_zonas(zonas_path)
+        self.zonas = self.load_zonas(zonas_path, camera)
 
-    def load_zonas(self, path):
+    def load_zonas(self, path, camera=None):
+        """Zonas compartidas más las de `camera` (formato plano o por cámara, ver camera_zones)."""
         full_path = os.path.abspath(path)
         if not os.path.exists(full_path):
             print("❌ Archivo de zonas no encontrado:", full_path)
             return {}
         with open(full_path, 'r') as f:
-            data = json.load(f)
-        print("✅ Zonas cargadas:", list(data.keys()))
-        return data
+            zonas = camera_zones(json.load(f), camera)
+        print("✅ Zonas cargadas:", list(zonas.keys()))
+        return zonas
 
     def point_in_polygon(self, point, polygon):
         # Algoritmo de ray casting
@@ -1,15 +1,114 @@
 # src/detection/person_detector.py
 
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
 from ultralytics import YOLO
 import numpy as np
 import supervision as sv
-from src.paths import get_bundled_resource_path
+from src.paths import get_bundled_resource_path, get_user_data_path
+
+# Exported formats: backend -> (ultralytics export format, suffix of the exported file/dir)
+EXPORT_FORMATS = {
+    'onnx': ('onnx', '.onnx'),
+    'openvino': ('openvino', '_openvino_model'),
+}
+
+@contextmanager
+def file_lock(lock_path, timeout=600, poll=0.5):
+    """
+    Cross-process lock held while `lock_path` exists (created exclusively, removed
+    on exit). A lock older than `timeout` seconds is considered abandoned.
+    """
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > timeout:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue # Released meanwhile
+            time.sleep(poll)
+    try:
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+def export_model(model_path, backend, cache_dir=None):
+    """
+    Exports a PyTorch model to an optimized CPU format once and returns the cached path.
+    The export lives in data/models so the bundled models folder can stay read-only.
+    Several processes may start at once: one exports (under a lock, in a temp dir)
+    and the cached file only appears, complete, through an atomic rename.
+    """
+    export_format, suffix = EXPORT_FORMATS[backend]
+    if cache_dir is None:
+        cache_dir = get_user_data_path("data/models")
+    os.makedirs(cache_dir, exist_ok=True)
+
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    cached_path = os.path.join(cache_dir, stem + suffix)
+    if os.path.exists(cached_path):
+        return cached_path
+
+    with file_lock(cached_path + ".lock"):
+        # Another process may have finished the export while we waited
+        if os.path.exists(cached_path):
+            return cached_path
+
+        print(f"🔧 Exporting {model_path} to {backend} (first run only)...")
+        tmp_dir = tempfile.mkdtemp(prefix=".export_", dir=cache_dir)
+        try:
+            # Ultralytics writes the export next to the model it loads: use a copy
+            tmp_model = os.path.join(tmp_dir, os.path.basename(model_path))
+            shutil.copy2(model_path, tmp_model)
+            # dynamic=True keeps a variable batch dimension for detect_batch
+            exported_path = YOLO(tmp_model).export(format=export_format, dynamic=True)
+            os.replace(str(exported_path), cached_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    print(f"✅ Cached {backend} model at {cached_path}")
+    return cached_path
+
+def int8_model_path(model_path, cache_dir=None):
+    """Where the INT8 build (src/detection/quantization.py) stores the quantized `model_path`."""
+    if cache_dir is None:
+        cache_dir = get_user_data_path("data/models")
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(cache_dir, stem + "_int8.onnx")
 
 class PersonDetector:
-    def __init__(self, model_path=None, confidence_threshold=0.4):
+    def __init__(self, model_path=None, confidence_threshold=0.4, backend="pytorch"):
         if model_path is None:
             model_path = get_bundled_resource_path("models/yolov8/yolov8n.pt")
-        self.model = YOLO(model_path)
+
+        self.backend = backend
+        if backend in EXPORT_FORMATS:
+            try:
+                model_path = export_model(model_path, backend)
+            except Exception as e:
+                print(f"⚠️ Could not use the {backend} backend ({e}). Falling back to pytorch.")
+                self.backend = "pytorch"
+        elif backend == "onnx_int8":
+            quantized_path = int8_model_path(model_path)
+            if os.path.exists(quantized_path):
+                model_path = quantized_path
+            else:
+                print(f"⚠️ No INT8 model at {quantized_path} (build it with utils/quantize_detector.py). Falling back to pytorch.")
+                self.backend = "pytorch"
+        elif backend != "pytorch":
+            print(f"⚠️ Unknown detector backend '{backend}'. Using pytorch.")
+            self.backend = "pytorch"
+
+        self.model = YOLO(model_path, task="detect")
         self.confidence_threshold = confidence_threshold
 
     def detect(self, frame):
@@ -21,16 +120,29 @@ class PersonDetector:
 
         return detections
 
-    def detect_batch(self, frames):
+    def detect_batch(self, frames, imgsz=None):
         """
         Runs detection on a list of frames.
+        imgsz: inference size for all frames, or a list with one size per frame
+               (frames are grouped by size, ultralytics needs one size per call).
         Returns a list of sv.Detections objects, one for each frame.
         """
         if not frames:
             return []
 
+        if isinstance(imgsz, (list, tuple)):
+            batch_detections = [None] * len(frames)
+            for size in set(imgsz):
+                indices = [i for i, s in enumerate(imgsz) if s == size]
+                for i, detections in zip(indices, self.detect_batch([frames[i] for i in indices], size)):
+                    batch_detections[i] = detections
+            return batch_detections
+
         # Ultralytics supports list of frames
-        results_list = self.model(frames, verbose=False)
+        if imgsz:
+            results_list = self.model(frames, imgsz=imgsz, verbose=False)
+        else:
+            results_list = self.model(frames, verbose=False)
 
         batch_detections = []
         for results in results_list:
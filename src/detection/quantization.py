@@ -0,0 +1,211 @@
+# src/detection/quantization.py
+
+import os
+import re
+import glob
+import json
+import time
+import numpy as np
+import cv2
+import supervision as sv
+
+from src.detection.person_detector import PersonDetector, export_model, int8_model_path
+
+try:
+    from onnxruntime.quantization import (
+        CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType, quantize_static
+    )
+except ImportError:
+    CalibrationDataReader = object
+    quantize_static = None
+
+def load_calibration_images(snapshots_dir, limit=200):
+    """Evenly samples up to `limit` snapshots so every camera/time of day is represented."""
+    paths = sorted(glob.glob(os.path.join(snapshots_dir, '*.jpg')))
+    if len(paths) > limit:
+        paths = [paths[i] for i in np.linspace(0, len(paths) - 1, limit).astype(int)]
+    return paths
+
+def letterbox(image, size=640):
+    """Same preprocessing as ultralytics: keep aspect ratio, pad with gray, RGB, NCHW float32 in [0, 1]."""
+    h, w = image.shape[:2]
+    scale = min(size / h, size / w)
+    nh, nw = int(round(h * scale)), int(round(w * scale))
+    resized = cv2.resize(image, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    top, left = (size - nh) // 2, (size - nw) // 2
+    canvas[top:top + nh, left:left + nw] = resized
+    blob = cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB).transpose(2, 0, 1)[None]
+    return np.ascontiguousarray(blob, dtype=np.float32) / 255.0
+
+class SnapshotCalibrationReader(CalibrationDataReader):
+    """Feeds letterboxed snapshots to the ONNX Runtime calibrator one at a time."""
+
+    def __init__(self, image_paths, input_name, size=640):
+        self.image_paths = list(image_paths)
+        self.input_name = input_name
+        self.size = size
+        self._index = 0
+
+    def get_next(self):
+        while self._index < len(self.image_paths):
+            image = cv2.imread(self.image_paths[self._index])
+            self._index += 1
+            if image is not None:
+                return {self.input_name: letterbox(image, self.size)}
+        return None
+
+    def rewind(self):
+        self._index = 0
+
+def head_nodes(onnx_model):
+    """
+    Nodes of the Detect head (the highest /model.N/ block) except its convolutions.
+    Box decoding (DFL, concat, sigmoid, scaling) loses too much recall in INT8.
+    """
+    pattern = re.compile(r'^/model\.(\d+)/')
+    indices = [int(m.group(1)) for m in (pattern.match(n.name) for n in onnx_model.graph.node) if m]
+    if not indices:
+        return []
+    prefix = f"/model.{max(indices)}/"
+    return [n.name for n in onnx_model.graph.node if n.name.startswith(prefix) and n.op_type != 'Conv']
+
+def build_int8_model(model_path, snapshots_dir, output_path=None, limit=200, imgsz=640):
+    """Exports `model_path` to ONNX (FP32) and writes a statically quantized INT8 copy."""
+    if quantize_static is None:
+        raise RuntimeError("onnxruntime is required for quantization (pip install onnxruntime)")
+    import onnx
+
+    images = load_calibration_images(snapshots_dir, limit)
+    if not images:
+        raise RuntimeError(f"No calibration snapshots found in {snapshots_dir}")
+
+    fp32_path = export_model(model_path, 'onnx')
+    if output_path is None:
+        output_path = int8_model_path(model_path)
+
+    fp32_model = onnx.load(fp32_path)
+    input_name = fp32_model.graph.input[0].name
+    excluded = head_nodes(fp32_model)
+
+    print(f"🔧 Calibrating INT8 model with {len(images)} snapshots ({len(excluded)} head nodes kept in FP32)...")
+    quantize_static(
+        fp32_path,
+        output_path,
+        SnapshotCalibrationReader(images, input_name, imgsz),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        calibrate_method=CalibrationMethod.MinMax,
+        nodes_to_exclude=excluded,
+    )
+    print(f"✅ INT8 model written to {output_path}")
+    return fp32_path, output_path
+
+def _timed_detect(detector, images):
+    detections, latencies = [], []
+    for image in images:
+        start = time.perf_counter()
+        detections.append(detector.detect_batch([image])[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return detections, np.array(latencies)
+
+def count_matches(ref_xyxy, cand_xyxy, iou_threshold=0.5):
+    """Greedy one-to-one matching of boxes by IoU; returns the number of matched pairs."""
+    iou = sv.box_iou_batch(ref_xyxy, cand_xyxy)
+    matched = 0
+    while iou.size:
+        r, c = np.unravel_index(np.argmax(iou), iou.shape)
+        if iou[r, c] < iou_threshold:
+            break
+        matched += 1
+        iou[r, :] = -1
+        iou[:, c] = -1
+    return matched
+
+def compare_models(reference, candidate, images, iou_threshold=0.5):
+    """
+    Person recall/precision of `candidate` using `reference` detections as ground truth,
+    plus per-frame latency of both. Detectors must expose detect_batch().
+    """
+    ref_dets, ref_ms = _timed_detect(reference, images)
+    cand_dets, cand_ms = _timed_detect(candidate, images)
+
+    ref_total = cand_total = matched = 0
+    for ref, cand in zip(ref_dets, cand_dets):
+        ref_total += len(ref)
+        cand_total += len(cand)
+        if len(ref) and len(cand):
+            matched += count_matches(ref.xyxy, cand.xyxy, iou_threshold)
+
+    return {
+        'frames': len(images),
+        'reference_people': ref_total,
+        'candidate_people': cand_total,
+        'recall': matched / ref_total if ref_total else None,
+        'precision': matched / cand_total if cand_total else None,
+        'reference_ms': float(ref_ms.mean()) if ref_ms.size else None,
+        'reference_p95_ms': float(np.percentile(ref_ms, 95)) if ref_ms.size else None,
+        'candidate_ms': float(cand_ms.mean()) if cand_ms.size else None,
+        'candidate_p95_ms': float(np.percentile(cand_ms, 95)) if cand_ms.size else None,
+    }
+
+def format_report(report):
+    def pct(v):
+        return "n/a" if v is None else f"{v:.1%}"
+
+    def ms(v):
+        return "n/a" if v is None else f"{v:.1f}"
+
+    reference_ms, candidate_ms = report['reference_ms'], report['candidate_ms']
+    speedup = f"{reference_ms / candidate_ms:.2f}x" if reference_ms and candidate_ms else "n/a"
+
+    lines = [
+        f"INT8 vs FP32 person detection ({report['frames']} frames)",
+        f"  Model FP32: {report['fp32_model']}",
+        f"  Model INT8: {report['int8_model']}",
+        f"  People found   FP32 {report['reference_people']}  INT8 {report['candidate_people']}",
+        f"  Recall (vs FP32, IoU>={report['iou_threshold']}): {pct(report['recall'])}",
+        f"  Precision (vs FP32): {pct(report['precision'])}",
+        f"  Latency FP32: {ms(reference_ms)} ms/frame (p95 {ms(report['reference_p95_ms'])})",
+        f"  Latency INT8: {ms(candidate_ms)} ms/frame (p95 {ms(report['candidate_p95_ms'])})",
+        f"  Speedup: {speedup}",
+    ]
+    if report.get('evaluated_on_calibration'):
+        lines.append("  ⚠️ Every snapshot was used for calibration: accuracy is measured on the calibration set")
+    return "\n".join(lines)
+
+def quantize_and_report(model_path, snapshots_dir, limit=200, eval_limit=100, iou_threshold=0.5,
+                        confidence_threshold=0.4, report_path=None):
+    """Builds the INT8 model and writes a JSON + text report next to it. Returns the report dict."""
+    fp32_path, int8_path = build_int8_model(model_path, snapshots_dir, limit=limit)
+
+    # Evaluate on a different sample than the calibration set when there are enough snapshots
+    all_images = sorted(glob.glob(os.path.join(snapshots_dir, '*.jpg')))
+    calibration = set(load_calibration_images(snapshots_dir, limit))
+    held_out = [p for p in all_images if p not in calibration]
+    evaluated_on_calibration = not held_out
+    if evaluated_on_calibration:
+        held_out = all_images
+    held_out = [held_out[i] for i in np.linspace(0, len(held_out) - 1, min(eval_limit, len(held_out))).astype(int)]
+    images = [img for img in (cv2.imread(p) for p in held_out) if img is not None]
+
+    # Baseline is the FP32 ONNX export the INT8 model was quantized from, not the PyTorch weights
+    fp32 = PersonDetector(model_path=fp32_path, confidence_threshold=confidence_threshold)
+    int8 = PersonDetector(model_path=int8_path, confidence_threshold=confidence_threshold)
+
+    report = compare_models(fp32, int8, images, iou_threshold)
+    report.update({'fp32_model': fp32_path, 'int8_model': int8_path, 'iou_threshold': iou_threshold,
+                   'evaluated_on_calibration': evaluated_on_calibration})
+
+    if report_path is None:
+        report_path = os.path.splitext(int8_path)[0] + "_report"
+    with open(report_path + ".json", 'w') as f:
+        json.dump(report, f, indent=4)
+    with open(report_path + ".txt", 'w') as f:
+        f.write(format_report(report) + "\n")
+
+    print(format_report(report))
+    print(f"📝 Report saved to {report_path}.txt")
+    return report
@@ -0,0 +1,82 @@
+# src/detection/roi.py
+
+import numpy as np
+import supervision as sv
+
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def _union(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+def _area(box):
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+def compute_rois(zone_bounds, frame_shape, mode="crop", padding=0.15, max_tiles=4, max_coverage=0.8):
+    """
+    Regions of the frame worth running the detector on.
+
+    zone_bounds: iterable of (minx, miny, maxx, maxy) in frame coordinates.
+    mode: 'crop'  -> one padded box around every zone
+          'tiles' -> one padded box per group of overlapping zones (at most max_tiles,
+                     otherwise falls back to 'crop')
+    padding: fraction of the frame height added around each zone, so people whose
+             centroid is inside a zone are not cut off.
+    Returns a list of int (x1, y1, x2, y2), or [None] (= full frame) when cropping
+    would not save enough pixels.
+    """
+    h, w = frame_shape[:2]
+    pad = padding * h
+    boxes = []
+    for minx, miny, maxx, maxy in zone_bounds:
+        box = (max(0, int(minx - pad)), max(0, int(miny - pad)),
+               min(w, int(np.ceil(maxx + pad))), min(h, int(np.ceil(maxy + pad))))
+        if box[2] > box[0] and box[3] > box[1]:
+            boxes.append(box)
+
+    if mode == "off" or not boxes:
+        return [None]
+
+    union = boxes[0]
+    for box in boxes[1:]:
+        union = _union(union, box)
+
+    rois = [union]
+    if mode == "tiles":
+        # Merge overlapping boxes until they are disjoint
+        tiles = list(boxes)
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(tiles)):
+                for j in range(i + 1, len(tiles)):
+                    if _overlaps(tiles[i], tiles[j]):
+                        tiles[i] = _union(tiles[i], tiles.pop(j))
+                        merged = True
+                        break
+                if merged:
+                    break
+        if len(tiles) <= max_tiles and sum(_area(t) for t in tiles) < _area(union):
+            rois = tiles
+
+    if sum(_area(r) for r in rois) > max_coverage * w * h:
+        return [None]
+    return rois
+
+def crop(frame, roi):
+    """Zero-copy view of `frame` inside roi (None = whole frame)."""
+    if roi is None:
+        return frame
+    x1, y1, x2, y2 = roi
+    return frame[y1:y2, x1:x2]
+
+def merge_detections(detections_list, rois):
+    """Shifts detections of each ROI back to full-frame coordinates and merges them."""
+    shifted = []
+    for detections, roi in zip(detections_list, rois):
+        if roi is not None and len(detections):
+            detections.xyxy = detections.xyxy + np.array([roi[0], roi[1], roi[0], roi[1]], dtype=detections.xyxy.dtype)
+        shifted.append(detections)
+    if len(shifted) == 1:
+        return shifted[0]
+    return sv.Detections.merge(shifted)
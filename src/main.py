@@ -18,6 +18,8 @@ except ImportError:
 
 from src.processing.camera_process import CameraGroupProcess
 from src.processing.db_writer import DBWriterProcess
+from src.processing.inference_server import InferenceServerProcess
+from src.processing.face_worker import FaceWorkerProcess
 from src.storage.database_manager import DatabaseManager
 
 def main():
@@ -62,13 +64,53 @@ def main():
 
     print(f"📷 Configuring {len(config.CAMERAS)} cameras in {len(chunks)} groups...")
 
+    # 6. Optional shared Inference Servers (one detector for many groups)
+    inference_servers = []
+    group_inference = [None] * len(chunks)
+    num_servers = min(getattr(config, 'INFERENCE_SERVERS', 0), len(chunks))
+    if num_servers > 0:
+        for s in range(num_servers):
+            request_queue = multiprocessing.Queue()
+            # Groups are assigned to servers round-robin
+            response_queues = {}
+            for group_id in range(s, len(chunks), num_servers):
+                response_queues[group_id] = multiprocessing.Queue()
+                group_inference[group_id] = (group_id, request_queue, response_queues[group_id])
+
+            server = InferenceServerProcess(request_queue, response_queues,
+                                            max_batch=getattr(config, 'INFERENCE_MAX_BATCH', 16),
+                                            max_wait=getattr(config, 'INFERENCE_MAX_WAIT', 0.02),
+                                            server_id=s)
+            server.start()
+            inference_servers.append(server)
+        print(f"🧠 {num_servers} inference server(s) shared by {len(chunks)} camera groups.")
+
+    # 7. Optional face recognition worker pool (identity off the camera loops)
+    face_workers = []
+    group_faces = [None] * len(chunks)
+    num_face_workers = getattr(config, 'FACE_WORKERS', 0)
+    if num_face_workers > 0:
+        face_request_queue = multiprocessing.Queue(maxsize=getattr(config, 'FACE_QUEUE_SIZE', 32))
+        face_response_queues = {group_id: multiprocessing.Queue() for group_id in range(len(chunks))}
+        for group_id in range(len(chunks)):
+            group_faces[group_id] = (group_id, face_request_queue, face_response_queues[group_id])
+
+        for w in range(num_face_workers):
+            worker = FaceWorkerProcess(face_request_queue, face_response_queues,
+                                       max_batch=getattr(config, 'INFERENCE_MAX_BATCH', 16),
+                                       max_age=getattr(config, 'FACE_REQUEST_MAX_AGE', 2.0),
+                                       worker_id=w)
+            worker.start()
+            face_workers.append(worker)
+        print(f"🙂 {num_face_workers} face worker(s) shared by {len(chunks)} camera groups.")
+
     for i, chunk in enumerate(chunks):
         print(f"  - Starting Process {i+1} with {len(chunk)} cameras...")
-        cp = CameraGroupProcess(chunk, results_queue)
+        cp = CameraGroupProcess(chunk, results_queue, inference=group_inference[i], face_workers=group_faces[i])
         cp.start()
         camera_processes.append(cp)
 
-    print(f"✅ System running with {len(camera_processes)} camera processes + 1 DB writer.")
+    print(f"✅ System running with {len(camera_processes)} camera processes + {len(inference_servers)} inference servers + {len(face_workers)} face workers + 1 DB writer.")
     print("Press Ctrl+C to exit.")
 
     try:
@@ -86,6 +128,14 @@ def main():
                     print(f"⚠️ Camera Process {i+1} died!")
                     # In a real production system, we might restart it here.
 
+            for i, server in enumerate(inference_servers):
+                if not server.is_alive():
+                    print(f"⚠️ Inference Server {i+1} died!")
+
+            for i, worker in enumerate(face_workers):
+                if not worker.is_alive():
+                    print(f"⚠️ Face Worker {i+1} died!")
+
     except KeyboardInterrupt:
         print("\nCreating shutdown...")
     finally:
@@ -94,6 +144,10 @@ def main():
         # Stop signals
         for cp in camera_processes:
             cp.stop()
+        for server in inference_servers:
+            server.stop()
+        for worker in face_workers:
+            worker.stop()
         db_writer.stop()
 
         # Wait a bit
@@ -105,6 +159,16 @@ def main():
                 cp.terminate()
             cp.join()
 
+        for server in inference_servers:
+            if server.is_alive():
+                server.terminate()
+            server.join()
+
+        for worker in face_workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
         if db_writer.is_alive():
             db_writer.terminate()
         db_writer.join()
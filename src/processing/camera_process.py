@@ -1,4 +1,5 @@
 import multiprocessing
+import threading
 import cv2
 import time
 import os
@@ -16,26 +17,35 @@ except ImportError:
     import config
 
 from src.detection.person_detector import PersonDetector
+from src.detection.motion_gate import MotionGate
+from src.detection.batch_scheduler import BatchScheduler
+from src.detection.roi import compute_rois, crop, merge_detections
 from src.tracking.person_tracker import PersonTracker
+from src.tracking.track_table import TrackTable
+from src.tracking.zone_events import ZoneEventEmitter
+from src.tracking.dwell import DwellAggregator
 from src.zones.zone_checker import ZoneChecker
 from src.recognition.face_recognizer import FaceRecognizer
 from src.acquisition.video_stream import VideoStreamService
+from src.processing.inference_server import InferenceClient
+from src.processing.face_worker import FaceRecognitionClient
+from src.processing.rate_scheduler import AdaptiveRateController
 from src.paths import get_user_data_path
 
-def get_bbox_center(xyxy):
-    x1, y1, x2, y2 = xyxy
-    center_x = (x1 + x2) / 2
-    center_y = (y1 + y2) / 2
-    return center_x, center_y
-
 class CameraGroupProcess(multiprocessing.Process):
-    def __init__(self, camera_configs, results_queue):
+    def __init__(self, camera_configs, results_queue, inference=None, face_workers=None):
         """
         camera_configs: list of tuples (global_index, source)
+        inference: optional (group_id, request_queue, response_queue) of a shared
+                   InferenceServerProcess; if None the group loads its own detector.
+        face_workers: optional (group_id, request_queue, response_queue) of a
+                      FaceWorkerProcess pool; if None faces are recognized in the loop.
         """
         super().__init__()
         self.camera_configs = camera_configs
         self.results_queue = results_queue
+        self.inference = inference
+        self.face_workers = face_workers
         self.running = multiprocessing.Event()
         self.running.set()
 
@@ -44,8 +54,32 @@ class CameraGroupProcess(multiprocessing.Process):
 
         # --- Initialize Shared Resources (within process) ---
         try:
-            detector = PersonDetector(confidence_threshold=config.CONFIDENCE_THRESHOLD)
-            face_recognizer = FaceRecognizer(tolerance=getattr(config, 'FACE_RECOGNITION_TOLERANCE', 0.6))
+            detector = None
+            remote_detector = None
+            if self.inference is not None:
+                remote_detector = InferenceClient(*self.inference, timeout=getattr(config, 'INFERENCE_TIMEOUT', 5.0))
+            else:
+                detector = PersonDetector(confidence_threshold=config.CONFIDENCE_THRESHOLD,
+                                          backend=getattr(config, 'DETECTOR_BACKEND', 'pytorch'))
+            face_recognizer = None
+            face_client = None
+            if self.face_workers is not None:
+                face_client = FaceRecognitionClient(*self.face_workers,
+                                                    max_pending=getattr(config, 'FACE_MAX_PENDING', 64),
+                                                    max_age=getattr(config, 'FACE_REQUEST_MAX_AGE', 2.0),
+                                                    max_batch=getattr(config, 'INFERENCE_MAX_BATCH', 16),
+                                                    head_fraction=getattr(config, 'FACE_HEAD_FRACTION', 1.0))
+            else:
+                face_recognizer = FaceRecognizer(tolerance=getattr(config, 'FACE_RECOGNITION_TOLERANCE', 0.6),
+                                                 face_model=getattr(config, 'FACE_DETECTION_MODEL', 'hog'),
+                                                 head_fraction=getattr(config, 'FACE_HEAD_FRACTION', 1.0),
+                                                 locate_size=getattr(config, 'FACE_LOCATE_SIZE', 0),
+                                                 dnn_model=getattr(config, 'FACE_DNN_MODEL', None) or None,
+                                                 min_face_size=getattr(config, 'FACE_MIN_SIZE', 0),
+                                                 min_sharpness=getattr(config, 'FACE_MIN_SHARPNESS', 0.0),
+                                                 max_yaw=getattr(config, 'FACE_MAX_YAW', 0.0),
+                                                 gallery_index=getattr(config, 'FACE_GALLERY_INDEX', 'exact'),
+                                                 gallery_nprobe=getattr(config, 'FACE_GALLERY_NPROBE', 8))
         except Exception as e:
             print(f"❌ Error initializing shared resources in process: {e}")
             return
@@ -55,158 +89,367 @@ class CameraGroupProcess(multiprocessing.Process):
 
         # --- Initialize Camera Systems ---
         systems = []
+        # Shared by all streams of this group so the loop can wait for any new frame
+        frame_ready = threading.Condition()
+        frame_wait = getattr(config, 'FRAME_WAIT_TIMEOUT', 0.1)
         for cam_data in self.camera_configs:
             # Handle different config formats
             if len(cam_data) == 2:
-                idx, source = cam_data
-                name = f"Camera_{idx+1}"
+                idx, entry = cam_data
+                options = config.get_camera_options(idx, entry)
             else:
                 idx, source, name = cam_data
+                options = {'source': source, 'name': name}
+            source, name = options['source'], options['name']
 
             print(f"  - Setting up {name} in process...")
             try:
-                tracker = PersonTracker()
-                zone_checker = ZoneChecker(zones_path=get_user_data_path("data/zonas/zonas.json"))
-                service = VideoStreamService(source, name=name)
+                tracker = PersonTracker(propagation=options.get('propagation', getattr(config, 'TRACK_PROPAGATION', 'velocity')))
+                zone_checker = ZoneChecker(zones_path=get_user_data_path("data/zonas/zonas.json"),
+                                           mode=getattr(config, 'ZONE_CHECK_MODE', 'shapely'),
+                                           raster_cell=getattr(config, 'ZONE_RASTER_CELL', 1),
+                                           camera=name)
+                service = VideoStreamService(source, name=name,
+                                             buffer_slots=getattr(config, 'FRAME_BUFFER_SLOTS', 4),
+                                             frame_ready=frame_ready,
+                                             frame_skip=options.get('frame_skip', getattr(config, 'FRAME_SKIP', 1)),
+                                             analysis_fps=options.get('analysis_fps', getattr(config, 'ANALYSIS_FPS', 0)),
+                                             resize_width=options.get('resize_width', getattr(config, 'CAPTURE_RESIZE_WIDTH', 0)))
                 service.start() # Start the thread inside this process
 
+                motion_gate = None
+                if options.get('motion_gating', getattr(config, 'MOTION_GATING', True)):
+                    motion_gate = MotionGate(
+                        width=getattr(config, 'MOTION_WIDTH', 160),
+                        threshold=getattr(config, 'MOTION_THRESHOLD', 25),
+                        min_area=getattr(config, 'MOTION_MIN_AREA', 0.002),
+                        heartbeat=options.get('motion_heartbeat', getattr(config, 'MOTION_HEARTBEAT', 10.0))
+                    )
+
+                rate_controller = None
+                if options.get('adaptive_rate', getattr(config, 'ADAPTIVE_RATE', False)):
+                    rate_controller = AdaptiveRateController(
+                        idle_fps=getattr(config, 'IDLE_FPS', 1.0),
+                        stationary_fps=getattr(config, 'STATIONARY_FPS', 3.0),
+                        active_fps=getattr(config, 'ACTIVE_FPS', 0.0),
+                        boundary_margin=getattr(config, 'BOUNDARY_MARGIN', 50.0),
+                        moving_speed=getattr(config, 'MOVING_SPEED', 30.0)
+                    )
+
+                tracks = TrackTable(zone_checker.names, ttl=getattr(config, 'TRACK_STATE_TTL', 30.0))
+
                 systems.append({
                     'id': idx,
                     'name': name,
+                    'options': options,
                     'service': service,
                     'tracker': tracker,
                     'zone_checker': zone_checker,
-                    'zone_state': {},          # {global_track_id: {zone_name: was_inside}}
-                    'track_id_to_name': {},    # {global_track_id: name}
-                    'track_id_votes': {},      # {global_track_id: {'name': name, 'count': count}}
-                    'frame_count': 0
+                    'motion_gate': motion_gate,
+                    'rate_controller': rate_controller,
+                    'base_fps': service.analysis_fps, # Configured analysis fps (0 = no limit)
+                    'roi_mode': options.get('roi_mode', getattr(config, 'ZONE_ROI_MODE', 'off')),
+                    'rois': None,              # Cached compute_rois() result
+                    'rois_shape': None,        # Frame shape the ROIs were computed for
+                    'imgsz': options.get('imgsz', getattr(config, 'INFERENCE_IMGSZ', 640)),
+                    'keyframe_interval': max(1, int(options.get('keyframe_interval', getattr(config, 'KEYFRAME_INTERVAL', 1)))),
+                    'since_keyframe': None,    # Analyzed frames since the last detector run (None = detect next)
+                    'propagated_frames': 0,
+                    'scale': (1.0, 1.0),       # Zone coordinates per frame pixel (capture resize)
+                    'active_tracks': 0,
+                    'gated_frames': 0,
+                    'stale_frames': 0,         # Overwritten in the ring before they were processed
+                    'tracks': tracks,          # Zones/identity per global track id
+                    'dwell': DwellAggregator(tracks) if getattr(config, 'DWELL_AGGREGATION', False) else None,
+                    'frame_count': 0,
+                    'frame_id': -1,
+                    'frame_timestamp': None
                 })
             except Exception as e:
                 print(f"❌ Error setting up {name}: {e}")
 
+        systems_by_id = {s['id']: s for s in systems}
+        stats_interval = getattr(config, 'STREAM_STATS_INTERVAL', 60)
+        zones_reload_interval = getattr(config, 'ZONES_RELOAD_INTERVAL', 2.0)
+        last_zones_check = time.time()
+        ver_interval = getattr(config, 'VERIFICATION_INTERVAL', 30)
+        zone_smoothing = getattr(config, 'ZONE_SMOOTHING', 1.0)
+        zone_min_frames = getattr(config, 'ZONE_MIN_FRAMES', 1)
+        zone_min_dwell = getattr(config, 'ZONE_MIN_DWELL', 0.0)
+        dwell_checkpoint = getattr(config, 'DWELL_CHECKPOINT_INTERVAL', 60.0)
+        zone_events = ZoneEventEmitter(mode=getattr(config, 'ZONE_EVENTS', 'frames'),
+                                       sample_fps=getattr(config, 'ZONE_SAMPLE_FPS', 1.0))
+        min_matches = getattr(config, 'FACE_RECOGNITION_MIN_MATCHES', 3)
+        last_stats = time.time()
+
+        # A group can contribute at most one frame per camera to a batch
+        scheduler = BatchScheduler(
+            max_batch=min(getattr(config, 'INFERENCE_MAX_BATCH', 16), max(1, len(systems))),
+            max_wait=getattr(config, 'INFERENCE_MAX_WAIT', 0.02),
+            idle_timeout=frame_wait
+        )
+        batched = set() # ids of cameras already in the batch being collected
+
+        def poll_frames(timeout):
+            """Waits up to `timeout` for new frames from cameras not yet in the batch."""
+            def pending():
+                return any(s['id'] not in batched and s['service'].has_new() for s in systems)
+
+            with frame_ready:
+                frame_ready.wait_for(pending, timeout=timeout)
+
+            new_items = []
+            for sys_obj in systems:
+                if sys_obj['id'] in batched:
+                    continue
+                # Frames are views into the camera's shared memory ring
+                new_frame = sys_obj['service'].read_new()
+                if new_frame is None:
+                    continue
+                frame, sys_obj['frame_id'], sys_obj['frame_timestamp'] = new_frame
+                sys_obj['scale'] = sys_obj['service'].scale
+
+                # Between keyframes the tracker moves existing tracks without the detector
+                since = sys_obj['since_keyframe']
+                if since is not None and since + 1 < sys_obj['keyframe_interval']:
+                    sys_obj['since_keyframe'] = since + 1
+                    if sys_obj['active_tracks'] == 0:
+                        continue
+                    batched.add(sys_obj['id'])
+                    new_items.append((sys_obj, frame, sys_obj['service'].last_read_ref, False))
+                    continue
+
+                # Static scene without tracks: leave it out of the batch
+                gate = sys_obj['motion_gate']
+                if gate is not None and not gate.should_detect(frame, has_tracks=sys_obj['active_tracks'] > 0,
+                                                               now=sys_obj['frame_timestamp']):
+                    sys_obj['gated_frames'] += 1
+                    continue
+
+                sys_obj['since_keyframe'] = 0
+                batched.add(sys_obj['id'])
+                new_items.append((sys_obj, frame, sys_obj['service'].last_read_ref, True))
+            return new_items
+
+        def keyframes(items):
+            return sum(1 for item in items if item[3])
+
         # --- Main Loop ---
         try:
             while self.running.is_set():
 
-                # 1. Collect Frames for Batch Inference
-                frames = []
-                valid_systems = [] # Systems that provided a frame this iteration
-
-                for sys_obj in systems:
-                    frame = sys_obj['service'].read()
-                    if frame is not None:
-                        frames.append(frame)
-                        valid_systems.append(sys_obj)
-                    else:
-                        # Optional: Add small sleep if all cameras are down?
-                        pass
-
-                if not frames:
-                    time.sleep(0.01) # Avoid busy loop if no frames
+                if stats_interval and time.time() - last_stats >= stats_interval:
+                    last_stats = time.time()
+                    for sys_obj in systems:
+                        stats = sys_obj['service'].stream_stats()
+                        # Analysis rate currently set (by the rate controller when enabled)
+                        target = sys_obj['service'].analysis_fps
+                        rate = f"{'max' if not target else f'{target:g} fps'}, {sys_obj['rate_controller'].state if sys_obj['rate_controller'] else 'fixed'}"
+                        print(f"[{sys_obj['name']}] 📈 Capture {stats['capture_fps']:.1f} fps | Analysis {stats['analysis_fps']:.1f} fps (rate {rate}) | Skipped (no motion) {sys_obj['gated_frames']} | Propagated {sys_obj['propagated_frames']} | Stale {sys_obj['stale_frames']} | Tracks in memory {len(sys_obj['tracks'])}")
+                        sys_obj['gated_frames'] = 0
+                        sys_obj['propagated_frames'] = 0
+                        sys_obj['stale_frames'] = 0
+                    print(f"📦 Detection batches: {BatchScheduler.format_stats(scheduler.stats())}")
+                    if face_recognizer is not None and any(face_recognizer.rejected.values()):
+                        rejected = face_recognizer.rejected
+                        print(f"🙂 Faces rejected: size {rejected['size']} | blur {rejected['blur']} | pose {rejected['pose']}")
+                        face_recognizer.rejected = {'size': 0, 'blur': 0, 'pose': 0}
+                    if face_client is not None:
+                        print(f"🙂 Face requests in flight {len(face_client.pending)} | Dropped (queue full) {face_client.dropped}")
+                        face_client.dropped = 0
+
+                # Zone edits apply without restarting the process
+                if zones_reload_interval and time.time() - last_zones_check >= zones_reload_interval:
+                    last_zones_check = time.time()
+                    for sys_obj in systems:
+                        if sys_obj['zone_checker'].reload_if_changed():
+                            self._zones_changed(sys_obj, zone_events)
+
+                # 1-2. Collect new frames until the batch is full or its deadline expires
+                # (only keyframes count towards the batch size)
+                batched.clear()
+                batch = scheduler.collect(poll_frames, size=keyframes)
+                if not batch:
                     continue
 
-                # 2. Batch Detect
+                valid_systems = [item[0] for item in batch] # Systems that provided a new frame this iteration
+                frames = [item[1] for item in batch]
+                is_keyframe = [item[3] for item in batch]
+
+                # Each camera contributes its zone ROIs (or the full frame) to the batch
+                inputs = []      # Cropped views fed to the detector
+                input_sizes = [] # Inference resolution of each input (per camera)
+                input_refs = []  # (camera id, ring buffer, slot, seq, roi, imgsz) of each input, for the inference server
+                camera_rois = []
+                for sys_obj, frame, (buffer, slot, seq), keyframe in batch:
+                    if not keyframe:
+                        camera_rois.append([])
+                        continue
+                    rois = self._get_rois(sys_obj, frame.shape)
+                    camera_rois.append(rois)
+                    for roi in rois:
+                        inputs.append(crop(frame, roi))
+                        input_sizes.append(sys_obj['imgsz'])
+                        input_refs.append((sys_obj['id'], buffer, slot, seq, roi, sys_obj['imgsz']))
+
+                # 3. Batch Detect
                 # detector.detect_batch returns list of detections corresponding to frames
-                batch_detections = detector.detect_batch(frames)
-
-                # 3. Process Results per Camera
+                input_detections = []
+                if inputs:
+                    inference_start = time.perf_counter()
+                    if remote_detector is not None:
+                        input_detections = remote_detector.detect_refs(input_refs)
+                    else:
+                        input_detections = detector.detect_batch(inputs, imgsz=input_sizes)
+                    scheduler.record(len(inputs), time.perf_counter() - inference_start)
+
+                # Back to full-frame zone coordinates, one sv.Detections per camera
+                batch_detections = []
+                stale = set() # Batch items the inference server found overwritten
+                offset = 0
+                for i, (sys_obj, rois) in enumerate(zip(valid_systems, camera_rois)):
+                    if not rois:
+                        batch_detections.append(None) # Propagated frame
+                        continue
+                    roi_detections = input_detections[offset:offset + len(rois)]
+                    offset += len(rois)
+                    if any(d is None for d in roi_detections):
+                        stale.add(i)
+                        batch_detections.append(None)
+                        continue
+                    detections = merge_detections(roi_detections, rois)
+                    sx, sy = sys_obj['scale']
+                    if (sx, sy) != (1.0, 1.0) and len(detections):
+                        detections.xyxy = detections.xyxy * np.array([sx, sy, sx, sy], dtype=np.float32)
+                    batch_detections.append(detections)
+
+                # Frames are ring views the capture thread leaves alone until the camera's next
+                # read_new(); only a replaced ring (reconnect, new resolution) invalidates them
+                for i, (sys_obj, frame, ref, keyframe) in enumerate(batch):
+                    if i in stale or not sys_obj['service'].is_current(ref):
+                        frames[i] = None
+                        sys_obj['stale_frames'] += 1
+                        if keyframe:
+                            sys_obj['since_keyframe'] = None # Detect on the next frame
+
+                # 4. Update trackers and collect the tracks to identify across all cameras
+                camera_tracks = []
+                verify_frames, verify_boxes, verify_refs = [], [], []
                 for i, sys_obj in enumerate(valid_systems):
                     frame = frames[i]
                     detections = batch_detections[i]
+                    if frame is None:
+                        continue
                     sys_obj['frame_count'] += 1
 
-                    # Update Tracker
-                    tracked_detections = sys_obj['tracker'].update(detections)
-
-                    # Process tracks
-                    for xyxy, local_track_id in zip(tracked_detections.xyxy, tracked_detections.tracker_id):
-                        local_track_id = int(local_track_id)
-                        # Global ID calculation
-                        global_track_id = local_track_id + (sys_obj['id'] * 100000)
-
-                        x1, y1, x2, y2 = map(int, xyxy)
-                        cx, cy = get_bbox_center(xyxy)
-
-                        # --- IDENTITY RECOGNITION ---
-                        current_name = sys_obj['track_id_to_name'].get(global_track_id, "Unknown")
-                        should_verify = False
-
-                        if current_name == "Unknown":
-                            should_verify = True
-                        else:
-                            ver_interval = getattr(config, 'VERIFICATION_INTERVAL', 30)
-                            if (sys_obj['frame_count'] + local_track_id) % ver_interval == 0:
-                                should_verify = True
-
-                        if should_verify:
-                            # Face Rec is single image, no batching implemented in FaceRecognizer usually
-                            recognized_name = face_recognizer.recognize_face(frame, bbox=(x1, y1, x2, y2))
-
-                            if recognized_name != "Unknown":
-                                votes = sys_obj['track_id_votes'].get(global_track_id)
-                                if not votes:
-                                    votes = {'name': recognized_name, 'count': 0}
-                                    sys_obj['track_id_votes'][global_track_id] = votes
-
-                                if votes['name'] == recognized_name:
-                                    votes['count'] += 1
-                                else:
-                                    sys_obj['track_id_votes'][global_track_id] = {'name': recognized_name, 'count': 1}
-
-                                min_matches = getattr(config, 'FACE_RECOGNITION_MIN_MATCHES', 3)
-                                if sys_obj['track_id_votes'][global_track_id]['count'] >= min_matches:
-                                    if current_name != recognized_name and current_name != "Unknown":
-                                        print(f"[{sys_obj['name']}] 🔄 Identity Change! {global_track_id}: {current_name} -> {recognized_name}")
-
-                                    sys_obj['track_id_to_name'][global_track_id] = recognized_name
-
-                        display_name = sys_obj['track_id_to_name'].get(global_track_id, "Unknown")
-
-                        # --- ZONE LOGIC ---
-                        results = sys_obj['zone_checker'].check(cx, cy)
-                        if global_track_id not in sys_obj['zone_state']:
-                            sys_obj['zone_state'][global_track_id] = {}
-
-                        for zone_name, inside in results.items():
-                            inside_zone = int(inside)
-                            was_inside = sys_obj['zone_state'][global_track_id].get(zone_name, False)
-
-                            if inside_zone and not was_inside:
-                                # Snapshot Event
-                                timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-                                filename = f"{sys_obj['name']}_{global_track_id}_{display_name}_{zone_name}_{timestamp_str}.jpg".replace(" ", "_")
-                                filepath = os.path.join(snapshots_dir, filename)
-
-                                # Write file locally in this process
-                                cv2.imwrite(filepath, frame)
-
-                                # Send metadata to DB Writer
-                                self.results_queue.put({
-                                    'type': 'snapshot',
-                                    'data': {
-                                        'camera_id': sys_obj['name'],
-                                        'track_id': global_track_id,
-                                        'zone': zone_name,
-                                        'snapshot_path': filepath,
-                                        'employee_name': display_name
-                                    }
-                                })
-                                print(f"[{sys_obj['name']}] 📸 Snapshot: {display_name} entered {zone_name}")
-
-                            sys_obj['zone_state'][global_track_id][zone_name] = bool(inside_zone)
-
-                            # Send Tracking Record to DB Writer
-                            self.results_queue.put({
-                                'type': 'record',
-                                'data': {
-                                    'camera_id': sys_obj['name'],
-                                    'track_id': global_track_id,
-                                    'x': cx,
-                                    'y': cy,
-                                    'zone': zone_name,
-                                    'inside_zone': inside_zone
-                                }
-                            })
+                    # Update Tracker (keyframe) or move its tracks forward
+                    if is_keyframe[i]:
+                        tracked_detections = sys_obj['tracker'].update(detections, frame, sys_obj['frame_timestamp'],
+                                                                        sys_obj['scale'])
+                    else:
+                        tracked_detections = sys_obj['tracker'].propagate(frame, sys_obj['frame_timestamp'],
+                                                                           sys_obj['scale'])
+                        sys_obj['propagated_frames'] += 1
+                    sys_obj['active_tracks'] = len(tracked_detections)
+
+                    # Process all tracks of the frame at once
+                    table = sys_obj['tracks']
+                    xyxy = tracked_detections.xyxy
+                    local_ids = np.asarray(tracked_detections.tracker_id if len(tracked_detections) else [], dtype=np.int64)
+                    global_ids = local_ids + (sys_obj['id'] * 100000) # Global ID calculation
+                    cx = (xyxy[:, 0] + xyxy[:, 2]) / 2
+                    cy = (xyxy[:, 1] + xyxy[:, 3]) / 2
+                    slots = table.slots(global_ids, sys_obj['frame_timestamp'])
+                    camera_tracks.append((sys_obj, frame, local_ids, global_ids, cx, cy, slots))
+
+                    # Unknown tracks every frame, known ones every VERIFICATION_INTERVAL frames
+                    # (and on the next frame again if their face was not checked)
+                    verify = (table.unknown(slots) | table.face_retry(slots) |
+                              ((sys_obj['frame_count'] + local_ids) % ver_interval == 0))
+                    sx, sy = sys_obj['scale']
+                    for t in np.flatnonzero(verify):
+                        x1, y1, x2, y2 = map(int, xyxy[t])
+                        verify_frames.append(frame)
+                        verify_boxes.append((x1 / sx, y1 / sy, x2 / sx, y2 / sy))
+                        verify_refs.append((sys_obj, slots[t], int(global_ids[t])))
+
+                # --- IDENTITY RECOGNITION ---
+                identified = [] # (sys_obj, slot, global track id, name)
+                if face_client is not None:
+                    # Workers answer on later iterations; tracks that ended meanwhile are skipped
+                    face_client.submit(verify_frames, verify_boxes,
+                                       [(sys_obj['id'], track_id) for sys_obj, slot, track_id in verify_refs])
+                    for (camera_id, track_id), recognized_name in face_client.results():
+                        sys_obj = systems_by_id[camera_id]
+                        slot = sys_obj['tracks'].slot_of(track_id)
+                        if slot is not None:
+                            identified.append((sys_obj, slot, track_id, recognized_name))
+                elif verify_boxes:
+                    # One call for every face of the batch
+                    recognized = face_recognizer.recognize_batch(verify_frames, verify_boxes)
+                    identified = [ref + (name,) for ref, name in zip(verify_refs, recognized)]
+
+                for sys_obj, slot, global_track_id, recognized_name in identified:
+                    # None: face rejected by the quality gate (or dropped by the workers)
+                    sys_obj['tracks'].set_face_retry(slot, recognized_name is None)
+                    if recognized_name not in (None, "Unknown"):
+                        previous = sys_obj['tracks'].vote(slot, recognized_name, min_matches)
+                        if previous not in (None, "Unknown"):
+                            print(f"[{sys_obj['name']}] 🔄 Identity Change! {global_track_id}: {previous} -> {recognized_name}")
+
+                # 5. Process Results per Camera
+                for sys_obj, frame, local_ids, global_ids, cx, cy, slots in camera_tracks:
+                    table = sys_obj['tracks']
+                    now = sys_obj['frame_timestamp']
+
+                    # --- ZONE LOGIC ---
+                    # Smoothed centroids only decide zone membership; records and dwell
+                    # statistics keep the raw positions
+                    zx, zy = cx, cy
+                    if zone_smoothing < 1.0:
+                        zx, zy = table.smooth(slots, cx, cy, zone_smoothing)
+                    inside = sys_obj['zone_checker'].check_batch(zx, zy)
+                    if zone_min_frames > 1 or zone_min_dwell > 0:
+                        inside = table.debounce(slots, inside, now, zone_min_frames, zone_min_dwell)
+                    records, entered = zone_events.emit(table, slots, global_ids, cx, cy, inside, now)
+                    display_names = table.names_of(slots)
+
+                    for t, z in zip(*np.nonzero(entered)):
+                        # Snapshot Event
+                        global_track_id, zone_name, display_name = int(global_ids[t]), table.zone_names[z], display_names[t]
+                        timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                        filename = f"{sys_obj['name']}_{global_track_id}_{display_name}_{zone_name}_{timestamp_str}.jpg".replace(" ", "_")
+                        filepath = os.path.join(snapshots_dir, filename)
+
+                        # Write file locally in this process
+                        cv2.imwrite(filepath, frame)
+
+                        # Send metadata to DB Writer
+                        self.results_queue.put({
+                            'type': 'snapshot',
+                            'data': {
+                                'camera_id': sys_obj['name'],
+                                'track_id': global_track_id,
+                                'zone': zone_name,
+                                'snapshot_path': filepath,
+                                'employee_name': display_name
+                            }
+                        })
+                        print(f"[{sys_obj['name']}] 📸 Snapshot: {display_name} entered {zone_name}")
+
+                    # Send Tracking Records to DB Writer
+                    for record in records:
+                        record['camera_id'] = sys_obj['name']
+                        self.results_queue.put({'type': 'record', 'data': record})
+
+                    # Finished visits, and open ones every DWELL_CHECKPOINT_INTERVAL seconds
+                    if sys_obj['dwell'] is not None:
+                        visits = sys_obj['dwell'].update(slots, cx, cy, inside, now)
+                        self._send_visits(sys_obj, visits + sys_obj['dwell'].checkpoint(now, dwell_checkpoint))
+
+                    track_centroids = list(zip(local_ids.tolist(), cx.tolist(), cy.tolist())) # For the rate controller
+                    self._update_rate(sys_obj, track_centroids)
+                    self._close_tracks(sys_obj, zone_events, face_client)
 
         except KeyboardInterrupt:
             pass
@@ -218,5 +461,84 @@ class CameraGroupProcess(multiprocessing.Process):
                 s['service'].stop()
             print("✅ CameraProcess shutdown.")
 
+    def _send_visits(self, sys_obj, visits):
+        for visit in visits:
+            visit['camera_id'] = sys_obj['name']
+            self.results_queue.put({'type': 'visit', 'data': visit})
+
+    def _zones_changed(self, sys_obj, zone_events):
+        """Applies reloaded zones to the camera's track table and detection ROIs."""
+        dropped = sys_obj['tracks'].set_zones(sys_obj['zone_checker'].names)
+        # Tracks inside a deleted zone leave it
+        for record in zone_events.removed(sys_obj['tracks'], dropped):
+            record['camera_id'] = sys_obj['name']
+            self.results_queue.put({'type': 'record', 'data': record})
+        sys_obj['rois'] = None
+        print(f"[{sys_obj['name']}] 🗺️ Zones reloaded: {', '.join(sys_obj['zone_checker'].names) or 'none'}")
+
+    def _close_tracks(self, sys_obj, zone_events, face_client=None):
+        """Evicts tracks not seen for TRACK_STATE_TTL seconds and reports them as closed."""
+        now = sys_obj['frame_timestamp']
+        for track in sys_obj['tracks'].evict(now):
+            if face_client is not None:
+                face_client.cancel((sys_obj['id'], track['track_id']))
+            for record in zone_events.closed(track):
+                record['camera_id'] = sys_obj['name']
+                self.results_queue.put({'type': 'record', 'data': record})
+            if sys_obj['dwell'] is not None:
+                self._send_visits(sys_obj, sys_obj['dwell'].close(track['slot']))
+            self.results_queue.put({
+                'type': 'track_closed',
+                'data': {
+                    'camera_id': sys_obj['name'],
+                    'track_id': track['track_id'],
+                    'employee_name': track['name'],
+                    'first_seen': track['first_seen'],
+                    'last_seen': track['last_seen'],
+                    'closed_at': now,
+                    'x': track['x'],
+                    'y': track['y'],
+                    'zones': track['zones'] # Still inside when lost
+                }
+            })
+
+    def _update_rate(self, sys_obj, track_centroids):
+        """Lets the camera's rate controller pick its analysis fps from the current tracks."""
+        controller = sys_obj['rate_controller']
+        if controller is None:
+            return
+        rate = controller.update(track_centroids, sys_obj['zone_checker'], sys_obj['frame_timestamp'])
+        if rate is None:
+            return
+
+        # Never exceed the configured rate; 0 means "no limit"
+        base_fps = sys_obj['base_fps']
+        if not rate:
+            rate = base_fps
+        elif base_fps:
+            rate = min(rate, base_fps)
+        sys_obj['service'].analysis_fps = rate
+        print(f"[{sys_obj['name']}] ⏱️ Analysis rate -> {'max' if not rate else f'{rate:g} fps'} ({controller.state})")
+
+    def _get_rois(self, sys_obj, frame_shape):
+        """Detector input regions for this camera (recomputed if the resolution changes)."""
+        if sys_obj['roi_mode'] == 'off':
+            return [None]
+        if sys_obj['rois'] is None or sys_obj['rois_shape'] != frame_shape:
+            # Zones are drawn at the camera's native resolution
+            sx, sy = sys_obj['scale']
+            bounds = [(minx / sx, miny / sy, maxx / sx, maxy / sy)
+                      for minx, miny, maxx, maxy in sys_obj['zone_checker'].bounds().values()]
+            sys_obj['rois'] = compute_rois(
+                bounds,
+                frame_shape,
+                mode=sys_obj['roi_mode'],
+                padding=getattr(config, 'ZONE_ROI_PADDING', 0.15),
+                max_tiles=getattr(config, 'ZONE_ROI_MAX_TILES', 4)
+            )
+            sys_obj['rois_shape'] = frame_shape
+            print(f"[{sys_obj['name']}] 🔲 Detection ROIs ({sys_obj['roi_mode']}): {sys_obj['rois']}")
+        return sys_obj['rois']
+
     def stop(self):
         self.running.clear()
@@ -3,6 +3,7 @@ import queue
 import time
 import sys
 import os
+from datetime import datetime
 
 # Ensure project root is in path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
@@ -41,7 +42,8 @@ class DBWriterProcess(multiprocessing.Process):
                         x=data['x'],
                         y=data['y'],
                         zone=data['zone'],
-                        inside_zone=data['inside_zone']
+                        inside_zone=data['inside_zone'],
+                        timestamp=datetime.fromtimestamp(data['timestamp']) if data.get('timestamp') else None
                     )
                 elif msg_type == 'snapshot':
                     db_manager.insert_snapshot(
@@ -51,6 +53,32 @@ class DBWriterProcess(multiprocessing.Process):
                         snapshot_path=data['snapshot_path'],
                         employee_name=data.get('employee_name')
                     )
+                elif msg_type == 'track_closed':
+                    # A track lost while inside a zone gets an exit record at its last position,
+                    # timestamped when it was closed so it sorts after its last record inside
+                    for zone in data.get('zones', []):
+                        db_manager.insert_record(
+                            camera_id=data['camera_id'],
+                            track_id=data['track_id'],
+                            x=data['x'],
+                            y=data['y'],
+                            zone=zone,
+                            inside_zone=0,
+                            timestamp=datetime.fromtimestamp(data.get('closed_at', data['last_seen']))
+                        )
+                elif msg_type == 'visit':
+                    db_manager.upsert_visit(
+                        camera_id=data['camera_id'],
+                        track_id=data['track_id'],
+                        zone=data['zone'],
+                        start_time=datetime.fromtimestamp(data['start_time']),
+                        end_time=datetime.fromtimestamp(data['end_time']),
+                        duration_sec=data['duration_sec'],
+                        activity_score=data['activity_score'],
+                        samples=data['samples'],
+                        closed=data['closed'],
+                        employee_name=data.get('employee_name')
+                    )
                 else:
                     print(f"⚠️ Unknown message type in DB queue: {msg_type}")
 
@@ -0,0 +1,209 @@
+import multiprocessing
+import queue
+import time
+import sys
+import os
+import numpy as np
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+try:
+    from config import config
+except ImportError:
+    # Fallback
+    import config
+
+from src.detection.batch_scheduler import BatchScheduler
+from src.recognition.face_recognizer import FaceRecognizer
+
+class FaceWorkerProcess(multiprocessing.Process):
+    """
+    Runs face recognition for several camera groups, off their frame loops.
+
+    Groups send person crops tagged with a (camera id, track id) key; workers of a
+    pool share one bounded request queue, batch the crops of every group they
+    receive and send the names back on the owning group's response queue.
+    Requests older than `max_age` seconds are dropped unprocessed.
+    """
+
+    def __init__(self, request_queue, response_queues, max_batch=16, max_wait=0.02, max_age=2.0, worker_id=0):
+        """
+        response_queues: {group_id: multiprocessing.Queue}
+        """
+        super().__init__()
+        self.request_queue = request_queue
+        self.response_queues = response_queues
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_age = max_age
+        self.worker_id = worker_id
+        self.dropped = 0
+        self.running = multiprocessing.Event()
+        self.running.set()
+
+    def run(self):
+        print(f"🙂 Face Worker {self.worker_id + 1} Started for {len(self.response_queues)} camera groups")
+
+        try:
+            recognizer = FaceRecognizer(tolerance=getattr(config, 'FACE_RECOGNITION_TOLERANCE', 0.6),
+                                        face_model=getattr(config, 'FACE_DETECTION_MODEL', 'hog'),
+                                        # Clients send head regions already (FACE_HEAD_FRACTION)
+                                        head_fraction=1.0,
+                                        locate_size=getattr(config, 'FACE_LOCATE_SIZE', 0),
+                                        dnn_model=getattr(config, 'FACE_DNN_MODEL', None) or None,
+                                        min_face_size=getattr(config, 'FACE_MIN_SIZE', 0),
+                                        min_sharpness=getattr(config, 'FACE_MIN_SHARPNESS', 0.0),
+                                        max_yaw=getattr(config, 'FACE_MAX_YAW', 0.0),
+                                        gallery_index=getattr(config, 'FACE_GALLERY_INDEX', 'exact'),
+                                        gallery_nprobe=getattr(config, 'FACE_GALLERY_NPROBE', 8))
+        except Exception as e:
+            print(f"❌ Face Worker failed to load the recognizer: {e}")
+            return
+
+        scheduler = BatchScheduler(max_batch=self.max_batch, max_wait=self.max_wait)
+        stats_interval = getattr(config, 'STREAM_STATS_INTERVAL', 60)
+        last_stats = time.time()
+
+        def poll_requests(timeout):
+            try:
+                return [self.request_queue.get(timeout=timeout)]
+            except queue.Empty:
+                return []
+
+        def count_faces(requests):
+            return sum(len(request['items']) for request in requests)
+
+        try:
+            while self.running.is_set():
+                if stats_interval and time.time() - last_stats >= stats_interval:
+                    last_stats = time.time()
+                    rejected = recognizer.rejected
+                    print(f"🙂 Face Worker {self.worker_id + 1}: {BatchScheduler.format_stats(scheduler.stats())} | Dropped (stale) {self.dropped} | "
+                          f"Rejected size {rejected['size']} / blur {rejected['blur']} / pose {rejected['pose']}")
+                    self.dropped = 0
+                    recognizer.rejected = {'size': 0, 'blur': 0, 'pose': 0}
+
+                requests = scheduler.collect(poll_requests, size=count_faces)
+                if not requests:
+                    continue
+
+                start = time.perf_counter()
+                scheduler.record(self._process(recognizer, requests), time.perf_counter() - start)
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            print(f"❌ Error in Face Worker loop: {e}")
+        finally:
+            print(f"🛑 Face Worker {self.worker_id + 1} stopped.")
+
+    def _process(self, recognizer, requests):
+        """Recognizes the crops of fresh requests in one batch; returns how many it handled."""
+        now = time.time()
+        fresh = []
+        for request in requests:
+            if now - request['submitted'] > self.max_age:
+                # Tracks have moved on (or ended); the group will ask again
+                self.dropped += len(request['items'])
+                items = [(key, None) for key, crop in request['items']]
+                self._respond(request['group_id'], items)
+            else:
+                fresh.append(request)
+
+        crops = [crop for request in fresh for key, crop in request['items']]
+        # Each crop is the whole region to search; the last request collected
+        # may overshoot max_batch, so recognize in chunks of at most max_batch
+        names = []
+        for i in range(0, len(crops), self.max_batch):
+            chunk = crops[i:i + self.max_batch]
+            names += recognizer.recognize_batch(chunk, [(0, 0, crop.shape[1], crop.shape[0]) for crop in chunk])
+        names = iter(names)
+        for request in fresh:
+            self._respond(request['group_id'], [(key, next(names)) for key, crop in request['items']])
+        return len(crops)
+
+    def _respond(self, group_id, results):
+        response_queue = self.response_queues.get(group_id)
+        if response_queue is not None:
+            response_queue.put({'results': results})
+
+    def stop(self):
+        self.running.clear()
+
+
+class FaceRecognitionClient:
+    """
+    Used inside a CameraGroupProcess to hand faces to a FaceWorkerProcess pool.
+
+    A track has at most one request in flight; submissions beyond `max_pending`
+    faces or a full request queue are dropped (the track is retried on a later
+    frame). Answers for tracks cancelled in the meantime are discarded.
+
+    Only the top `head_fraction` of each person box is sent, in requests of at
+    most `max_batch` faces.
+    """
+
+    def __init__(self, group_id, request_queue, response_queue, max_pending=64, max_age=2.0,
+                 max_batch=16, head_fraction=1.0):
+        self.group_id = group_id
+        self.request_queue = request_queue
+        self.response_queue = response_queue
+        self.max_pending = max_pending
+        self.max_age = max_age
+        self.max_batch = max_batch
+        self.head_fraction = head_fraction
+        self.pending = {} # {key: submit time}
+        self.dropped = 0
+
+    def submit(self, frames, bboxes, keys):
+        """Queues the head region of each (frame, bbox, key) whose track has no request in flight."""
+        now = time.time()
+        # Answers lost with a worker: allow a new request
+        for key, submitted in list(self.pending.items()):
+            if now - submitted > 2 * self.max_age:
+                del self.pending[key]
+
+        items = []
+        for frame, bbox, key in zip(frames, bboxes, keys):
+            if key in self.pending:
+                continue
+            if len(self.pending) >= self.max_pending:
+                self.dropped += 1
+                continue
+            if bbox and self.head_fraction < 1.0:
+                bbox = FaceRecognizer.head_box(bbox, self.head_fraction)
+            # Copy: frames are views into the camera's shared memory ring
+            items.append((key, np.ascontiguousarray(FaceRecognizer.crop(frame, bbox))))
+            self.pending[key] = now
+
+        sent = 0
+        for i in range(0, len(items), self.max_batch):
+            chunk = items[i:i + self.max_batch]
+            try:
+                self.request_queue.put_nowait({'group_id': self.group_id, 'submitted': now, 'items': chunk})
+            except queue.Full:
+                for key, crop in items[i:]:
+                    del self.pending[key]
+                self.dropped += len(items) - i
+                break
+            sent += len(chunk)
+        return sent
+
+    def cancel(self, key):
+        """Forgets the request of an ended track."""
+        self.pending.pop(key, None)
+
+    def results(self):
+        """
+        (key, name) of the answers received since the last call, without blocking.
+        name is None for faces the workers did not check (quality gate or stale request).
+        """
+        results = []
+        while True:
+            try:
+                response = self.response_queue.get_nowait()
+            except queue.Empty:
+                return results
+            for key, name in response['results']:
+                if self.pending.pop(key, None) is not None:
+                    results.append((key, name))
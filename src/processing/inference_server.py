@@ -0,0 +1,181 @@
+import multiprocessing
+import queue
+import time
+import sys
+import os
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+try:
+    from config import config
+except ImportError:
+    # Fallback
+    import config
+
+from src.detection.person_detector import PersonDetector
+from src.detection.batch_scheduler import BatchScheduler
+from src.detection.roi import crop
+from src.acquisition.frame_ring_buffer import FrameRingBuffer
+
+class InferenceServerProcess(multiprocessing.Process):
+    """
+    Runs a single PersonDetector for several camera groups.
+
+    Groups send requests that reference frames by shared memory ring name, slot
+    and sequence number; the server batches frames from every group it serves and
+    sends the detections back on the owning group's response queue. A frame whose
+    slot was overwritten before or during inference is answered with None (stale).
+    """
+
+    def __init__(self, request_queue, response_queues, max_batch=16, max_wait=0.02, server_id=0):
+        """
+        response_queues: {group_id: multiprocessing.Queue}
+        """
+        super().__init__()
+        self.request_queue = request_queue
+        self.response_queues = response_queues
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.server_id = server_id
+        self.running = multiprocessing.Event()
+        self.running.set()
+
+    def run(self):
+        print(f"🧠 Inference Server {self.server_id + 1} Started for {len(self.response_queues)} camera groups")
+
+        try:
+            threads = getattr(config, 'INFERENCE_THREADS', 0)
+            if threads:
+                import torch
+                torch.set_num_threads(threads)
+
+            detector = PersonDetector(confidence_threshold=config.CONFIDENCE_THRESHOLD,
+                                      backend=getattr(config, 'DETECTOR_BACKEND', 'pytorch'))
+        except Exception as e:
+            print(f"❌ Inference Server failed to load the detector: {e}")
+            return
+
+        buffers = {}  # {camera id: FrameRingBuffer attached to its current ring}
+        scheduler = BatchScheduler(max_batch=self.max_batch, max_wait=self.max_wait)
+        stats_interval = getattr(config, 'STREAM_STATS_INTERVAL', 60)
+        last_stats = time.time()
+
+        def poll_requests(timeout):
+            try:
+                return [self.request_queue.get(timeout=timeout)]
+            except queue.Empty:
+                return []
+
+        def count_frames(requests):
+            return sum(len(request['items']) for request in requests)
+
+        try:
+            while self.running.is_set():
+                if stats_interval and time.time() - last_stats >= stats_interval:
+                    last_stats = time.time()
+                    print(f"🧠 Inference Server {self.server_id + 1}: {BatchScheduler.format_stats(scheduler.stats())}")
+
+                # Requests from all groups until max_batch frames or the deadline
+                requests = scheduler.collect(poll_requests, size=count_frames)
+                if not requests:
+                    continue
+
+                inference_start = time.perf_counter()
+                self._process(detector, buffers, requests)
+                scheduler.record(count_frames(requests), time.perf_counter() - inference_start)
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            print(f"❌ Error in Inference Server loop: {e}")
+        finally:
+            for buffer in buffers.values():
+                buffer.close()
+            print(f"🛑 Inference Server {self.server_id + 1} stopped.")
+
+    def _process(self, detector, buffers, requests):
+        frames = []
+        sizes = []   # Inference size of each frame (per camera)
+        owners = []  # (request index, item index, buffer, slot, seq) for each frame in the batch
+        results = [[None for _ in request['items']] for request in requests]
+
+        for r, request in enumerate(requests):
+            for i, (camera_id, descriptor, slot, seq, roi, imgsz) in enumerate(request['items']):
+                buffer = self._attach(buffers, camera_id, descriptor)
+                # Gone or already overwritten while queued: stale
+                if buffer is None or not buffer.is_current(slot, seq):
+                    continue
+                frames.append(crop(buffer.frame(slot), roi))
+                sizes.append(imgsz)
+                owners.append((r, i, buffer, slot, seq))
+
+        if frames:
+            for (r, i, buffer, slot, seq), detections in zip(owners, detector.detect_batch(frames, imgsz=sizes)):
+                # Overwritten during inference: the detections may mix two frames
+                if buffer.is_current(slot, seq):
+                    results[r][i] = detections
+
+        for request, detections in zip(requests, results):
+            response_queue = self.response_queues.get(request['group_id'])
+            if response_queue is not None:
+                response_queue.put({'request_id': request['request_id'], 'detections': detections})
+
+    def _attach(self, buffers, camera_id, descriptor):
+        buffer = buffers.get(camera_id)
+        if buffer is not None:
+            if buffer.name == descriptor['name']:
+                return buffer
+            # The camera replaced its ring (reconnect with a new resolution)
+            buffer.close()
+            del buffers[camera_id]
+        try:
+            buffer = FrameRingBuffer.attach(descriptor['name'], descriptor['frame_shape'], descriptor['slots'])
+        except FileNotFoundError:
+            # Replaced again since the request was sent
+            return None
+        buffers[camera_id] = buffer
+        return buffer
+
+    def stop(self):
+        self.running.clear()
+
+
+class InferenceClient:
+    """Used inside a CameraGroupProcess in place of a local PersonDetector."""
+
+    def __init__(self, group_id, request_queue, response_queue, timeout=5.0):
+        self.group_id = group_id
+        self.request_queue = request_queue
+        self.response_queue = response_queue
+        self.timeout = timeout
+        self.request_id = 0
+
+    def detect_refs(self, frame_refs):
+        """
+        frame_refs: list of (camera id, FrameRingBuffer, slot, seq, roi, imgsz); roi is
+        (x1, y1, x2, y2) or None
+        Returns a list of sv.Detections (in ROI coordinates), one per ref, or None
+        for frames that were overwritten before the server ran them (stale) and
+        for every frame when the server did not answer in time.
+        """
+        if not frame_refs:
+            return []
+
+        self.request_id += 1
+        self.request_queue.put({
+            'group_id': self.group_id,
+            'request_id': self.request_id,
+            'items': [(camera_id, buffer.descriptor(), slot, seq, roi, imgsz)
+                      for camera_id, buffer, slot, seq, roi, imgsz in frame_refs]
+        })
+
+        while True:
+            try:
+                response = self.response_queue.get(timeout=self.timeout)
+            except queue.Empty:
+                print(f"⚠️ Inference Server did not answer group {self.group_id + 1} in {self.timeout}s")
+                # Not an empty scene: the camera loop skips these frames like stale ones
+                return [None for _ in frame_refs]
+            # Late answers to requests that already timed out are dropped
+            if response['request_id'] == self.request_id:
+                return response['detections']
@@ -0,0 +1,56 @@
+import math
+
+class AdaptiveRateController:
+    """
+    Picks a camera's analysis rate from what its tracker currently sees:
+      - 'idle':       no tracks                                  -> idle_fps
+      - 'stationary': tracks, none moving or near a zone edge    -> stationary_fps
+      - 'active':     a track moving or close to a zone boundary -> active_fps (0 = no limit)
+    The rate is applied in the capture thread (VideoStreamService.analysis_fps),
+    so frames we skip are never decoded.
+    """
+
+    def __init__(self, idle_fps=1.0, stationary_fps=3.0, active_fps=0.0, boundary_margin=50.0, moving_speed=30.0):
+        self.rates = {'idle': idle_fps, 'stationary': stationary_fps, 'active': active_fps}
+        self.boundary_margin = boundary_margin
+        self.moving_speed = moving_speed
+        self.state = 'active'
+        self._positions = {}  # {track_id: (cx, cy, timestamp)}
+
+    @property
+    def rate(self):
+        return self.rates[self.state]
+
+    def classify(self, tracks, zone_checker, now):
+        """
+        tracks: list of (track_id, cx, cy) in zone coordinates.
+        Returns the new state.
+        """
+        positions = {}
+        state = 'idle' if not tracks else 'stationary'
+        for track_id, cx, cy in tracks:
+            positions[track_id] = (cx, cy, now)
+            if state == 'active':
+                continue
+
+            previous = self._positions.get(track_id)
+            if previous is not None and now > previous[2]:
+                speed = math.hypot(cx - previous[0], cy - previous[1]) / (now - previous[2])
+                if speed >= self.moving_speed:
+                    state = 'active'
+                    continue
+
+            if zone_checker.boundary_distance(cx, cy) <= self.boundary_margin:
+                state = 'active'
+
+        # Only tracks seen this frame are kept
+        self._positions = positions
+        return state
+
+    def update(self, tracks, zone_checker, now):
+        """Classifies the camera; returns the new rate if the state changed, else None."""
+        state = self.classify(tracks, zone_checker, now)
+        if state == self.state:
+            return None
+        self.state = state
+        return self.rate
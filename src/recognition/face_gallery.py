@@ -0,0 +1,103 @@
+# src/recognition/face_gallery.py
+
+import numpy as np
+
+class FaceGallery:
+    """
+    Known face encodings as one contiguous float32 (N x 128) matrix with precomputed
+    squared norms, so a batch of M queries is matched with a single matrix product:
+        |q - g|^2 = |q|^2 + |g|^2 - 2 q.g
+    Distances are euclidean, like face_recognition.face_distance.
+
+    index: 'exact' -> every query against the whole gallery
+           'ivf'   -> approximate inverted-file index (k-means lists, `nprobe` lists
+                      searched per query), for galleries of thousands of people
+    """
+
+    def __init__(self, encodings=(), names=(), index="exact", nlist=None, nprobe=8):
+        encodings = [np.asarray(e, dtype=np.float32).reshape(-1) for e in encodings]
+        dim = len(encodings[0]) if encodings else 128
+        self.matrix = np.ascontiguousarray(np.array(encodings, dtype=np.float32).reshape(-1, dim))
+        self.norms = np.einsum('ij,ij->i', self.matrix, self.matrix)
+        self.names = list(names)
+        self.index = index
+        self.nprobe = nprobe
+
+        self.centroids = None
+        self.lists = None
+        if index == "ivf" and len(self.matrix):
+            self._build_ivf(nlist or max(1, int(np.sqrt(len(self.matrix)))))
+
+    def __len__(self):
+        return len(self.names)
+
+    def _sq_distances(self, queries, rows=None):
+        matrix, norms = (self.matrix, self.norms) if rows is None else (self.matrix[rows], self.norms[rows])
+        q_norms = np.einsum('ij,ij->i', queries, queries)
+        d2 = q_norms[:, None] + norms[None, :] - 2.0 * (queries @ matrix.T)
+        return np.maximum(d2, 0.0)
+
+    def _build_ivf(self, nlist, iterations=10, seed=0):
+        """Coarse k-means over the gallery; each encoding goes to the list of its centroid."""
+        rng = np.random.default_rng(seed)
+        nlist = min(nlist, len(self.matrix))
+        centroids = self.matrix[rng.choice(len(self.matrix), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = self._nearest_centroids(centroids, self.matrix, 1)[:, 0]
+            for c in range(nlist):
+                members = self.matrix[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+        assign = self._nearest_centroids(centroids, self.matrix, 1)[:, 0]
+        self.centroids = centroids
+        self.lists = [np.flatnonzero(assign == c) for c in range(nlist)]
+
+    @staticmethod
+    def _nearest_centroids(centroids, queries, n):
+        d2 = (np.einsum('ij,ij->i', queries, queries)[:, None] + np.einsum('ij,ij->i', centroids, centroids)[None, :]
+              - 2.0 * (queries @ centroids.T))
+        n = min(n, len(centroids))
+        nearest = np.argpartition(d2, n - 1, axis=1)[:, :n]
+        return np.take_along_axis(nearest, np.argsort(np.take_along_axis(d2, nearest, axis=1), axis=1), axis=1)
+
+    @staticmethod
+    def _top_k(d2, k):
+        k = min(k, d2.shape[1])
+        top = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(d2, top, axis=1), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return top, np.sqrt(np.take_along_axis(d2, top, axis=1))
+
+    def search(self, queries, k=1):
+        """
+        Top-k gallery entries for each of the M query encodings.
+        Returns (names, distances): M lists of k names and an M x k float array,
+        nearest first (fewer than k columns if the gallery is smaller).
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.matrix.shape[1])
+        if not len(self) or not len(queries):
+            return [[] for _ in queries], np.zeros((len(queries), 0), dtype=np.float32)
+
+        if self.lists is None:
+            indices, distances = self._top_k(self._sq_distances(queries), k)
+        else:
+            k = min(k, len(self))
+            indices = np.zeros((len(queries), k), dtype=np.intp)
+            distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+            probes = self._nearest_centroids(self.centroids, queries, self.nprobe)
+            for i, lists in enumerate(probes):
+                rows = np.concatenate([self.lists[c] for c in lists])
+                if not len(rows):
+                    continue
+                top, dist = self._top_k(self._sq_distances(queries[i:i + 1], rows), k)
+                indices[i, :top.shape[1]] = rows[top[0]]
+                distances[i, :top.shape[1]] = dist[0]
+
+        names = [[self.names[j] if np.isfinite(d) else "Unknown" for j, d in zip(row, dist)]
+                 for row, dist in zip(indices, distances)]
+        return names, distances
+
+    def match(self, queries, tolerance=0.6):
+        """Best name per query encoding, or "Unknown" if its nearest entry is farther than `tolerance`."""
+        names, distances = self.search(queries, k=1)
+        return [n[0] if len(n) and d[0] <= tolerance else "Unknown" for n, d in zip(names, distances)]
@@ -4,6 +4,7 @@ import cv2
 import numpy as np
 import shutil
 from src.paths import get_user_data_path
+from src.recognition.face_gallery import FaceGallery
 
 try:
     import face_recognition
@@ -12,7 +13,9 @@ except ImportError:
     face_recognition = None
 
 class FaceRecognizer:
-    def __init__(self, faces_dir=None, encodings_file=None, tolerance=0.6):
+    def __init__(self, faces_dir=None, encodings_file=None, tolerance=0.6, gallery_index="exact", gallery_nprobe=8,
+                 face_model="hog", head_fraction=1.0, locate_size=0, dnn_model=None, dnn_threshold=0.6,
+                 min_face_size=0, min_sharpness=0.0, max_yaw=0.0):
         if faces_dir is None:
             faces_dir = get_user_data_path("data/faces")
         if encodings_file is None:
@@ -23,6 +26,20 @@ class FaceRecognizer:
         self.tolerance = tolerance
         self.known_face_encodings = []
         self.known_face_names = []
+        self.face_model = face_model # Face locator: 'hog' (CPU), 'cnn' (batched, GPU) or 'dnn' (OpenCV, CPU)
+        self.head_fraction = head_fraction # Top part of the person box searched for the face (1.0 = all)
+        self.locate_size = locate_size     # Longest side the searched region is downscaled to (0 = full size)
+        self.dnn_threshold = dnn_threshold
+        # Quality gate before encoding (0 = check disabled)
+        self.min_face_size = min_face_size # Pixels, shortest side of the face box
+        self.min_sharpness = min_sharpness # Variance of the Laplacian of the face
+        self.max_yaw = max_yaw             # Nose offset from the eyes' midpoint, in eye distances
+        self.rejected = {'size': 0, 'blur': 0, 'pose': 0}
+        self._dnn = self._load_dnn(dnn_model) if face_model == "dnn" else None
+        self.gallery_index = gallery_index
+        self.gallery_nprobe = gallery_nprobe
+        self._gallery = None
+        self._gallery_key = None
         
         # Ensure directory exists
         os.makedirs(self.faces_dir, exist_ok=True)
@@ -80,14 +97,23 @@ class FaceRecognizer:
         with open(self.encodings_file, 'wb') as f:
             pickle.dump(data, f)
 
-    def recognize_face(self, frame, bbox=None):
-        """
-        Recognizes a face in the frame.
-        Returns the name or "Unknown".
-        """
-        if face_recognition is None:
-            return "Unknown"
+    @property
+    def gallery(self):
+        """FaceGallery of the known encodings, rebuilt when they change."""
+        key = (id(self.known_face_encodings), len(self.known_face_encodings))
+        if self._gallery is None or key != self._gallery_key:
+            self._gallery = FaceGallery(self.known_face_encodings, self.known_face_names,
+                                        index=self.gallery_index, nprobe=self.gallery_nprobe)
+            self._gallery_key = key
+        return self._gallery
+
+    def match_encodings(self, encodings):
+        """Names for a batch of face encodings ("Unknown" beyond the tolerance)."""
+        return self.gallery.match(encodings, tolerance=self.tolerance)
 
+    @staticmethod
+    def crop(frame, bbox):
+        """View of the person box, clipped to the frame (whole frame without bbox)."""
         if bbox:
             x1, y1, x2, y2 = map(int, bbox)
             # Ensure bbox is within frame
@@ -97,44 +123,162 @@ class FaceRecognizer:
             x2 = min(w, x2)
             y2 = min(h, y2)
             
-            face_image = frame[y1:y2, x1:x2]
-        else:
-            face_image = frame
+            return frame[y1:y2, x1:x2]
+        return frame
 
-        # Convert BGR to RGB
-        rgb_face_image = cv2.cvtColor(face_image, cv2.COLOR_BGR2RGB)
-        
-        # Detect faces in the crop/frame
-        face_locations = face_recognition.face_locations(rgb_face_image)
-        if not face_locations:
-            return "Unknown"
-        
-        # Get encodings
-        face_encodings = face_recognition.face_encodings(rgb_face_image, face_locations)
-        
-        if not face_encodings:
-            return "Unknown"
+    @staticmethod
+    def head_box(bbox, fraction):
+        """Top `fraction` of a person box, where the head of an upright person is."""
+        x1, y1, x2, y2 = bbox
+        return (x1, y1, x2, y1 + (y2 - y1) * fraction)
 
-        # We take the first face found in the bbox
-        encoding = face_encodings[0]
-        
-        if not self.known_face_encodings:
-            return "Unknown"
-
-        # --- AQUÍ ESTÁ EL CAMBIO IMPORTANTE ---
-        # Usamos la tolerancia configurada
-        # Esto permite ajustar qué tan estricto es el sistema
-        matches = face_recognition.compare_faces(self.known_face_encodings, encoding, tolerance=self.tolerance)
-        name = "Unknown"
-
-        # Use the known face with the smallest distance to the new face
-        face_distances = face_recognition.face_distance(self.known_face_encodings, encoding)
-        best_match_index = np.argmin(face_distances)
-        
-        if matches[best_match_index]:
-            name = self.known_face_names[best_match_index]
+    def _load_dnn(self, model_path):
+        """OpenCV DNN face detector (YuNet), or None to fall back to HOG."""
+        if model_path is None:
+            model_path = get_user_data_path("data/models/face_detection_yunet.onnx")
+        if not os.path.exists(model_path) or not hasattr(cv2, 'FaceDetectorYN'):
+            print(f"⚠️ No face detection model at {model_path}. Falling back to hog.")
+            return None
+        return cv2.FaceDetectorYN.create(model_path, "", (320, 320), self.dnn_threshold)
+
+    def _locate_dnn(self, image):
+        """Face locations (top, right, bottom, left) in a BGR image, best score first."""
+        h, w = image.shape[:2]
+        self._dnn.setInputSize((w, h))
+        _, faces = self._dnn.detect(image)
+        if faces is None:
+            return []
+        faces = faces[np.argsort(-faces[:, -1])]
+        locations = [(max(0, int(y)), min(w, int(x + fw)), min(h, int(y + fh)), max(0, int(x)))
+                     for x, y, fw, fh in faces[:, :4]]
+        return [(top, right, bottom, left) for top, right, bottom, left in locations if bottom > top and right > left]
+
+    def _locate_batch(self, images):
+        """
+        Face locations in each BGR image: DNN or HOG one by one, CNN in a single
+        padded batch. Images that are None or empty have no faces.
+        """
+        locations = [[] for _ in images]
+        valid = [i for i, image in enumerate(images) if image is not None and image.size]
+        for i, found in zip(valid, self._locate_images([images[i] for i in valid])):
+            locations[i] = found
+        return locations
+
+    def _locate_images(self, images):
+        if not images:
+            return []
+        if self._dnn is not None:
+            return [self._locate_dnn(image) for image in images]
+
+        images = [cv2.cvtColor(image, cv2.COLOR_BGR2RGB) for image in images]
+        model = "hog" if self.face_model == "dnn" else self.face_model
+        if model != "cnn" or len(images) < 2:
+            return [face_recognition.face_locations(image, model=model) for image in images]
+
+        # batch_face_locations needs images of one size: pad crops at the bottom/right,
+        # so locations stay relative to each crop
+        h = max(image.shape[0] for image in images)
+        w = max(image.shape[1] for image in images)
+        padded = np.zeros((len(images), h, w, 3), dtype=np.uint8)
+        for i, image in enumerate(images):
+            padded[i, :image.shape[0], :image.shape[1]] = image
+        return face_recognition.batch_face_locations(list(padded), batch_size=len(images))
 
-        return name
+    def face_quality(self, crop, rgb, location):
+        """Why a located face cannot give a reliable match ('size', 'blur' or 'pose'), or None."""
+        top, right, bottom, left = location
+        if self.min_face_size and min(bottom - top, right - left) < self.min_face_size:
+            return 'size'
+
+        if self.min_sharpness:
+            gray = cv2.cvtColor(crop[top:bottom, left:right], cv2.COLOR_BGR2GRAY)
+            if cv2.Laplacian(gray, cv2.CV_64F).var() < self.min_sharpness:
+                return 'blur'
+
+        if self.max_yaw:
+            # 5-point landmarks: a turned head moves the nose away from between the eyes
+            landmarks = face_recognition.face_landmarks(rgb, [location], model="small")
+            if not landmarks:
+                return 'pose'
+            left_eye = np.mean(landmarks[0]['left_eye'], axis=0)
+            right_eye = np.mean(landmarks[0]['right_eye'], axis=0)
+            nose = np.mean(landmarks[0]['nose_tip'], axis=0)
+            eye_distance = max(np.linalg.norm(left_eye - right_eye), 1.0)
+            if abs(nose[0] - (left_eye[0] + right_eye[0]) / 2) / eye_distance > self.max_yaw:
+                return 'pose'
+        return None
+
+    def encode_batch(self, frames, bboxes):
+        """
+        Encoding of the first face in each person box, or None where no face is found.
+        The face is searched in the head region of the box, downscaled to `locate_size`,
+        and encoded at full resolution.
+        Returns (encodings, rejected): rejected[i] is True when the face failed the
+        quality check (face_quality) and was not encoded.
+        """
+        crops, images, scales = [], [], []
+        for frame, bbox in zip(frames, bboxes):
+            if bbox and self.head_fraction < 1.0:
+                bbox = self.head_box(bbox, self.head_fraction)
+            crop = self.crop(frame, bbox)
+            longest = max(crop.shape[:2])
+            scale = self.locate_size / longest if self.locate_size and longest > self.locate_size else 1.0
+            crops.append(crop)
+            scales.append(scale)
+            if min(crop.shape[:2]) * scale < 1:
+                # Box outside the frame (or a sliver of it): nothing to search
+                images.append(None)
+            else:
+                images.append(cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else crop)
+
+        encodings, rejected = [], []
+        for crop, scale, face_locations in zip(crops, scales, self._locate_batch(images)):
+            encodings.append(None)
+            rejected.append(False)
+            if not face_locations:
+                continue
+            # We take the first face found in the box, back in crop pixels
+            location = tuple(int(round(v / scale)) for v in face_locations[0])
+            rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+            reason = self.face_quality(crop, rgb, location)
+            if reason is not None:
+                self.rejected[reason] += 1
+                rejected[-1] = True
+                continue
+            face_encodings = face_recognition.face_encodings(rgb, [location])
+            if len(face_encodings):
+                encodings[-1] = face_encodings[0]
+        return encodings, rejected
+
+    def recognize_batch(self, frames, bboxes):
+        """
+        Recognizes the face in each (frame, bbox) pair, e.g. every track of every camera
+        in a detection batch. All faces are matched against the gallery at once.
+        Returns one name or "Unknown" per pair, or None where the face failed the
+        quality check (worth trying again on a later frame).
+        """
+        names = ["Unknown"] * len(bboxes)
+        if face_recognition is None or not len(bboxes):
+            return names
+
+        encodings, rejected = self.encode_batch(frames, bboxes)
+        names = [None if r else name for name, r in zip(names, rejected)]
+        found = [i for i, encoding in enumerate(encodings) if encoding is not None]
+        if not found or not self.known_face_encodings:
+            return names
+
+        # Nearest known face within the configured tolerance
+        # (lower tolerance = stricter)
+        for i, name in zip(found, self.match_encodings([encodings[i] for i in found])):
+            names[i] = name
+        return names
+
+    def recognize_face(self, frame, bbox=None):
+        """
+        Recognizes a face in the frame.
+        Returns the name or "Unknown".
+        """
+        return self.recognize_batch([frame], [bbox])[0] or "Unknown"
 
     def register_face(self, image_path, name):
         """Registers a new face from an image file."""
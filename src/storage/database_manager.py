@@ -9,7 +9,7 @@ try:
 except ImportError:
     import config
 
-from src.storage.models import Base, TrackingEvent, Snapshot, User
+from src.storage.models import Base, TrackingEvent, Snapshot, User, Visit
 # Import get_password_hash locally to avoid circular import issues if any
 # But we can import it at the top if we are sure
 from src.auth.security import get_password_hash
@@ -26,13 +26,13 @@ class DatabaseManager:
         Base.metadata.create_all(self.engine)
         self.Session = sessionmaker(bind=self.engine)
 
-    def insert_record(self, camera_id, track_id, x, y, zone, inside_zone):
+    def insert_record(self, camera_id, track_id, x, y, zone, inside_zone, timestamp=None):
         session = self.Session()
         try:
             event = TrackingEvent(
                 camera_id=str(camera_id),
                 track_id=track_id,
-                timestamp=datetime.now(),
+                timestamp=timestamp or datetime.now(),
                 x=x,
                 y=y,
                 zone=zone,
@@ -65,6 +65,58 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def upsert_visit(self, camera_id, track_id, zone, start_time, end_time, duration_sec,
+                     activity_score, samples, closed, employee_name=None):
+        """Inserts a visit, or updates it if a checkpoint of the same visit was already stored."""
+        session = self.Session()
+        try:
+            visit = session.query(Visit).filter(
+                Visit.camera_id == str(camera_id),
+                Visit.track_id == track_id,
+                Visit.zone == zone,
+                Visit.start_time == start_time
+            ).first()
+            if visit is None:
+                visit = Visit(camera_id=str(camera_id), track_id=track_id, zone=zone, start_time=start_time)
+                session.add(visit)
+            visit.end_time = end_time
+            visit.duration_sec = duration_sec
+            visit.activity_score = activity_score
+            visit.samples = samples
+            visit.closed = closed
+            visit.employee_name = employee_name
+            session.commit()
+        except Exception as e:
+            print(f"Error upserting visit: {e}")
+            session.rollback()
+        finally:
+            session.close()
+
+    def get_visits(self, camera_id=None, closed=None):
+        session = self.Session()
+        try:
+            query = session.query(Visit)
+            if camera_id:
+                query = query.filter(Visit.camera_id == camera_id)
+            if closed is not None:
+                query = query.filter(Visit.closed == closed)
+            return [
+                {
+                    'camera_id': v.camera_id,
+                    'track_id': v.track_id,
+                    'employee_name': v.employee_name,
+                    'zone': v.zone,
+                    'start_time': v.start_time,
+                    'end_time': v.end_time,
+                    'duration_sec': v.duration_sec,
+                    'activity_score': v.activity_score,
+                    'samples': v.samples,
+                    'closed': v.closed
+                } for v in query.order_by(Visit.start_time).all()
+            ]
+        finally:
+            session.close()
+
     def get_all_records(self):
         session = self.Session()
         try:
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
 
@@ -33,6 +33,24 @@ class Snapshot(Base):
     def __repr__(self):
         return f"<Snapshot(camera_id='{self.camera_id}', track_id={self.track_id}, employee_name='{self.employee_name}')>"
 
+class Visit(Base):
+    __tablename__ = 'visits'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    camera_id = Column(String, nullable=False)
+    track_id = Column(Integer, nullable=False)
+    zone = Column(String)
+    employee_name = Column(String, nullable=True)
+    start_time = Column(DateTime)
+    end_time = Column(DateTime)
+    duration_sec = Column(Float)
+    activity_score = Column(Float)  # std(x) + std(y) while inside, as in EfficiencyCalculator
+    samples = Column(Integer)
+    closed = Column(Boolean, default=False)  # False while the visit is still open (periodic checkpoint)
+
+    def __repr__(self):
+        return f"<Visit(camera_id='{self.camera_id}', track_id={self.track_id}, zone='{self.zone}', duration_sec={self.duration_sec})>"
+
 class User(Base):
     __tablename__ = 'users'
 
@@ -0,0 +1,118 @@
+# src/tracking/dwell.py
+
+import numpy as np
+
+class DwellAggregator:
+    """
+    Running per-track, per-zone visit accumulators, indexed like a TrackTable
+    (slot x zone): enter time, last seen and Welford mean/variance of x and y.
+
+    A visit is the run of frames a track spends inside a zone. Its activity score
+    is std(x) + std(y) over those frames, the same metric EfficiencyCalculator
+    computes from the raw tracking rows, so it is available live.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self._allocate(len(table.rows), list(table.zone_names))
+
+    _ARRAYS = ('active', 'count', 'enter_time', 'last_seen', 'last_flush', 'mean', 'm2')
+
+    def _allocate(self, capacity, zone_names):
+        shape = (capacity, len(zone_names))
+        self.zone_names = zone_names
+        self.active = np.zeros(shape, dtype=bool)
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.enter_time = np.zeros(shape, dtype=np.float64)
+        self.last_seen = np.zeros(shape, dtype=np.float64)
+        self.last_flush = np.zeros(shape, dtype=np.float64)
+        self.mean = np.zeros(shape + (2,), dtype=np.float64)
+        self.m2 = np.zeros(shape + (2,), dtype=np.float64)
+
+    def _sync(self):
+        """Follows the table when it grows or its zones change; returns visits of removed zones."""
+        closed = []
+        if len(self.table.rows) > len(self.active):
+            extra = len(self.table.rows) - len(self.active)
+            for name in self._ARRAYS:
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate([array, np.zeros((extra,) + array.shape[1:], dtype=array.dtype)]))
+        if self.zone_names != self.table.zone_names:
+            zone_names = list(self.table.zone_names)
+            removed = np.array([z for z, name in enumerate(self.zone_names) if name not in zone_names], dtype=int)
+            rows, cols = np.nonzero(self.active[:, removed])
+            closed = self._visits(rows, removed[cols])
+
+            # Visits of zones that still exist carry over (matched by name)
+            kept = [(z, zone_names.index(name)) for z, name in enumerate(self.zone_names) if name in zone_names]
+            old = {name: getattr(self, name) for name in self._ARRAYS}
+            self._allocate(len(self.active), zone_names)
+            if kept:
+                src, dst = (list(z) for z in zip(*kept))
+                for name, array in old.items():
+                    getattr(self, name)[:, dst] = array[:, src]
+        return closed
+
+    def _visits(self, rows, cols, closed=True):
+        visits = []
+        for r, z in zip(rows.tolist(), cols.tolist()):
+            n = self.count[r, z]
+            std = np.sqrt(self.m2[r, z] / (n - 1)) if n > 1 else np.zeros(2)
+            visits.append({
+                'track_id': int(self.table.rows['track_id'][r]),
+                'employee_name': self.table.name(r),
+                'zone': self.zone_names[z],
+                'start_time': float(self.enter_time[r, z]),
+                'end_time': float(self.last_seen[r, z]),
+                'duration_sec': round(float(self.last_seen[r, z] - self.enter_time[r, z]), 2),
+                'samples': int(n),
+                'mean_x': float(self.mean[r, z, 0]),
+                'mean_y': float(self.mean[r, z, 1]),
+                'activity_score': round(float(std[0] + std[1]), 2),
+                'closed': closed,
+            })
+        return visits
+
+    def update(self, slots, cx, cy, inside, now):
+        """
+        Adds this frame's positions of the tracks in `slots` (membership N x Z bool).
+        Returns the visits that ended (track left the zone).
+        """
+        closed = self._sync()
+        active = self.active[slots]
+        ended = active & ~inside
+        closed += self._visits(slots[np.nonzero(ended)[0]], np.nonzero(ended)[1])
+
+        t, z = np.nonzero(inside)
+        r = slots[t]
+        started = ~active[t, z]
+        rs, zs = r[started], z[started]
+        self.count[rs, zs] = 0
+        self.mean[rs, zs] = 0
+        self.m2[rs, zs] = 0
+        self.enter_time[rs, zs] = now
+        self.last_flush[rs, zs] = now
+
+        # Welford's online mean / variance
+        position = np.stack([cx[t], cy[t]], axis=1)
+        self.count[r, z] += 1
+        delta = position - self.mean[r, z]
+        self.mean[r, z] += delta / self.count[r, z][:, None]
+        self.m2[r, z] += delta * (position - self.mean[r, z])
+        self.last_seen[r, z] = now
+
+        self.active[slots] = inside
+        return closed
+
+    def close(self, slot):
+        """Ends the open visits of an evicted track."""
+        zones = np.flatnonzero(self.active[slot])
+        visits = self._visits(np.full(len(zones), slot), zones)
+        self.active[slot] = False
+        return visits
+
+    def checkpoint(self, now, interval):
+        """Open visits not reported for `interval` seconds (closed=False), for periodic flushes."""
+        rows, cols = np.nonzero(self.active & (now - self.last_flush >= interval))
+        self.last_flush[rows, cols] = now
+        return self._visits(rows, cols, closed=False)
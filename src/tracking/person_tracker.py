@@ -1,12 +1,136 @@
 # src/tracking/person_tracker.py
 
+import cv2
+import numpy as np
 import supervision as sv
+# supervision loads ByteTrack lazily on first access; load it (and the numpy it
+# binds) with this module rather than with the first tracker created
+from supervision import ByteTrack
 
 class PersonTracker:
-    def __init__(self):
-        self.tracker = sv.ByteTrack()
+    """
+    ByteTrack wrapper. Between detector keyframes, propagate() moves the last
+    tracked boxes forward so zone checks keep running without YOLO:
+      - 'velocity': constant velocity estimated from the last two keyframes
+      - 'flow':     median sparse optical flow (Lucas-Kanade) of points inside each box,
+                    falling back to velocity for boxes without trackable points
+    """
 
-    def update(self, detections):
+    def __init__(self, propagation="velocity", flow_width=320):
+        self.tracker = ByteTrack()
+        self.propagation = propagation
+        self.flow_width = flow_width
+
+        self.tracks = sv.Detections.empty()  # Last keyframe or propagated tracks
+        self.velocities = {}                  # {tracker_id: (vx, vy)} in px/s
+        self._keyframe_centers = {}           # {tracker_id: (cx, cy, timestamp)}
+        self._timestamp = None
+        self._prev_gray = None
+        self._flow_scale = None
+
+    def update(self, detections, frame=None, timestamp=None, scale=(1.0, 1.0)):
         # Recibe detecciones en formato de supervision (ya las adaptaremos desde YOLO)
         tracked_detections = self.tracker.update_with_detections(detections)
+
+        if timestamp is not None:
+            self._update_velocities(tracked_detections, timestamp)
+            self._timestamp = timestamp
+        self.tracks = tracked_detections
+        if self.propagation == "flow" and frame is not None:
+            self._prev_gray = self._flow_gray(frame, scale)
         return tracked_detections
+
+    def _update_velocities(self, tracked_detections, timestamp):
+        centers = {}
+        for xyxy, tracker_id in zip(tracked_detections.xyxy, tracked_detections.tracker_id):
+            cx, cy = (xyxy[0] + xyxy[2]) / 2, (xyxy[1] + xyxy[3]) / 2
+            previous = self._keyframe_centers.get(tracker_id)
+            if previous is not None and timestamp > previous[2]:
+                dt = timestamp - previous[2]
+                self.velocities[tracker_id] = ((cx - previous[0]) / dt, (cy - previous[1]) / dt)
+            else:
+                self.velocities[tracker_id] = (0.0, 0.0)
+            centers[tracker_id] = (cx, cy, timestamp)
+        self._keyframe_centers = centers
+        self.velocities = {tid: v for tid, v in self.velocities.items() if tid in centers}
+
+    def _flow_gray(self, frame, scale):
+        """Downscaled gray frame; _flow_scale maps tracker (zone) coordinates to it."""
+        h, w = frame.shape[:2]
+        f = min(1.0, self.flow_width / w)
+        small = cv2.resize(frame, (int(w * f), int(h * f)), interpolation=cv2.INTER_AREA) if f < 1.0 else frame
+        self._flow_scale = (f / scale[0], f / scale[1])
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def _flow_shifts(self, gray):
+        """Median optical-flow shift per track (tracker coordinates), None where unknown."""
+        fx, fy = self._flow_scale
+        points, owners = [], []
+        for i, (x1, y1, x2, y2) in enumerate(self.tracks.xyxy):
+            bx1, by1 = max(0, int(x1 * fx)), max(0, int(y1 * fy))
+            bx2, by2 = min(gray.shape[1], int(x2 * fx)), min(gray.shape[0], int(y2 * fy))
+            if bx2 - bx1 < 4 or by2 - by1 < 4:
+                continue
+            corners = cv2.goodFeaturesToTrack(self._prev_gray[by1:by2, bx1:bx2], maxCorners=20,
+                                              qualityLevel=0.01, minDistance=3)
+            if corners is None:
+                continue
+            corners = corners.reshape(-1, 2) + (bx1, by1)
+            points.append(corners)
+            owners.extend([i] * len(corners))
+
+        shifts = [None] * len(self.tracks)
+        if not points:
+            return shifts
+
+        old = np.concatenate(points).astype(np.float32).reshape(-1, 1, 2)
+        new, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, old, None)
+        moved = (new - old).reshape(-1, 2)
+        owners = np.array(owners)
+        ok = status.reshape(-1) == 1
+        for i in range(len(self.tracks)):
+            mask = ok & (owners == i)
+            if mask.any():
+                dx, dy = np.median(moved[mask], axis=0)
+                shifts[i] = (dx / fx, dy / fy)
+        return shifts
+
+    def propagate(self, frame=None, timestamp=None, scale=(1.0, 1.0)):
+        """
+        Moves the current tracks to `timestamp` without new detections.
+        Returns an sv.Detections with the same tracker ids.
+        """
+        if len(self.tracks) == 0 or timestamp is None or self._timestamp is None:
+            return self.tracks
+
+        dt = timestamp - self._timestamp
+        shifts = [None] * len(self.tracks)
+        if self.propagation == "flow" and frame is not None and self._prev_gray is not None:
+            gray = self._flow_gray(frame, scale)
+            if gray.shape == self._prev_gray.shape:
+                shifts = self._flow_shifts(gray)
+            self._prev_gray = gray
+
+        xyxy = self.tracks.xyxy.astype(np.float32).copy()
+        for i, tracker_id in enumerate(self.tracks.tracker_id):
+            if shifts[i] is not None:
+                dx, dy = shifts[i]
+            else:
+                vx, vy = self.velocities.get(tracker_id, (0.0, 0.0))
+                dx, dy = vx * dt, vy * dt
+            xyxy[i] += (dx, dy, dx, dy)
+        if frame is not None:
+            # Keep boxes of people walking out inside the frame (tracker coordinates)
+            h, w = frame.shape[:2]
+            xyxy[:, [0, 2]] = np.clip(xyxy[:, [0, 2]], 0, w * scale[0])
+            xyxy[:, [1, 3]] = np.clip(xyxy[:, [1, 3]], 0, h * scale[1])
+
+        propagated = sv.Detections(
+            xyxy=xyxy,
+            confidence=self.tracks.confidence,
+            class_id=self.tracks.class_id,
+            tracker_id=self.tracks.tracker_id
+        )
+        self.tracks = propagated
+        self._timestamp = timestamp
+        return propagated
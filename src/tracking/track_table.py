@@ -0,0 +1,228 @@
+# src/tracking/track_table.py
+
+import numpy as np
+
+TRACK_DTYPE = np.dtype([
+    ('track_id', np.int64),     # Global track id
+    ('first_seen', np.float64),
+    ('last_seen', np.float64),
+    ('last_sample', np.float64), # Last position sample sent (ZoneEventEmitter 'transitions' mode)
+    ('frames', np.int32),       # Updates since the track appeared
+    ('x', np.float32),          # Last centroid (zone coordinates)
+    ('y', np.float32),
+    ('sx', np.float32),         # Smoothed centroid, only for zone checks (smooth())
+    ('sy', np.float32),
+    ('name', np.int16),         # Confirmed identity, index into TrackTable.names (-1 = Unknown)
+    ('vote_name', np.int16),    # Identity being voted for (-1 = none)
+    ('vote_count', np.int32),   # Consecutive votes for vote_name, capped at min_matches
+    ('zones', np.uint64),       # Bit z set = inside zone z
+    ('face_retry', np.bool_),   # Last face check gave no answer (quality gate): check again next frame
+])
+
+class TrackTable:
+    """
+    Per-camera state of live tracks as a NumPy structured array indexed by slot,
+    so all tracks of a frame are updated in one vectorized pass.
+
+    Identities are interned as small ints (self.names) and zone membership is a
+    bitmask over `zone_names` (up to 64 zones). Tracks not seen for `ttl` seconds
+    are evicted and their slot is reused.
+
+    Zone transitions can be debounced (debounce()): a zone change only counts once
+    the raw membership has differed for `min_frames` frames and `min_dwell` seconds.
+    """
+
+    def __init__(self, zone_names, ttl=30.0, capacity=64):
+        self._set_zone_names(zone_names)
+        self.ttl = ttl
+        self.names = []
+        self._name_ids = {}
+
+        self.rows = np.zeros(capacity, dtype=TRACK_DTYPE)
+        self.used = np.zeros(capacity, dtype=bool)
+        self._slots = {} # {track_id: slot}
+        self._reset_pending()
+
+    def _reset_pending(self):
+        # Per slot and zone: frames / since when the raw membership differs from the confirmed one
+        self._pending_count = np.zeros((len(self.rows), len(self.zone_names)), dtype=np.int32)
+        self._pending_since = np.zeros((len(self.rows), len(self.zone_names)), dtype=np.float64)
+
+    def _set_zone_names(self, zone_names):
+        zone_names = list(zone_names)
+        if len(zone_names) > 64:
+            raise ValueError("TrackTable supports up to 64 zones per camera")
+        self.zone_names = zone_names
+        self._bits = np.left_shift(np.uint64(1), np.arange(len(zone_names), dtype=np.uint64))
+
+    def set_zones(self, zone_names):
+        """
+        Switches to a new zone list, keeping membership of zones that still exist (by name).
+        Returns the (slot, zone name) pairs of live tracks that were inside a removed zone.
+        """
+        zone_names = list(zone_names)
+        old_inside = (self.rows['zones'][:, None] & self._bits) != 0
+        old_index = {name: z for z, name in enumerate(self.zone_names)}
+        dropped = [(int(slot), name) for name, z in old_index.items() if name not in zone_names
+                   for slot in np.flatnonzero(old_inside[:, z] & self.used)]
+        self._set_zone_names(zone_names)
+
+        zones = np.zeros(len(self.rows), dtype=np.uint64)
+        for bit, name in zip(self._bits, self.zone_names):
+            if name in old_index:
+                zones[old_inside[:, old_index[name]]] |= bit
+        self.rows['zones'] = zones
+        self._reset_pending()
+        return dropped
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, track_id):
+        return track_id in self._slots
+
+    def slot_of(self, track_id):
+        """Slot of a live track, or None (never seen or evicted)."""
+        return self._slots.get(track_id)
+
+    def _grow(self):
+        capacity = len(self.rows)
+        self.rows = np.concatenate([self.rows, np.zeros(capacity, dtype=TRACK_DTYPE)])
+        self.used = np.concatenate([self.used, np.zeros(capacity, dtype=bool)])
+        self._pending_count = np.concatenate([self._pending_count, np.zeros_like(self._pending_count)])
+        self._pending_since = np.concatenate([self._pending_since, np.zeros_like(self._pending_since)])
+
+    def slots(self, track_ids, now):
+        """Slots of `track_ids`, creating rows (first seen at `now`) for new tracks."""
+        slots = np.empty(len(track_ids), dtype=np.intp)
+        for i, track_id in enumerate(track_ids.tolist()):
+            slot = self._slots.get(track_id)
+            if slot is None:
+                free = np.flatnonzero(~self.used)
+                if not free.size:
+                    self._grow()
+                    free = np.flatnonzero(~self.used)
+                slot = int(free[0])
+                self.used[slot] = True
+                self.rows[slot] = (track_id, now, now, -np.inf, 0, 0, 0, 0, 0, -1, -1, 0, 0, False)
+                self._pending_count[slot] = 0
+                self._slots[track_id] = slot
+            slots[i] = slot
+        return slots
+
+    def inside(self, slots):
+        """N x Z bool matrix of the zones each track was inside at its last update."""
+        return (self.rows['zones'][slots][:, None] & self._bits) != 0
+
+    def smooth(self, slots, cx, cy, alpha):
+        """
+        Exponential moving average of the centroids (alpha = weight of the new position).
+        Kept apart from the raw positions stored by update().
+        """
+        fresh = self.rows['frames'][slots] == 0
+        sx = np.where(fresh, cx, alpha * cx + (1 - alpha) * self.rows['sx'][slots])
+        sy = np.where(fresh, cy, alpha * cy + (1 - alpha) * self.rows['sy'][slots])
+        self.rows['sx'][slots] = sx
+        self.rows['sy'][slots] = sy
+        return sx, sy
+
+    def debounce(self, slots, inside, now, min_frames=1, min_dwell=0.0):
+        """
+        Hysteresis on raw zone membership (N x Z bool): returns the membership to
+        use, where a zone only flips after differing from the current state for
+        `min_frames` consecutive frames and `min_dwell` seconds.
+        """
+        confirmed = self.inside(slots)
+        differs = inside != confirmed
+        count = self._pending_count[slots]
+        since = self._pending_since[slots]
+
+        starting = differs & (count == 0)
+        since[starting] = now
+        count = np.where(differs, count + 1, 0)
+        flip = differs & (count >= min_frames) & (now - since >= min_dwell)
+        count[flip] = 0
+
+        self._pending_count[slots] = count
+        self._pending_since[slots] = since
+        return confirmed ^ flip
+
+    def update(self, slots, cx, cy, inside, now):
+        """
+        Stores positions and zone membership (N x Z bool) of the tracks in `slots`.
+        Returns the N x Z bool matrices of zones each track just entered and just left.
+        """
+        was_inside = self.inside(slots)
+        entered = inside & ~was_inside
+        exited = was_inside & ~inside
+        self.rows['zones'][slots] = np.bitwise_or.reduce(np.where(inside, self._bits, np.uint64(0)), axis=1)
+        self.rows['x'][slots] = cx
+        self.rows['y'][slots] = cy
+        self.rows['last_seen'][slots] = now
+        self.rows['frames'][slots] += 1
+        return entered, exited
+
+    def unknown(self, slots):
+        return self.rows['name'][slots] < 0
+
+    def name(self, slot):
+        name_id = self.rows['name'][slot]
+        return self.names[name_id] if name_id >= 0 else "Unknown"
+
+    def names_of(self, slots):
+        return [self.name(slot) for slot in slots]
+
+    def face_retry(self, slots):
+        return self.rows['face_retry'][slots]
+
+    def set_face_retry(self, slot, retry):
+        self.rows['face_retry'][slot] = retry
+
+    def _name_id(self, name):
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self._name_ids[name] = name_id
+        return name_id
+
+    def vote(self, slot, name, min_matches):
+        """
+        Counts a face match for the track. Once `min_matches` consecutive votes agree
+        the identity is confirmed; returns the previous name if it changed, else None.
+        """
+        row = self.rows[slot:slot + 1]
+        name_id = self._name_id(name)
+        if row['vote_name'][0] == name_id:
+            # Nothing changes past min_matches: cap instead of counting forever
+            row['vote_count'] = min(int(row['vote_count'][0]) + 1, min_matches)
+        else:
+            row['vote_name'] = name_id
+            row['vote_count'] = 1
+
+        if row['vote_count'][0] >= min_matches and row['name'][0] != name_id:
+            previous = self.name(slot)
+            row['name'] = name_id
+            return previous
+        return None
+
+    def evict(self, now):
+        """Frees tracks not seen since `now - ttl`; returns them as a list of dicts."""
+        expired = np.flatnonzero(self.used & (self.rows['last_seen'] <= now - self.ttl))
+        closed = []
+        for slot in expired:
+            row = self.rows[slot]
+            closed.append({
+                'slot': int(slot),
+                'track_id': int(row['track_id']),
+                'name': self.name(slot),
+                'first_seen': float(row['first_seen']),
+                'last_seen': float(row['last_seen']),
+                'last_sample': float(row['last_sample']),
+                'x': float(row['x']),
+                'y': float(row['y']),
+                'zones': [z for z, bit in zip(self.zone_names, self._bits) if row['zones'] & bit],
+            })
+            del self._slots[int(row['track_id'])]
+            self.used[slot] = False
+        return closed
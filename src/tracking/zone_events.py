@@ -0,0 +1,78 @@
+# src/tracking/zone_events.py
+
+import numpy as np
+
+class ZoneEventEmitter:
+    """
+    Turns the zone membership of a camera's tracks into tracking records
+    {track_id, x, y, zone, inside_zone, timestamp} for the DB writer.
+
+    mode: 'frames'      -> one record per track, zone and frame
+          'transitions' -> only the entry, position samples every 1/sample_fps seconds
+                           while inside, the last frame inside before an exit and the exit
+                           itself (inside_zone=0). Visits rebuilt from these rows
+                           (EfficiencyCalculator) start and end at the same frames as in
+                           'frames' mode.
+    """
+
+    def __init__(self, mode="frames", sample_fps=1.0):
+        self.mode = mode
+        self.sample_interval = 1.0 / sample_fps if sample_fps > 0 else float('inf')
+
+    @staticmethod
+    def _record(track_id, x, y, zone, inside_zone, timestamp):
+        return {'track_id': int(track_id), 'x': float(x), 'y': float(y), 'zone': zone,
+                'inside_zone': inside_zone, 'timestamp': float(timestamp)}
+
+    def emit(self, table, slots, track_ids, cx, cy, inside, now):
+        """
+        Stores this frame's membership (N x Z bool) in the TrackTable.
+        Returns (records, entered) where entered is the N x Z matrix of new entries.
+        """
+        zones = table.zone_names
+        if self.mode != 'transitions':
+            entered, _ = table.update(slots, cx, cy, inside, now)
+            records = [self._record(track_id, x, y, zone, int(flag), now)
+                       for track_id, x, y, flags in zip(track_ids.tolist(), cx.tolist(), cy.tolist(), inside.tolist())
+                       for zone, flag in zip(zones, flags)]
+            return records, entered
+
+        prev_x, prev_y, prev_seen = table.rows['x'][slots], table.rows['y'][slots], table.rows['last_seen'][slots]
+        entered, exited = table.update(slots, cx, cy, inside, now)
+        last_sample = table.rows['last_sample'][slots]
+
+        records = []
+        for t, z in zip(*np.nonzero(exited)):
+            # Close the visit at its last frame inside, then record the exit
+            if last_sample[t] < prev_seen[t]:
+                records.append(self._record(track_ids[t], prev_x[t], prev_y[t], zones[z], 1, prev_seen[t]))
+            records.append(self._record(track_ids[t], cx[t], cy[t], zones[z], 0, now))
+
+        # Entries and periodic position samples of every zone the track is in
+        due = inside.any(axis=1) & (entered.any(axis=1) | (now - last_sample >= self.sample_interval))
+        for t in np.flatnonzero(due):
+            for z in np.flatnonzero(inside[t]):
+                records.append(self._record(track_ids[t], cx[t], cy[t], zones[z], 1, now))
+        table.rows['last_sample'][slots[due]] = now
+        return records, entered
+
+    def closed(self, track):
+        """Records for a track evicted from the TrackTable (see TrackTable.evict)."""
+        if self.mode != 'transitions' or track['last_sample'] >= track['last_seen']:
+            return []
+        # Last frame inside of the zones it never left
+        return [self._record(track['track_id'], track['x'], track['y'], zone, 1, track['last_seen'])
+                for zone in track['zones']]
+
+    def removed(self, table, dropped):
+        """
+        Exit records for tracks inside zones deleted by a zone reload
+        (`dropped` as returned by TrackTable.set_zones), at their last frame seen.
+        """
+        records = []
+        for slot, zone in dropped:
+            row = table.rows[slot]
+            if self.mode == 'transitions' and row['last_sample'] < row['last_seen']:
+                records.append(self._record(row['track_id'], row['x'], row['y'], zone, 1, row['last_seen']))
+            records.append(self._record(row['track_id'], row['x'], row['y'], zone, 0, row['last_seen']))
+        return records
@@ -1,20 +1,136 @@
 # src/zones/zone_checker.py
 
+import os
 import json
+import cv2
+import numpy as np
 from shapely.geometry import Point, Polygon
 from src.paths import get_user_data_path
 
+try:
+    from shapely import contains_xy, prepare
+except ImportError:  # shapely < 2.0
+    contains_xy = None
+
+# Zone membership is a 64-bit mask per track (TrackTable) and per raster cell
+MAX_ZONES = 64
+
+def points_in_polygon(xs, ys, polygon):
+    """Ray casting (same rule as PeopleDetector.point_in_polygon) for N points at once."""
+    poly = np.asarray(polygon, dtype=np.float64)
+    xi, yi = poly[:, 0], poly[:, 1]
+    xj, yj = np.roll(xi, -1), np.roll(yi, -1)
+    xs, ys = xs[:, None], ys[:, None]
+    crosses = ((yi > ys) != (yj > ys)) & (xs < (xj - xi) * (ys - yi) / ((yj - yi) + 1e-9) + xi)
+    return np.count_nonzero(crosses, axis=1) % 2 == 1
+
+def camera_zones(data, camera=None):
+    """
+    Zones of one camera from a zones file. Top-level entries are either
+    {zone_name: points} (shared by every camera, the original flat format) or
+    {camera_name: {zone_name: points}} (only for that camera).
+    """
+    zones = {name: points for name, points in data.items() if isinstance(points, list)}
+    if camera is not None and isinstance(data.get(camera), dict):
+        zones.update(data[camera])
+    return zones
+
 class ZoneChecker:
-    def __init__(self, zones_path=None):
+    """
+    Zone membership of points in frame (zone) coordinates.
+
+    mode: 'shapely' -> polygon tests (prepared geometries / contains_xy)
+          'raster'  -> zones rasterized once into a bitmask image (bit z = zone z,
+                       so overlapping zones work); membership is an array index.
+                       raster_cell > 1 trades edge accuracy for memory.
+    camera: only load the shared zones plus the ones drawn for this camera.
+    """
+
+    def __init__(self, zones_path=None, mode="shapely", raster_cell=1, camera=None):
         if zones_path is None:
             zones_path = get_user_data_path("data/zonas/zonas.json")
+        self.zones_path = zones_path
+        self.camera = camera
+        self.mode = mode
+        self.raster_cell = raster_cell
 
+        self._mtime = os.stat(zones_path).st_mtime
         with open(zones_path, 'r') as f:
-            self.zones = json.load(f)
+            self._load(camera_zones(json.load(f), camera))
+
+    def _load(self, zones):
+        """Switches to `zones`; raises ValueError (keeping the current zones) if they are invalid."""
+        if len(zones) > MAX_ZONES:
+            raise ValueError(f"{len(zones)} zones, at most {MAX_ZONES} per camera are supported")
+        polygons = {}
+        for name, points in zones.items():
+            try:
+                polygons[name] = Polygon(points)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"zone '{name}': {e}")
+            if contains_xy is not None:
+                prepare(polygons[name])
+        raster, bits = self._build_raster(zones, polygons) if self.mode == "raster" else (None, None)
+
+        self.zones = zones
+        self.polygons = polygons
+        self.names = list(polygons) # Column order of check_batch()
+        self.raster, self._bits = raster, bits
+
+    def reload_if_changed(self):
+        """
+        Reloads the zones if the file was modified since they were loaded.
+        Returns True if this camera's zones changed. An unreadable file (e.g. half
+        written) keeps the current zones and is retried on the next call; invalid
+        zones (e.g. too many) keep them until the file changes again.
+        """
+        try:
+            mtime = os.stat(self.zones_path).st_mtime
+            if mtime == self._mtime:
+                return False
+            with open(self.zones_path, 'r') as f:
+                zones = camera_zones(json.load(f), self.camera)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not reload zones from {self.zones_path}: {e}")
+            return False
 
-        self.polygons = {}
-        for name, points in self.zones.items():
-            self.polygons[name] = Polygon(points)
+        self._mtime = mtime
+        if zones == self.zones:
+            return False
+        try:
+            self._load(zones)
+        except ValueError as e:
+            print(f"⚠️ Invalid zones in {self.zones_path}, keeping the current ones: {e}")
+            return False
+        return True
+
+    def _build_raster(self, zones, polygons):
+        """Returns (raster, bits) for `zones`: the bitmask image and the bit of each zone."""
+        dtype = next(t for t in (np.uint8, np.uint16, np.uint32, np.uint64) if np.iinfo(t).bits >= len(zones))
+        bits = np.left_shift(np.uint64(1), np.arange(len(zones), dtype=np.uint64)).astype(dtype)
+
+        # Zones are drawn on the camera's native frame, so their extent bounds the raster
+        maxx = max((p.bounds[2] for p in polygons.values()), default=0)
+        maxy = max((p.bounds[3] for p in polygons.values()), default=0)
+        # (plus a margin); lookups outside it are never inside a zone
+        cell = self.raster_cell
+        raster = np.zeros((int(np.ceil(maxy / cell)) + 2, int(np.ceil(maxx / cell)) + 2), dtype=dtype)
+        mask = np.zeros(raster.shape, dtype=np.uint8)
+        for bit, points in zip(bits, zones.values()):
+            mask[:] = 0
+            # Vertex -> the cell that contains it, the same floor rule as masks_batch()
+            cv2.fillPoly(mask, [np.floor(np.asarray(points, dtype=np.float64) / cell).astype(np.int32)], 1)
+            raster[mask.astype(bool)] |= bit
+        return raster, bits
+
+    def bounds(self):
+        """Bounding box (minx, miny, maxx, maxy) of every zone."""
+        return {name: polygon.bounds for name, polygon in self.polygons.items()}
+
+    def boundary_distance(self, x, y):
+        """Distance from (x, y) to the closest zone edge (inf if there are no zones)."""
+        point = Point(x, y)
+        return min((polygon.exterior.distance(point) for polygon in self.polygons.values()), default=float('inf'))
 
     def check(self, x, y):
         point = Point(x, y)
@@ -22,3 +138,29 @@ class ZoneChecker:
         for name, polygon in self.polygons.items():
             results[name] = polygon.contains(point)
         return results
+
+    def masks_batch(self, xs, ys):
+        """Raster mode: zone bitmask of N points (bit z set = inside zone z)."""
+        h, w = self.raster.shape
+        xi = np.floor_divide(np.asarray(xs, dtype=np.float64).reshape(-1), self.raster_cell)
+        yi = np.floor_divide(np.asarray(ys, dtype=np.float64).reshape(-1), self.raster_cell)
+        in_bounds = (xi >= 0) & (xi < w) & (yi >= 0) & (yi < h)
+        masks = self.raster[np.where(in_bounds, yi, 0).astype(np.intp), np.where(in_bounds, xi, 0).astype(np.intp)]
+        return np.where(in_bounds, masks, 0).astype(self.raster.dtype)
+
+    def check_batch(self, xs, ys):
+        """Zone membership of N points as an N x Z bool matrix (columns in self.names order)."""
+        if self.raster is not None:
+            return (self.masks_batch(xs, ys)[:, None] & self._bits) != 0
+
+        xs = np.asarray(xs, dtype=np.float64).reshape(-1)
+        ys = np.asarray(ys, dtype=np.float64).reshape(-1)
+        inside = np.zeros((len(xs), len(self.names)), dtype=bool)
+        if not len(xs):
+            return inside
+        for z, name in enumerate(self.names):
+            if contains_xy is not None:
+                inside[:, z] = contains_xy(self.polygons[name], xs, ys)
+            else:
+                inside[:, z] = points_in_polygon(xs, ys, self.zones[name])
+        return inside
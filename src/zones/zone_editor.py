@@ -1,13 +1,16 @@
 import cv2
 import os
+import sys
 import json
 
 class ZoneEditor:
-    def __init__(self, output_path="data/zonas/zonas.json"):
+    def __init__(self, output_path="data/zonas/zonas.json", camera=None):
         # Determina la raíz del proyecto a partir de la ubicación del archivo actual
         script_dir = os.path.dirname(os.path.abspath(__file__))
         self.project_root = os.path.abspath(os.path.join(script_dir, "../.."))
         self.output_path = os.path.join(self.project_root, output_path)
+        # Con cámara, las zonas se guardan como {camara: {zona: puntos}} y solo las evalúa esa cámara
+        self.camera = camera
         self.points = []
 
     def click_event(self, event, x, y, flags, param):
@@ -26,12 +29,21 @@ class ZoneEditor:
                 except json.JSONDecodeError:
                     data = {}
 
-        data[zone_name] = self.points
+        if self.camera:
+            if not isinstance(data.get(self.camera), dict):
+                data[self.camera] = {}
+            data[self.camera][zone_name] = self.points
+        else:
+            data[zone_name] = self.points
 
-        with open(self.output_path, 'w') as f:
+        # Escritura atómica: los procesos de cámara recargan el archivo mientras corren
+        tmp_path = self.output_path + ".tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(data, f, indent=4)
+        os.replace(tmp_path, self.output_path)
 
-        print(f"✅ Zona '{zone_name}' guardada en {self.output_path}")
+        destino = f" (cámara {self.camera})" if self.camera else ""
+        print(f"✅ Zona '{zone_name}'{destino} guardada en {self.output_path}")
 
     def run(self, image_path, zone_name):
         absolute_image_path = os.path.abspath(os.path.join(self.project_root, image_path))
@@ -64,6 +76,9 @@ class ZoneEditor:
         self.save_zone(zone_name)
 
 # 💖 Bloque de ejecución directa
+# Uso: python src/zones/zone_editor.py [zona] [camara]
 if __name__ == "__main__":
-    editor = ZoneEditor()
-    editor.run("data/zonas/frame_referencia.jpg", "Zona")
+    zona = sys.argv[1] if len(sys.argv) > 1 else "Zona"
+    camara = sys.argv[2] if len(sys.argv) > 2 else None
+    editor = ZoneEditor(camera=camara)
+    editor.run("data/zonas/frame_referencia.jpg", zona)
@@ -0,0 +1,66 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.acquisition.frame_ring_buffer import FrameRingBuffer
+
+class TestFrameRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = FrameRingBuffer((4, 6, 3), slots=3)
+
+    def tearDown(self):
+        self.buffer.close()
+
+    def test_empty_buffer(self):
+        self.assertIsNone(self.buffer.latest_slot())
+        self.assertEqual(self.buffer.head_seq(), -1)
+
+    def test_write_and_wrap(self):
+        for i in range(5):
+            frame = np.full((4, 6, 3), i, dtype=np.uint8)
+            seq = self.buffer.write(frame, timestamp=100.0 + i)
+            self.assertEqual(seq, i)
+
+        slot = self.buffer.latest_slot()
+        self.assertEqual(slot, 4 % 3)
+        self.assertTrue((self.buffer.frame(slot) == 4).all())
+        self.assertEqual(self.buffer.timestamp(slot), 104.0)
+        # Slot 0 held frame 3, frame 0 was overwritten
+        self.assertTrue(self.buffer.is_current(0, 3))
+        self.assertFalse(self.buffer.is_current(0, 0))
+
+    def test_reserve_commit_is_zero_copy(self):
+        slot, view = self.buffer.reserve()
+        self.assertEqual(self.buffer.seq(slot), -1)
+        view[:] = 7
+        self.buffer.commit(slot)
+        self.assertTrue(np.shares_memory(view, self.buffer.frame(slot)))
+        self.assertTrue((self.buffer.frame(self.buffer.latest_slot()) == 7).all())
+
+    def test_reserve_skips_held_slots(self):
+        self.buffer.write(np.full((4, 6, 3), 1, dtype=np.uint8))
+        held = self.buffer.latest_slot()
+        for i in range(2, 6):
+            slot, view = self.buffer.reserve(held=(held,))
+            self.assertNotIn(slot, (held, self.buffer.latest_slot()))
+            view[:] = i
+            self.buffer.commit(slot)
+        self.assertTrue((self.buffer.frame(held) == 1).all())
+        self.assertTrue((self.buffer.frame(self.buffer.latest_slot()) == 5).all())
+
+    def test_attach_by_name(self):
+        self.buffer.write(np.full((4, 6, 3), 9, dtype=np.uint8))
+        desc = self.buffer.descriptor()
+        other = FrameRingBuffer.attach(desc['name'], desc['frame_shape'], desc['slots'])
+        try:
+            slot = other.latest_slot()
+            self.assertTrue((other.frame(slot) == 9).all())
+        finally:
+            other.close()
+
+if __name__ == '__main__':
+    unittest.main()
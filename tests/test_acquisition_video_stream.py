@@ -0,0 +1,164 @@
+import sys
+import os
+import threading
+import unittest
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.acquisition.video_stream import VideoStreamService
+
+class FakeCapture:
+    """Counts grab/retrieve calls; retrieve() decodes into the given array like OpenCV does."""
+    def __init__(self):
+        self.grabs = 0
+        self.retrieves = 0
+
+    def grab(self):
+        self.grabs += 1
+        return True
+
+    def retrieve(self, image=None):
+        self.retrieves += 1
+        if image is None:
+            image = np.zeros((4, 4, 3), dtype=np.uint8)
+        image[:] = self.grabs % 256
+        return True, image
+
+class TestVideoStreamService(unittest.TestCase):
+    def setUp(self):
+        self.service = VideoStreamService(0, name="Test", buffer_slots=3)
+
+    def tearDown(self):
+        self.service._release_buffer()
+
+    def test_read_new_returns_each_frame_once(self):
+        self.assertIsNone(self.service.read_new())
+
+        self.service._publish(np.full((4, 4, 3), 1, dtype=np.uint8))
+        frame, frame_id, timestamp = self.service.read_new()
+        self.assertEqual(frame_id, 0)
+        self.assertTrue((frame == 1).all())
+        self.assertIsNotNone(timestamp)
+
+        # Same frame is not returned twice, but read() still sees it
+        self.assertIsNone(self.service.read_new())
+        self.assertIsNotNone(self.service.read())
+
+        self.service._publish(np.full((4, 4, 3), 2, dtype=np.uint8))
+        self.service._publish(np.full((4, 4, 3), 3, dtype=np.uint8))
+        frame, frame_id, _ = self.service.read_new()
+        self.assertEqual(frame_id, 2)
+        self.assertTrue((frame == 3).all())
+
+    def test_read_frame_is_kept_until_the_next_read(self):
+        self.service._publish(np.full((4, 4, 3), 1, dtype=np.uint8))
+        frame, _, _ = self.service.read_new()
+        ref = self.service.last_read_ref
+
+        # Capture keeps going for longer than the ring window while the frame is in use
+        for value in range(2, 12):
+            self.service._publish(np.full((4, 4, 3), value, dtype=np.uint8))
+            self.assertTrue(self.service.is_current(ref))
+        self.assertTrue((frame == 1).all())
+        frame, _, _ = self.service.read_new()
+        self.assertTrue((frame == 11).all())
+
+        # Released by the next read: its slot is reused
+        self.service._publish(np.full((4, 4, 3), 12, dtype=np.uint8))
+        self.assertFalse(self.service.is_current(ref))
+
+        # A new ring (resolution change) invalidates every old reference
+        ref = self.service.last_read_ref
+        self.service._publish(np.zeros((8, 8, 3), dtype=np.uint8))
+        self.assertFalse(self.service.is_current(ref))
+        self.assertFalse(self.service.is_current((None, None, -1)))
+
+    def test_slow_reader_gets_every_frame_it_reads(self):
+        """Detection slower than the ring window still sees intact frames."""
+        self.service.stream = FakeCapture()
+        self.service.buffer_slots = 3
+        processed = stale = 0
+        for _ in range(10):
+            # 5 frames are captured while each one is being detected
+            for _ in range(5):
+                self.service.stream.grab()
+                self.service._retrieve()
+            frame, _, _ = self.service.read_new()
+            expected = frame[0, 0, 0]
+            for _ in range(5):
+                self.service.stream.grab()
+                self.service._retrieve()
+            if self.service.is_current(self.service.last_read_ref) and (frame == expected).all():
+                processed += 1
+            else:
+                stale += 1
+        self.assertEqual((processed, stale), (10, 0))
+
+    def test_frame_id_survives_resolution_change(self):
+        self.service._publish(np.zeros((4, 4, 3), dtype=np.uint8))
+        self.service._publish(np.zeros((8, 8, 3), dtype=np.uint8))
+        frame, frame_id, _ = self.service.read_new()
+        self.assertEqual(frame.shape, (8, 8, 3))
+        self.assertEqual(frame_id, 1)
+
+    def test_shared_condition_wakes_waiter(self):
+        condition = threading.Condition()
+        service = VideoStreamService(0, name="Shared", frame_ready=condition)
+        try:
+            timer = threading.Timer(0.05, service._publish, args=(np.zeros((2, 2, 3), dtype=np.uint8),))
+            timer.start()
+            with condition:
+                woke = condition.wait_for(service.has_new, timeout=2)
+            self.assertTrue(woke)
+            self.assertIsNotNone(service.read_new())
+        finally:
+            timer.join()
+            service._release_buffer()
+
+    def test_frame_skip_only_decodes_analyzed_frames(self):
+        service = VideoStreamService(0, name="Skip", frame_skip=3)
+        service.stream = FakeCapture()
+        try:
+            for _ in range(9):
+                service.stream.grab()
+                service.grabbed_count += 1
+                if service._should_analyze(0.0):
+                    service._retrieve()
+            self.assertEqual(service.stream.grabs, 9)
+            self.assertEqual(service.stream.retrieves, 3)
+            frame, frame_id, _ = service.read_new()
+            self.assertEqual(frame_id, 2)
+            self.assertTrue((frame == 9).all())
+            stats = service.stream_stats()
+            self.assertGreater(stats['capture_fps'], stats['analysis_fps'])
+        finally:
+            service._release_buffer()
+
+    def test_resize_width_downscales_into_ring(self):
+        service = VideoStreamService(0, name="Resize", resize_width=320)
+        try:
+            service._publish(np.zeros((720, 1280, 3), dtype=np.uint8))
+            frame, _, _ = service.read_new()
+            self.assertEqual(frame.shape, (180, 320, 3))
+            self.assertEqual(service.scale, (4.0, 4.0))
+        finally:
+            service._release_buffer()
+
+    def test_analysis_fps_limits_rate(self):
+        service = VideoStreamService(0, name="Fps", analysis_fps=5)
+        # 25 fps camera for two seconds
+        analyzed = sum(service._should_analyze(i / 25.0) for i in range(50))
+        self.assertEqual(analyzed, 10)
+
+    def test_analysis_fps_after_a_stall(self):
+        service = VideoStreamService(0, name="Fps", analysis_fps=5)
+        self.assertTrue(service._should_analyze(0.0))
+        # No frames for 3 s (reconnect), then 25 fps again: still at most one frame every 0.2 s
+        analyzed = [i for i in range(25) if service._should_analyze(3.0 + i / 25.0)]
+        self.assertEqual(analyzed[0], 0)
+        self.assertGreaterEqual(min(np.diff(analyzed)), 5)
+
+if __name__ == '__main__':
+    unittest.main()
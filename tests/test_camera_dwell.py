@@ -0,0 +1,106 @@
+import sys
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tracking.track_table import TrackTable
+from src.tracking.zone_events import ZoneEventEmitter
+from src.tracking.dwell import DwellAggregator
+from src.analysis.efficiency_calculator import EfficiencyCalculator
+
+def calculator_visits(records):
+    df = pd.DataFrame(records)
+    df['timestamp'] = [datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S.%f') for t in df['timestamp']]
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(db_path)
+        df.to_sql('tracking', conn, index=False)
+        conn.close()
+        return EfficiencyCalculator(db_path=db_path).calculate_efficiency()
+    finally:
+        os.remove(db_path)
+
+class TestDwellAggregator(unittest.TestCase):
+    def test_matches_efficiency_calculator(self):
+        rng = np.random.default_rng(5)
+        table = TrackTable(["A", "B"], ttl=3.0)
+        dwell = DwellAggregator(table)
+        emitter = ZoneEventEmitter("frames")
+        records, visits = [], []
+
+        start = 1_700_000_000.0
+        for i in range(400):
+            now = start + i * 0.1
+            ids = np.array([1, 2] if i < 300 else [2], dtype=np.int64)
+            cx, cy = rng.uniform(0, 200, len(ids)), rng.uniform(0, 200, len(ids))
+            inside = np.stack([(i // 23 + ids) % 2 == 0, (i // 41 + ids) % 3 == 0], axis=1)
+            slots = table.slots(ids, now)
+            frame_records, _ = emitter.emit(table, slots, ids, cx, cy, inside, now)
+            records += frame_records
+            visits += dwell.update(slots, cx, cy, inside, now)
+            for track in table.evict(now):
+                visits += dwell.close(track['slot'])
+        # Still open at the end
+        visits += [v for r in range(len(table.rows)) for v in dwell.close(r)]
+
+        expected = calculator_visits(records).sort_values(['track_id', 'zone', 'start_time']).reset_index(drop=True)
+        live = pd.DataFrame(visits).sort_values(['track_id', 'zone', 'start_time']).reset_index(drop=True)
+
+        self.assertEqual(len(live), len(expected))
+        self.assertTrue(live['closed'].all())
+        self.assertEqual(live['zone'].tolist(), expected['zone'].tolist())
+        np.testing.assert_allclose(live['start_time'], [t.timestamp() for t in expected['start_time']], atol=1e-3)
+        np.testing.assert_allclose(live['duration_sec'], expected['duration_sec'], atol=0.011)
+        np.testing.assert_allclose(live['activity_score'], expected['productivity_score'], atol=0.011)
+
+    def test_checkpoint_reports_open_visits(self):
+        table = TrackTable(["A"])
+        dwell = DwellAggregator(table)
+        slots = table.slots(np.array([1]), 0.0)
+        for t in range(5):
+            dwell.update(slots, np.array([float(t)]), np.array([0.0]), np.array([[True]]), float(t))
+
+        self.assertEqual(dwell.checkpoint(3.0, 5.0), [])
+        visits = dwell.checkpoint(5.0, 5.0)
+        self.assertEqual(len(visits), 1)
+        self.assertFalse(visits[0]['closed'])
+        self.assertEqual((visits[0]['start_time'], visits[0]['end_time'], visits[0]['samples']), (0.0, 4.0, 5))
+        self.assertEqual(dwell.checkpoint(6.0, 5.0), [])
+
+        # Leaving closes it, with the same start
+        visits = dwell.update(slots, np.array([9.0]), np.array([0.0]), np.array([[False]]), 6.0)
+        self.assertEqual(len(visits), 1)
+        self.assertTrue(visits[0]['closed'])
+        self.assertEqual(visits[0]['start_time'], 0.0)
+        self.assertEqual(visits[0]['activity_score'], round(float(np.std(np.arange(5.0), ddof=1)), 2))
+
+    def test_zone_change_keeps_visits_and_growth(self):
+        table = TrackTable(["A"], capacity=1)
+        dwell = DwellAggregator(table)
+        slots = table.slots(np.array([1]), 0.0)
+        dwell.update(slots, np.array([0.0]), np.array([0.0]), np.array([[True]]), 0.0)
+
+        table.set_zones(["B", "A"])
+        slots = table.slots(np.array([1, 2]), 1.0) # Table grows to 2 slots
+        visits = dwell.update(slots, np.zeros(2), np.zeros(2), np.ones((2, 2), dtype=bool), 1.0)
+        self.assertEqual(visits, [])
+        self.assertEqual(dwell.active.shape, (2, 2))
+        self.assertTrue(dwell.active.all())
+
+        # Only the visits of a removed zone close; track 1 is still in A since 0.0
+        table.set_zones(["A"])
+        visits = dwell.update(slots, np.zeros(2), np.zeros(2), np.ones((2, 1), dtype=bool), 2.0)
+        self.assertEqual(sorted((v['track_id'], v['zone']) for v in visits), [(1, "B"), (2, "B")])
+        visits = dwell.close(slots[0])
+        self.assertEqual([(v['zone'], v['start_time'], v['samples']) for v in visits], [("A", 0.0, 3)])
+
+if __name__ == '__main__':
+    unittest.main()
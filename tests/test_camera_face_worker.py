@@ -0,0 +1,124 @@
+import sys
+import os
+import queue
+import unittest
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.processing.face_worker import FaceWorkerProcess, FaceRecognitionClient
+
+class FakeRecognizer:
+    """Names each crop after its pixel value."""
+    def __init__(self):
+        self.batches = []
+
+    def recognize_batch(self, frames, bboxes):
+        self.batches.append(len(frames))
+        return [f"emp_{frame[0, 0, 0]}" for frame in frames]
+
+def frame(value):
+    return np.full((40, 40, 3), value, dtype=np.uint8)
+
+class TestFaceWorker(unittest.TestCase):
+    def setUp(self):
+        self.request_queue = queue.Queue(maxsize=4)
+        self.response_queues = {0: queue.Queue(), 1: queue.Queue()}
+        self.worker = FaceWorkerProcess(self.request_queue, self.response_queues, max_age=1.0)
+        self.clients = [FaceRecognitionClient(g, self.request_queue, self.response_queues[g]) for g in (0, 1)]
+
+    def process(self, recognizer):
+        requests = []
+        while not self.request_queue.empty():
+            requests.append(self.request_queue.get_nowait())
+        return self.worker._process(recognizer, requests)
+
+    def test_batches_across_groups(self):
+        self.clients[0].submit([frame(1), frame(2)], [(0, 0, 10, 10), None], [(0, 7), (0, 8)])
+        self.clients[1].submit([frame(3)], [(5, 5, 20, 20)], [(4, 9)])
+
+        recognizer = FakeRecognizer()
+        self.assertEqual(self.process(recognizer), 3)
+        self.assertEqual(recognizer.batches, [3])
+        self.assertEqual(self.clients[0].results(), [((0, 7), "emp_1"), ((0, 8), "emp_2")])
+        self.assertEqual(self.clients[1].results(), [((4, 9), "emp_3")])
+        self.assertEqual(self.clients[0].pending, {})
+
+    def test_stale_requests_are_dropped(self):
+        self.clients[0].submit([frame(1)], [None], [(0, 7)])
+        request = self.request_queue.get_nowait()
+        request['submitted'] -= 5.0
+        self.request_queue.put(request)
+
+        recognizer = FakeRecognizer()
+        self.assertEqual(self.process(recognizer), 0)
+        self.assertEqual(recognizer.batches, [])
+        self.assertEqual(self.worker.dropped, 1)
+        # No name, but the track can be submitted again
+        self.assertEqual(self.clients[0].results(), [((0, 7), None)])
+        self.assertEqual(self.clients[0].submit([frame(1)], [None], [(0, 7)]), 1)
+
+    def test_batches_are_bounded(self):
+        self.worker.max_batch = 2
+        self.request_queue.maxsize = 0
+        for client in self.clients:
+            client.max_batch = 2
+        self.clients[0].submit([frame(1)] * 3, [None] * 3, [(0, 1), (0, 2), (0, 3)])
+        self.clients[1].submit([frame(2)], [None], [(1, 1)])
+        self.assertEqual(self.request_queue.qsize(), 3)
+
+        recognizer = FakeRecognizer()
+        self.assertEqual(self.process(recognizer), 4)
+        self.assertEqual(recognizer.batches, [2, 2])
+        self.assertEqual(len(self.clients[0].results()), 3)
+
+class TestFaceRecognitionClient(unittest.TestCase):
+    def test_one_request_per_track_and_bounds(self):
+        request_queue, response_queue = queue.Queue(maxsize=1), queue.Queue()
+        client = FaceRecognitionClient(0, request_queue, response_queue, max_pending=2)
+
+        self.assertEqual(client.submit([frame(1)] * 3, [None] * 3, [(0, 1), (0, 1), (0, 2)]), 2)
+        # Track 1 is in flight and max_pending is reached
+        self.assertEqual(client.submit([frame(1)] * 2, [None] * 2, [(0, 1), (0, 3)]), 0)
+        self.assertEqual(client.dropped, 1)
+
+        # Full request queue
+        client.max_pending = 10
+        self.assertEqual(client.submit([frame(1)], [None], [(0, 4)]), 0)
+        self.assertEqual(client.dropped, 2)
+        self.assertNotIn((0, 4), client.pending)
+
+    def test_crops_are_copied(self):
+        request_queue = queue.Queue()
+        client = FaceRecognitionClient(0, request_queue, queue.Queue())
+        image = frame(1)
+        client.submit([image], [(10, 10, 30, 20)], [(0, 1)])
+        image[:] = 0
+        crop = request_queue.get_nowait()['items'][0][1]
+        self.assertEqual(crop.shape, (10, 20, 3))
+        self.assertTrue((crop == 1).all())
+
+    def test_head_region_is_sent(self):
+        request_queue = queue.Queue()
+        client = FaceRecognitionClient(0, request_queue, queue.Queue(), head_fraction=0.25)
+        client.submit([frame(1)], [(0, 0, 20, 40)], [(0, 1)])
+        self.assertEqual(request_queue.get_nowait()['items'][0][1].shape, (10, 20, 3))
+
+    def test_full_queue_drops_the_remaining_chunks(self):
+        request_queue = queue.Queue(maxsize=1)
+        client = FaceRecognitionClient(0, request_queue, queue.Queue(), max_batch=2)
+        self.assertEqual(client.submit([frame(1)] * 3, [None] * 3, [(0, 1), (0, 2), (0, 3)]), 2)
+        self.assertEqual(client.dropped, 1)
+        self.assertEqual(sorted(client.pending), [(0, 1), (0, 2)])
+
+    def test_cancelled_tracks_are_ignored(self):
+        response_queue = queue.Queue()
+        client = FaceRecognitionClient(0, queue.Queue(), response_queue)
+        client.submit([frame(1)] * 2, [None] * 2, [(0, 1), (0, 2)])
+        client.cancel((0, 1))
+        response_queue.put({'results': [((0, 1), "emp_1"), ((0, 2), "emp_2")]})
+        self.assertEqual(client.results(), [((0, 2), "emp_2")])
+
+if __name__ == '__main__':
+    unittest.main()
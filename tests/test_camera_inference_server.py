@@ -0,0 +1,105 @@
+import sys
+import os
+import queue
+import unittest
+import numpy as np
+import supervision as sv
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.acquisition.frame_ring_buffer import FrameRingBuffer
+from src.processing.inference_server import InferenceServerProcess, InferenceClient
+
+class FakeDetector:
+    """Returns one box per frame whose x1 is the frame's pixel value."""
+    def __init__(self):
+        self.batches = []
+
+    def detect_batch(self, frames, imgsz=None):
+        self.batches.append(len(frames))
+        return [
+            sv.Detections(xyxy=np.array([[float(f[0, 0, 0]), 0, 10, 10]]),
+                          confidence=np.array([0.9]), class_id=np.array([0]))
+            for f in frames
+        ]
+
+class TestInferenceServer(unittest.TestCase):
+    def setUp(self):
+        self.buffers = [FrameRingBuffer((8, 8, 3), slots=2) for _ in range(3)]
+        for value, buffer in enumerate(self.buffers):
+            buffer.write(np.full((8, 8, 3), value + 1, dtype=np.uint8))
+
+    def tearDown(self):
+        for buffer in self.buffers:
+            buffer.close()
+
+    def test_batches_across_groups(self):
+        request_queue = queue.Queue()
+        response_queues = {0: queue.Queue(), 1: queue.Queue()}
+        server = InferenceServerProcess(request_queue, response_queues, max_batch=8)
+
+        client_a = InferenceClient(0, request_queue, response_queues[0])
+        client_b = InferenceClient(1, request_queue, response_queues[1])
+        refs_a = [(c, b, b.latest_slot(), b.head_seq(), None, 640) for c, b in enumerate(self.buffers[:2])]
+        refs_b = [(2, self.buffers[2], self.buffers[2].latest_slot(), self.buffers[2].head_seq(), None, 640)]
+
+        # Queue both requests, then let the server handle them in one batch
+        client_a.request_id += 1
+        request_queue.put({'group_id': 0, 'request_id': client_a.request_id,
+                           'items': [(c, b.descriptor(), s, q, r, i) for c, b, s, q, r, i in refs_a]})
+        client_b.request_id += 1
+        request_queue.put({'group_id': 1, 'request_id': client_b.request_id,
+                           'items': [(c, b.descriptor(), s, q, r, i) for c, b, s, q, r, i in refs_b]})
+
+        detector = FakeDetector()
+        attached = {}
+        server._process(detector, attached, [request_queue.get(), request_queue.get()])
+        for buffer in attached.values():
+            buffer.close()
+
+        self.assertEqual(detector.batches, [3])
+        result_a = response_queues[0].get_nowait()['detections']
+        result_b = response_queues[1].get_nowait()['detections']
+        self.assertEqual([d.xyxy[0][0] for d in result_a], [1.0, 2.0])
+        self.assertEqual(result_b[0].xyxy[0][0], 3.0)
+
+    def test_overwritten_frames_are_stale(self):
+        request_queue, response_queue = queue.Queue(), queue.Queue()
+        server = InferenceServerProcess(request_queue, {0: response_queue})
+        buffer = self.buffers[0]
+        old = (0, buffer.descriptor(), buffer.latest_slot(), buffer.head_seq(), None, 640)
+        buffer.write(np.full((8, 8, 3), 9, dtype=np.uint8))
+        buffer.write(np.full((8, 8, 3), 9, dtype=np.uint8)) # 2 slots: the old frame is gone
+        new = (1, self.buffers[1].descriptor(), self.buffers[1].latest_slot(), self.buffers[1].head_seq(), None, 640)
+
+        detector = FakeDetector()
+        attached = {}
+        server._process(detector, attached, [{'group_id': 0, 'request_id': 1, 'items': [old, new]}])
+        self.assertEqual(detector.batches, [1])
+        detections = response_queue.get_nowait()['detections']
+        self.assertIsNone(detections[0])
+        self.assertEqual(detections[1].xyxy[0][0], 2.0)
+
+        # A camera's replaced ring is released
+        replacement = FrameRingBuffer((8, 8, 3), slots=2)
+        try:
+            replacement.write(np.full((8, 8, 3), 5, dtype=np.uint8))
+            previous = attached[1]
+            item = (1, replacement.descriptor(), replacement.latest_slot(), replacement.head_seq(), None, 640)
+            server._process(detector, attached, [{'group_id': 0, 'request_id': 2, 'items': [item]}])
+            self.assertEqual(attached[1].name, replacement.name)
+            self.assertIsNone(previous.shm.buf)
+            self.assertEqual(response_queue.get_nowait()['detections'][0].xyxy[0][0], 5.0)
+        finally:
+            for attached_buffer in attached.values():
+                attached_buffer.close()
+            replacement.close()
+
+    def test_client_timeout_marks_frames_stale(self):
+        client = InferenceClient(0, queue.Queue(), queue.Queue(), timeout=0.01)
+        refs = [(0, self.buffers[0], 0, 0, None, 640), (1, self.buffers[1], 0, 0, None, 640)]
+        self.assertEqual(client.detect_refs(refs), [None, None])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.processing.rate_scheduler import AdaptiveRateController
+from src.zones.zone_checker import ZoneChecker
+
+class TestAdaptiveRateController(unittest.TestCase):
+    def setUp(self):
+        fd, self.zones_path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, 'w') as f:
+            json.dump({"Desk": [[0, 0], [400, 0], [400, 400], [0, 400]]}, f)
+        self.zones = ZoneChecker(zones_path=self.zones_path)
+        self.controller = AdaptiveRateController(idle_fps=1.0, stationary_fps=3.0, active_fps=0.0,
+                                                 boundary_margin=50, moving_speed=30)
+
+    def tearDown(self):
+        os.remove(self.zones_path)
+
+    def test_idle_without_tracks(self):
+        self.assertEqual(self.controller.update([], self.zones, 0.0), 1.0)
+        self.assertEqual(self.controller.state, 'idle')
+        # No change, nothing to publish
+        self.assertIsNone(self.controller.update([], self.zones, 1.0))
+
+    def test_stationary_person_in_the_middle(self):
+        self.controller.update([(1, 200, 200)], self.zones, 0.0)
+        self.controller.update([(1, 202, 200)], self.zones, 1.0)
+        self.assertEqual(self.controller.state, 'stationary')
+        self.assertEqual(self.controller.rate, 3.0)
+
+    def test_near_boundary_or_moving_is_active(self):
+        self.controller.update([], self.zones, 0.0)
+        self.assertEqual(self.controller.update([(1, 390, 200)], self.zones, 1.0), 0.0)
+        self.assertEqual(self.controller.state, 'active')
+
+        self.controller.update([(2, 200, 200)], self.zones, 2.0)
+        self.assertEqual(self.controller.state, 'stationary')
+        self.controller.update([(2, 260, 200)], self.zones, 3.0)
+        self.assertEqual(self.controller.state, 'active')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import sys
+import os
+import unittest
+import numpy as np
+import supervision as sv
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tracking.person_tracker import PersonTracker
+
+def person(x, y, w=40, h=100):
+    return sv.Detections(
+        xyxy=np.array([[x, y, x + w, y + h]], dtype=np.float32),
+        confidence=np.array([0.9], dtype=np.float32),
+        class_id=np.array([0])
+    )
+
+def textured_frame(x, y, w=40, h=100, shape=(240, 320)):
+    """Flat background with a random texture patch (the 'person') at (x, y)."""
+    rng = np.random.default_rng(0)
+    frame = np.full(shape + (3,), 80, dtype=np.uint8)
+    frame[y:y + h, x:x + w] = rng.integers(0, 255, (h, w, 1), dtype=np.uint8)
+    return frame
+
+class TestTrackPropagation(unittest.TestCase):
+    def test_velocity_propagation_between_keyframes(self):
+        tracker = PersonTracker(propagation="velocity")
+        tracker.update(person(100, 50), timestamp=0.0)
+        tracked = tracker.update(person(110, 50), timestamp=1.0)
+        track_id = tracked.tracker_id[0]
+
+        # Halfway to the next keyframe the box has moved 5 px further
+        propagated = tracker.propagate(timestamp=1.5)
+        self.assertEqual(propagated.tracker_id[0], track_id)
+        np.testing.assert_allclose(propagated.xyxy[0], [115, 50, 155, 150], atol=0.5)
+
+        # Timestamps are relative to the last propagated frame
+        propagated = tracker.propagate(timestamp=2.0)
+        np.testing.assert_allclose(propagated.xyxy[0], [120, 50, 160, 150], atol=0.5)
+
+    def test_propagated_boxes_stay_in_the_frame(self):
+        tracker = PersonTracker(propagation="velocity")
+        tracker.update(person(250, 50), timestamp=0.0)
+        tracker.update(person(260, 50), timestamp=1.0)
+
+        # Walking out to the right of a 320x240 frame (downscaled 2x: 640x480 in zone coordinates)
+        propagated = tracker.propagate(np.zeros((240, 320, 3), dtype=np.uint8), timestamp=50.0, scale=(2.0, 2.0))
+        np.testing.assert_allclose(propagated.xyxy[0], [640, 50, 640, 150])
+        propagated = tracker.propagate(np.zeros((240, 320, 3), dtype=np.uint8), timestamp=60.0)
+        np.testing.assert_allclose(propagated.xyxy[0], [320, 50, 320, 150])
+
+    def test_new_track_does_not_move(self):
+        tracker = PersonTracker()
+        tracker.update(person(100, 50), timestamp=0.0)
+        propagated = tracker.propagate(timestamp=0.5)
+        np.testing.assert_allclose(propagated.xyxy[0], [100, 50, 140, 150])
+
+    def test_no_tracks_returns_empty(self):
+        tracker = PersonTracker()
+        self.assertEqual(len(tracker.propagate(timestamp=1.0)), 0)
+
+    def test_optical_flow_follows_content(self):
+        tracker = PersonTracker(propagation="flow")
+        tracker.update(person(100, 60), textured_frame(100, 60), timestamp=0.0)
+
+        propagated = tracker.propagate(textured_frame(106, 63), timestamp=0.1)
+        np.testing.assert_allclose(propagated.xyxy[0], [106, 63, 146, 163], atol=1.0)
+
+    def test_optical_flow_in_zone_coordinates(self):
+        # Frames downscaled 2x by the capture thread, boxes in native (zone) coordinates
+        tracker = PersonTracker(propagation="flow")
+        tracker.update(person(200, 120, 80, 200), textured_frame(100, 60), timestamp=0.0, scale=(2.0, 2.0))
+
+        propagated = tracker.propagate(textured_frame(106, 60), timestamp=0.1, scale=(2.0, 2.0))
+        np.testing.assert_allclose(propagated.xyxy[0], [212, 120, 292, 320], atol=2.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tracking.track_table import TrackTable
+
+class TestTrackTable(unittest.TestCase):
+    def test_slots_are_stable_and_grow(self):
+        table = TrackTable(["A"], capacity=2)
+        first = table.slots(np.array([10, 20]), 0.0)
+        more = table.slots(np.array([20, 30, 40]), 1.0)
+        self.assertEqual(more[0], first[1])
+        self.assertEqual(len(table), 4)
+        self.assertEqual(len(set(more.tolist()) | set(first.tolist())), 4)
+
+    def test_update_reports_zone_entries(self):
+        table = TrackTable(["A", "B"])
+        slots = table.slots(np.array([1, 2]), 0.0)
+        entered, exited = table.update(slots, np.array([5, 6]), np.array([7, 8]),
+                                       np.array([[True, False], [True, True]]), 0.0)
+        np.testing.assert_array_equal(entered, [[True, False], [True, True]])
+        self.assertFalse(exited.any())
+
+        # Staying inside is not an entry; leaving and coming back is
+        _, exited = table.update(slots, np.array([5, 6]), np.array([7, 8]), np.array([[True, False], [False, True]]), 1.0)
+        np.testing.assert_array_equal(exited, [[False, False], [True, False]])
+        entered, _ = table.update(slots, np.array([5, 6]), np.array([7, 8]), np.array([[True, True], [True, True]]), 2.0)
+        np.testing.assert_array_equal(entered, [[False, True], [True, False]])
+        np.testing.assert_array_equal(table.inside(slots), [[True, True], [True, True]])
+
+    def test_votes_confirm_identity(self):
+        table = TrackTable([])
+        slot = table.slots(np.array([1]), 0.0)[0]
+        self.assertTrue(table.unknown(np.array([slot]))[0])
+
+        self.assertIsNone(table.vote(slot, "Ana", 2))
+        self.assertEqual(table.vote(slot, "Ana", 2), "Unknown")
+        self.assertEqual(table.name(slot), "Ana")
+
+        # A different name needs its own consecutive votes
+        self.assertIsNone(table.vote(slot, "Luis", 2))
+        self.assertIsNone(table.vote(slot, "Ana", 2))
+        self.assertIsNone(table.vote(slot, "Luis", 2))
+        self.assertEqual(table.vote(slot, "Luis", 2), "Ana")
+        self.assertEqual(table.names_of([slot]), ["Luis"])
+
+    def test_vote_count_is_capped(self):
+        table = TrackTable([])
+        slot = table.slots(np.array([1]), 0.0)[0]
+        for _ in range(40000): # Past the int16 range
+            table.vote(slot, "Ana", 3)
+        self.assertEqual(table.rows['vote_count'][slot], 3)
+        self.assertEqual(table.name(slot), "Ana")
+
+    def test_face_retry_flag(self):
+        table = TrackTable(["A"])
+        slots = table.slots(np.array([1, 2]), 0.0)
+        table.set_face_retry(slots[1], True)
+        self.assertEqual(table.face_retry(slots).tolist(), [False, True])
+        table.set_face_retry(slots[1], False)
+        self.assertFalse(table.face_retry(slots).any())
+
+    def test_evicts_expired_tracks_and_reuses_slots(self):
+        table = TrackTable(["A"], ttl=10)
+        slots = table.slots(np.array([1, 2]), 0.0)
+        table.update(slots, np.array([5.0, 6.0]), np.array([7.0, 8.0]), np.array([[True], [False]]), 0.0)
+        table.update(slots[1:], np.array([6.0]), np.array([8.0]), np.array([[False]]), 5.0)
+
+        self.assertEqual(table.evict(9.0), [])
+        closed = table.evict(10.0)
+        self.assertEqual(len(closed), 1)
+        self.assertEqual(closed[0]['track_id'], 1)
+        self.assertEqual(closed[0]['zones'], ["A"])
+        self.assertEqual((closed[0]['x'], closed[0]['y']), (5.0, 7.0))
+        self.assertNotIn(1, table)
+
+        # The freed slot is reused by the next new track
+        self.assertEqual(table.slots(np.array([3]), 11.0)[0], slots[0])
+        self.assertEqual(table.name(slots[0]), "Unknown")
+
+    def test_set_zones_keeps_membership_by_name(self):
+        table = TrackTable(["A", "B"])
+        slots = table.slots(np.array([1]), 0.0)
+        table.update(slots, np.array([0.0]), np.array([0.0]), np.array([[True, True]]), 0.0)
+
+        self.assertEqual(table.set_zones(["C", "B"]), [(int(slots[0]), "A")])
+        np.testing.assert_array_equal(table.inside(slots), [[False, True]])
+        entered, _ = table.update(slots, np.array([0.0]), np.array([0.0]), np.array([[True, True]]), 1.0)
+        np.testing.assert_array_equal(entered, [[True, False]])
+
+    def test_smoothing(self):
+        table = TrackTable([])
+        slots = table.slots(np.array([1]), 0.0)
+        sx, sy = table.smooth(slots, np.array([10.0]), np.array([20.0]), 0.5)
+        self.assertEqual((sx[0], sy[0]), (10.0, 20.0)) # New track: raw position
+        table.update(slots, np.array([10.0]), np.array([20.0]), np.zeros((1, 0), dtype=bool), 0.0)
+        sx, sy = table.smooth(slots, np.array([20.0]), np.array([20.0]), 0.5)
+        self.assertEqual((sx[0], sy[0]), (15.0, 20.0))
+        table.update(slots, np.array([20.0]), np.array([20.0]), np.zeros((1, 0), dtype=bool), 1.0)
+        # The average continues from the smoothed position; the table keeps the raw one
+        sx, sy = table.smooth(slots, np.array([20.0]), np.array([20.0]), 0.5)
+        self.assertEqual((sx[0], sy[0]), (17.5, 20.0))
+        self.assertEqual((table.rows['x'][slots[0]], table.rows['y'][slots[0]]), (20.0, 20.0))
+
+    def test_debounce_by_frames(self):
+        table = TrackTable(["A"])
+        slots = table.slots(np.array([1]), 0.0)
+        raw = [1, 0, 1, 1, 1, 0, 1, 0, 0, 0]
+        confirmed = []
+        for t, flag in enumerate(raw):
+            inside = table.debounce(slots, np.array([[bool(flag)]]), float(t), min_frames=3)
+            table.update(slots, np.array([0.0]), np.array([0.0]), inside, float(t))
+            confirmed.append(int(inside[0, 0]))
+        # Flickers shorter than 3 frames are ignored
+        self.assertEqual(confirmed, [0, 0, 0, 0, 1, 1, 1, 1, 1, 0])
+
+    def test_debounce_by_dwell(self):
+        table = TrackTable(["A"])
+        slots = table.slots(np.array([1]), 0.0)
+        confirmed = []
+        for t in [0.0, 0.5, 1.0, 1.5]:
+            inside = table.debounce(slots, np.array([[True]]), t, min_dwell=1.0)
+            table.update(slots, np.array([0.0]), np.array([0.0]), inside, t)
+            confirmed.append(bool(inside[0, 0]))
+        self.assertEqual(confirmed, [False, False, True, True])
+
+    def test_size_stays_bounded(self):
+        table = TrackTable(["A"], ttl=1, capacity=4)
+        for t in range(1000):
+            table.slots(np.array([t]), float(t))
+            table.evict(float(t))
+        self.assertLessEqual(len(table), 2)
+        self.assertEqual(len(table.rows), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shapely.geometry import Point
+from src.zones.zone_checker import ZoneChecker, points_in_polygon
+from src.zones.zone_editor import ZoneEditor
+
+ZONES = {
+    "Desk": [[0, 0], [100, 0], [100, 100], [0, 100]],
+    "Line": [[50, 50], [200, 50], [120, 150]],  # Overlaps Desk
+}
+
+class TestZoneCheckerBatch(unittest.TestCase):
+    def setUp(self):
+        fd, self.zones_path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(ZONES, f)
+        self.zones = ZoneChecker(zones_path=self.zones_path)
+
+    def tearDown(self):
+        os.remove(self.zones_path)
+
+    def test_matches_single_point_check(self):
+        rng = np.random.default_rng(1)
+        xs, ys = rng.uniform(-20, 220, 500), rng.uniform(-20, 170, 500)
+        inside = self.zones.check_batch(xs, ys)
+        self.assertEqual(inside.shape, (500, 2))
+        for i in range(len(xs)):
+            expected = [self.zones.check(xs[i], ys[i])[name] for name in self.zones.names]
+            self.assertEqual(inside[i].tolist(), expected)
+
+    def test_overlapping_zones(self):
+        inside = self.zones.check_batch([75, 10, 150, 300], [60, 10, 70, 300])
+        np.testing.assert_array_equal(inside, [[True, True], [True, False], [False, True], [False, False]])
+
+    def test_empty_input(self):
+        self.assertEqual(self.zones.check_batch([], []).shape, (0, 2))
+
+    def test_numpy_ray_casting(self):
+        xs, ys = np.array([10.0, 150.0, 120.0]), np.array([10.0, 10.0, 140.0])
+        self.assertEqual(points_in_polygon(xs, ys, ZONES["Desk"]).tolist(), [True, False, False])
+        self.assertEqual(points_in_polygon(xs, ys, ZONES["Line"]).tolist(), [False, False, True])
+
+class TestZoneCheckerRaster(TestZoneCheckerBatch):
+    def setUp(self):
+        super().setUp()
+        self.shapely = self.zones
+        self.zones = ZoneChecker(zones_path=self.zones_path, mode="raster")
+
+    def test_matches_single_point_check(self):
+        # Away from the edges, where rasterization may round either way
+        rng = np.random.default_rng(1)
+        xs, ys = rng.uniform(-20, 220, 2000), rng.uniform(-20, 170, 2000)
+        expected = self.shapely.check_batch(xs, ys)
+        inside = self.zones.check_batch(xs, ys)
+        for z, name in enumerate(self.zones.names):
+            polygon = self.shapely.polygons[name]
+            far = np.array([polygon.exterior.distance(Point(x, y)) > 1.5 for x, y in zip(xs, ys)])
+            np.testing.assert_array_equal(inside[far, z], expected[far, z])
+
+    def test_overlapping_zones_share_pixels_as_bits(self):
+        masks = self.zones.masks_batch([75, 10, 150, 300], [60, 10, 70, 300])
+        self.assertEqual(masks.tolist(), [3, 1, 2, 0])
+        self.assertEqual(self.zones.raster.dtype, np.uint8)
+
+    def test_coarse_cells(self):
+        coarse = ZoneChecker(zones_path=self.zones_path, mode="raster", raster_cell=4)
+        self.assertEqual(coarse.raster.shape, (40, 52))
+        np.testing.assert_array_equal(coarse.check_batch([75, 300], [60, 300]), [[True, True], [False, False]])
+
+    def test_out_of_range_points_are_outside(self):
+        # Zone extent not a multiple of the cell size
+        with open(self.zones_path, 'w') as f:
+            json.dump({"Room": [[0, 0], [203, 0], [203, 203], [0, 203]]}, f)
+        coarse = ZoneChecker(zones_path=self.zones_path, mode="raster", raster_cell=4)
+        xs, ys = [5000, -300, 100, -1, 100, 210, 100], [100, 100, 5000, 100, -0.5, 100, 100]
+        np.testing.assert_array_equal(coarse.check_batch(xs, ys)[:, 0],
+                                      [False, False, False, False, False, False, True])
+        np.testing.assert_array_equal(coarse.masks_batch([], []), [])
+
+class TestPerCameraZones(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.zones_path = os.path.join(self.tmp_dir, "zonas.json")
+        with open(self.zones_path, 'w') as f:
+            json.dump({"Door": ZONES["Desk"], "Caja": {"Line": ZONES["Line"]}}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_shared_and_camera_zones(self):
+        self.assertEqual(ZoneChecker(zones_path=self.zones_path).names, ["Door"])
+        self.assertEqual(ZoneChecker(zones_path=self.zones_path, camera="Caja").names, ["Door", "Line"])
+        self.assertEqual(ZoneChecker(zones_path=self.zones_path, camera="Patio").names, ["Door"])
+
+    def test_reload_if_changed(self):
+        checker = ZoneChecker(zones_path=self.zones_path, camera="Patio", mode="raster")
+        self.assertFalse(checker.reload_if_changed())
+
+        # Zones of another camera do not count as a change
+        editor = ZoneEditor(output_path=self.zones_path, camera="Caja")
+        editor.points = [[0, 0], [10, 0], [10, 10]]
+        editor.save_zone("Small")
+        os.utime(self.zones_path, (0, 1))
+        self.assertFalse(checker.reload_if_changed())
+
+        editor = ZoneEditor(output_path=self.zones_path, camera="Patio")
+        editor.points = [[300, 300], [400, 300], [400, 400], [300, 400]]
+        editor.save_zone("Yard")
+        os.utime(self.zones_path, (0, 2))
+        self.assertTrue(checker.reload_if_changed())
+        self.assertEqual(checker.names, ["Door", "Yard"])
+        self.assertEqual(checker.check_batch([350], [350]).tolist(), [[False, True]])
+
+        with open(self.zones_path) as f:
+            data = json.load(f)
+        self.assertEqual(set(data["Caja"]), {"Line", "Small"})
+
+    def test_broken_file_keeps_zones(self):
+        checker = ZoneChecker(zones_path=self.zones_path)
+        with open(self.zones_path, 'w') as f:
+            f.write("{")
+        os.utime(self.zones_path, (0, 1))
+        self.assertFalse(checker.reload_if_changed())
+        self.assertEqual(checker.names, ["Door"])
+
+    def test_invalid_zones_keep_zones(self):
+        for mode in ("shapely", "raster"):
+            checker = ZoneChecker(zones_path=self.zones_path, mode=mode)
+            with open(self.zones_path) as f:
+                data = json.load(f)
+            # More zones than a track's 64-bit membership mask
+            too_many = dict(data, **{f"Z{i}": [[i, 0], [i + 1, 0], [i + 1, 1]] for i in range(64)})
+            with open(self.zones_path, 'w') as f:
+                json.dump(too_many, f)
+            os.utime(self.zones_path, (0, 1))
+            self.assertFalse(checker.reload_if_changed())
+            self.assertEqual(checker.names, ["Door"])
+            self.assertEqual(checker.check_batch([50], [50]).shape, (1, 1))
+
+            # A zone that is not a polygon
+            with open(self.zones_path, 'w') as f:
+                json.dump(dict(data, Line=[[0, 0], [1, 1]]), f)
+            os.utime(self.zones_path, (0, 2))
+            self.assertFalse(checker.reload_if_changed())
+            self.assertEqual(checker.names, ["Door"])
+
+            with open(self.zones_path, 'w') as f:
+                json.dump(data, f)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import sys
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tracking.track_table import TrackTable
+from src.tracking.zone_events import ZoneEventEmitter
+from src.analysis.efficiency_calculator import EfficiencyCalculator
+
+def run(emitter, frames, zones=("A", "B"), ttl=5.0):
+    """Feeds (timestamp, {track_id: (x, y, inside_A, inside_B)}) frames; returns all records."""
+    table = TrackTable(zones, ttl=ttl)
+    records = []
+    for now, tracks in frames:
+        if tracks:
+            ids = np.array(list(tracks), dtype=np.int64)
+            values = np.array(list(tracks.values()), dtype=np.float64)
+            slots = table.slots(ids, now)
+            frame_records, _ = emitter.emit(table, slots, ids, values[:, 0], values[:, 1],
+                                            values[:, 2:].astype(bool), now)
+            records.extend(frame_records)
+        for track in table.evict(now):
+            records.extend(emitter.closed(track))
+    return records
+
+def visits(records):
+    """Visits as EfficiencyCalculator rebuilds them from the tracking table."""
+    df = pd.DataFrame(records)
+    # Stored like SQLAlchemy does in sqlite
+    df['timestamp'] = [datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S.%f') for t in df['timestamp']]
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(db_path)
+        df.to_sql('tracking', conn, index=False)
+        conn.close()
+        result = EfficiencyCalculator(db_path=db_path).calculate_efficiency()
+    finally:
+        os.remove(db_path)
+    return result[['track_id', 'zone', 'start_time', 'end_time', 'duration_sec']].sort_values(
+        ['track_id', 'zone', 'start_time']).reset_index(drop=True)
+
+class TestZoneEventEmitter(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        start = 1_700_000_000.0
+        self.frames = []
+        for i in range(300):
+            now = start + i * 0.1
+            tracks = {}
+            if i < 250:
+                # Track 7 wanders in and out of A; B only in the middle
+                inside_a = (i // 37) % 2 == 0
+                tracks[7] = (rng.uniform(0, 100), rng.uniform(0, 100), inside_a, 100 <= i < 180)
+            if 20 <= i < 120:
+                tracks[8] = (rng.uniform(0, 100), rng.uniform(0, 100), i % 50 > 10, False)
+            self.frames.append((now, tracks))
+
+    def test_transitions_rebuild_the_same_visits(self):
+        per_frame = run(ZoneEventEmitter("frames"), self.frames)
+        transitions = run(ZoneEventEmitter("transitions", sample_fps=1.0), self.frames)
+        self.assertLess(len(transitions), len(per_frame) / 4)
+        pd.testing.assert_frame_equal(visits(transitions), visits(per_frame))
+
+    def test_only_transitions_without_samples(self):
+        per_frame = run(ZoneEventEmitter("frames"), self.frames)
+        transitions = run(ZoneEventEmitter("transitions", sample_fps=0), self.frames)
+        pd.testing.assert_frame_equal(visits(transitions), visits(per_frame))
+
+    def test_transition_records(self):
+        emitter = ZoneEventEmitter("transitions", sample_fps=1.0)
+        frames = [(float(t), {1: (t, 0, 1 <= t <= 4, False)}) for t in range(7)]
+        records = [(r['timestamp'], r['zone'], r['inside_zone']) for r in run(emitter, frames)]
+        # Entry at 1, sample at 2..4 (1 fps), exit at 5
+        self.assertEqual(records, [(1.0, "A", 1), (2.0, "A", 1), (3.0, "A", 1), (4.0, "A", 1), (5.0, "A", 0)])
+
+    def test_evicted_track_closes_its_visit(self):
+        emitter = ZoneEventEmitter("transitions", sample_fps=0)
+        frames = [(float(t), {1: (t, 0, True, False)} if t < 4 else {}) for t in range(12)]
+        records = [(r['timestamp'], r['x'], r['inside_zone']) for r in run(emitter, frames, ttl=5.0)]
+        self.assertEqual(records, [(0.0, 0.0, 1), (3.0, 3.0, 1)])
+
+    def test_removed_zone_closes_its_visit(self):
+        emitter = ZoneEventEmitter("transitions", sample_fps=0)
+        table = TrackTable(["A", "B"])
+        for now in (0.0, 1.0, 2.0):
+            slots = table.slots(np.array([1]), now)
+            emitter.emit(table, slots, np.array([1]), np.array([now]), np.array([0.0]),
+                         np.array([[True, True]]), now)
+
+        dropped = table.set_zones(["B"])
+        self.assertEqual(dropped, [(int(slots[0]), "A")])
+        records = [(r['timestamp'], r['zone'], r['inside_zone']) for r in emitter.removed(table, dropped)]
+        # Last frame inside, then the exit
+        self.assertEqual(records, [(2.0, "A", 1), (2.0, "A", 0)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import sys
+import os
+import unittest
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.detection.batch_scheduler import BatchScheduler
+
+class TestBatchScheduler(unittest.TestCase):
+    def test_closes_batch_when_full(self):
+        scheduler = BatchScheduler(max_batch=3, max_wait=10.0)
+        arrivals = [[1], [2, 3], [4]]
+        batch = scheduler.collect(lambda timeout: arrivals.pop(0) if arrivals else [])
+        self.assertEqual(batch, [1, 2, 3])
+
+    def test_closes_batch_at_deadline(self):
+        scheduler = BatchScheduler(max_batch=8, max_wait=0.02)
+        calls = []
+
+        def poll(timeout):
+            calls.append(timeout)
+            return [len(calls)] if len(calls) == 1 else []
+
+        batch = scheduler.collect(poll)
+        self.assertEqual(batch, [1])
+        self.assertGreater(len(calls), 1)
+        self.assertTrue(all(t <= 0.02 for t in calls[1:]))
+
+    def test_idle_returns_empty(self):
+        scheduler = BatchScheduler(max_batch=4, max_wait=0.01, idle_timeout=0.0)
+        self.assertEqual(scheduler.collect(lambda timeout: []), [])
+
+    def test_stats(self):
+        scheduler = BatchScheduler(max_batch=4)
+        scheduler.record(4, 0.010)
+        scheduler.record(2, 0.030)
+        stats = scheduler.stats()
+        self.assertEqual(stats['batches'], 2)
+        self.assertAlmostEqual(stats['avg_batch'], 3.0)
+        self.assertAlmostEqual(stats['fill_ratio'], 0.75)
+        self.assertAlmostEqual(stats['avg_latency_ms'], 20.0)
+        # Stats are reset after reading
+        self.assertEqual(scheduler.stats()['batches'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
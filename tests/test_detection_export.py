@@ -0,0 +1,66 @@
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.detection import person_detector
+from src.detection.person_detector import export_model
+
+class FakeYOLO:
+    """Writes the export next to the loaded model, like ultralytics, slowly."""
+    exports = 0
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+
+    def export(self, format, dynamic):
+        FakeYOLO.exports += 1
+        path = os.path.splitext(self.model_path)[0] + ".onnx"
+        with open(path, 'w') as f:
+            f.write("partial")
+            time.sleep(0.2)
+            f.write(" done")
+        return path
+
+class TestExportModel(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.bundled_dir = os.path.join(self.tmp_dir, "bundled")
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        os.makedirs(self.bundled_dir)
+        self.model_path = os.path.join(self.bundled_dir, "yolov8n.pt")
+        with open(self.model_path, 'w') as f:
+            f.write("weights")
+        FakeYOLO.exports = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_concurrent_exports_run_once(self):
+        results = []
+        with patch.object(person_detector, 'YOLO', FakeYOLO):
+            threads = [threading.Thread(target=lambda: results.append(export_model(self.model_path, 'onnx', self.cache_dir)))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        cached_path = os.path.join(self.cache_dir, "yolov8n.onnx")
+        self.assertEqual(FakeYOLO.exports, 1)
+        self.assertEqual(results, [cached_path] * 4)
+        with open(cached_path) as f:
+            self.assertEqual(f.read(), "partial done")
+        # Nothing written next to the bundled model, no temp dirs or locks left
+        self.assertEqual(os.listdir(self.bundled_dir), ["yolov8n.pt"])
+        self.assertEqual(os.listdir(self.cache_dir), ["yolov8n.onnx"])
+
+if __name__ == '__main__':
+    unittest.main()
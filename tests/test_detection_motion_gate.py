@@ -0,0 +1,33 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.detection.motion_gate import MotionGate
+
+class TestMotionGate(unittest.TestCase):
+    def setUp(self):
+        self.gate = MotionGate(width=64, heartbeat=10.0)
+        self.static = np.full((240, 320, 3), 80, dtype=np.uint8)
+
+    def test_static_scene_is_skipped_until_heartbeat(self):
+        self.assertTrue(self.gate.should_detect(self.static, now=0.0))  # First frame always runs
+        self.assertFalse(self.gate.should_detect(self.static, now=1.0))
+        self.assertFalse(self.gate.should_detect(self.static, now=9.0))
+        self.assertTrue(self.gate.should_detect(self.static, now=10.5))  # Heartbeat
+
+    def test_motion_triggers_detection(self):
+        self.gate.should_detect(self.static, now=0.0)
+        moved = self.static.copy()
+        moved[60:180, 100:160] = 255
+        self.assertTrue(self.gate.should_detect(moved, now=1.0))
+
+    def test_active_tracks_keep_detection_running(self):
+        self.gate.should_detect(self.static, now=0.0)
+        self.assertTrue(self.gate.should_detect(self.static, has_tracks=True, now=1.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.detection.quantization import count_matches, format_report, letterbox
+
+class TestQuantizationReport(unittest.TestCase):
+    def test_count_matches_is_one_to_one(self):
+        ref = np.array([[0, 0, 10, 10], [20, 20, 30, 30]], dtype=float)
+        # Two candidates overlap the first box, none the second
+        cand = np.array([[0, 0, 10, 11], [1, 0, 10, 10]], dtype=float)
+        self.assertEqual(count_matches(ref, cand, 0.5), 1)
+
+    def test_count_matches_threshold(self):
+        ref = np.array([[0, 0, 10, 10]], dtype=float)
+        cand = np.array([[5, 5, 15, 15]], dtype=float)
+        self.assertEqual(count_matches(ref, cand, 0.5), 0)
+        self.assertEqual(count_matches(ref, cand, 0.1), 1)
+
+    def test_letterbox_shape(self):
+        blob = letterbox(np.zeros((480, 640, 3), dtype=np.uint8), size=320)
+        self.assertEqual(blob.shape, (1, 3, 320, 320))
+        self.assertEqual(blob.dtype, np.float32)
+        # Padding rows keep the gray value
+        self.assertAlmostEqual(float(blob[0, 0, 0, 0]), 114 / 255.0, places=5)
+
+    def test_format_report_without_frames(self):
+        report = {'frames': 0, 'fp32_model': 'a.onnx', 'int8_model': 'a_int8.onnx',
+                  'reference_people': 0, 'candidate_people': 0, 'iou_threshold': 0.5,
+                  'recall': None, 'precision': None,
+                  'reference_ms': None, 'reference_p95_ms': None,
+                  'candidate_ms': None, 'candidate_p95_ms': None,
+                  'evaluated_on_calibration': True}
+        text = format_report(report)
+        self.assertIn("Latency FP32: n/a ms/frame", text)
+        self.assertIn("Speedup: n/a", text)
+        self.assertIn("calibration set", text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import sys
+import os
+import unittest
+import numpy as np
+import supervision as sv
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.detection.roi import compute_rois, crop, merge_detections
+
+class TestZoneRoi(unittest.TestCase):
+    def setUp(self):
+        self.shape = (1000, 2000, 3)
+        # Two small zones far apart
+        self.bounds = [(100, 100, 200, 200), (1700, 700, 1800, 800)]
+
+    def test_crop_mode_uses_union(self):
+        rois = compute_rois(self.bounds, self.shape, mode="crop", padding=0.05, max_coverage=1.0)
+        self.assertEqual(rois, [(50, 50, 1850, 850)])
+
+    def test_tiles_mode_keeps_zones_apart(self):
+        rois = compute_rois(self.bounds, self.shape, mode="tiles", padding=0.05)
+        self.assertEqual(rois, [(50, 50, 250, 250), (1650, 650, 1850, 850)])
+
+    def test_large_rois_fall_back_to_full_frame(self):
+        rois = compute_rois(self.bounds, self.shape, mode="crop", padding=0.05, max_coverage=0.5)
+        self.assertEqual(rois, [None])
+        self.assertEqual(compute_rois(self.bounds, self.shape, mode="off"), [None])
+
+    def test_crop_is_view_and_merge_shifts_boxes(self):
+        frame = np.zeros(self.shape, dtype=np.uint8)
+        rois = [(50, 50, 250, 250), (1650, 650, 1850, 850)]
+        view = crop(frame, rois[1])
+        self.assertEqual(view.shape, (200, 200, 3))
+        self.assertTrue(np.shares_memory(view, frame))
+
+        dets = [
+            sv.Detections(xyxy=np.array([[10.0, 10.0, 20.0, 20.0]]), confidence=np.array([0.9]), class_id=np.array([0])),
+            sv.Detections(xyxy=np.array([[0.0, 0.0, 5.0, 5.0]]), confidence=np.array([0.8]), class_id=np.array([0])),
+        ]
+        merged = merge_detections(dets, rois)
+        self.assertEqual(len(merged), 2)
+        np.testing.assert_array_equal(merged.xyxy[0], [60, 60, 70, 70])
+        np.testing.assert_array_equal(merged.xyxy[1], [1650, 650, 1655, 655])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.recognition.face_gallery import FaceGallery
+
+def brute_force(gallery, queries, k):
+    distances = np.linalg.norm(gallery[None, :, :] - queries[:, None, :], axis=2)
+    return np.argsort(distances, axis=1)[:, :k], np.sort(distances, axis=1)[:, :k]
+
+class TestFaceGallery(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.encodings = rng.normal(0, 0.1, (500, 128)).astype(np.float32)
+        self.names = [f"emp_{i}" for i in range(500)]
+        self.queries = self.encodings[::25] + rng.normal(0, 0.01, (20, 128)).astype(np.float32)
+
+    def test_exact_top_k_matches_brute_force(self):
+        gallery = FaceGallery(self.encodings, self.names)
+        names, distances = gallery.search(self.queries, k=5)
+        indices, expected = brute_force(self.encodings, self.queries, 5)
+        self.assertEqual(names, [[self.names[j] for j in row] for row in indices])
+        np.testing.assert_allclose(distances, expected, atol=1e-4)
+
+    def test_match_applies_tolerance(self):
+        gallery = FaceGallery(self.encodings[:3], self.names[:3])
+        far = np.full(128, 5.0)
+        self.assertEqual(gallery.match([self.encodings[1], far], tolerance=0.6), ["emp_1", "Unknown"])
+
+    def test_ivf_recall(self):
+        gallery = FaceGallery(self.encodings, self.names, index="ivf", nlist=16, nprobe=4)
+        self.assertEqual(sum(len(rows) for rows in gallery.lists), len(self.encodings))
+        self.assertEqual(gallery.match(self.queries), [self.names[i] for i in range(0, 500, 25)])
+        # Probing every list is exact
+        gallery.nprobe = 16
+        names, distances = gallery.search(self.queries, k=3)
+        np.testing.assert_allclose(distances, brute_force(self.encodings, self.queries, 3)[1], atol=1e-4)
+
+    def test_empty_and_small_galleries(self):
+        empty = FaceGallery()
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty.match(self.queries[:2]), ["Unknown", "Unknown"])
+        names, distances = FaceGallery(self.encodings[:2], self.names[:2], index="ivf").search(self.queries[:1], k=5)
+        self.assertEqual(distances.shape, (1, 2))
+        self.assertEqual(sorted(names[0]), ["emp_0", "emp_1"])
+
+if __name__ == '__main__':
+    unittest.main()
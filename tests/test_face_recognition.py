@@ -71,9 +71,101 @@ class TestFaceRecognizer(unittest.TestCase):
         self.assertEqual(name, "TestPerson")
 
         # Case 2: No Match
-        face_recognition.compare_faces.return_value = [False]
+        face_recognition.face_encodings.return_value = [[0.9, 0.9, 0.9]]
         name = recognizer.recognize_face(frame)
         self.assertEqual(name, "Unknown")
 
+    def test_recognize_batch(self):
+        # The mocks bound by the recognizer module (other test modules replace sys.modules entries)
+        from recognition import face_recognizer as module
+        face_recognition, np = module.face_recognition, module.np
+
+        recognizer = FaceRecognizer(faces_dir=self.faces_dir, encodings_file=self.encodings_file)
+        recognizer.known_face_encodings = [[0.1, 0.2, 0.3], [0.9, 0.9, 0.9]]
+        recognizer.known_face_names = ["TestPerson", "Other"]
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+
+        # No face in the second box: it is not encoded
+        face_recognition.face_locations.side_effect = [[(10, 10, 50, 50)], [], [(10, 10, 50, 50)]]
+        face_recognition.face_encodings.side_effect = [[[0.9, 0.9, 0.9]], [[0.1, 0.2, 0.3]]]
+        face_recognition.face_encodings.reset_mock()
+        try:
+            names = recognizer.recognize_batch([frame] * 3, [(0, 0, 50, 50), (50, 0, 100, 50), None])
+        finally:
+            face_recognition.face_locations.side_effect = None
+            face_recognition.face_encodings.side_effect = None
+        self.assertEqual(names, ["Other", "Unknown", "TestPerson"])
+        self.assertEqual(face_recognition.face_encodings.call_count, 2)
+        self.assertEqual(recognizer.recognize_batch([], []), [])
+
+    def test_box_outside_the_frame_has_no_face(self):
+        from recognition import face_recognizer as module
+        face_recognition, np = module.face_recognition, module.np
+
+        recognizer = FaceRecognizer(faces_dir=self.faces_dir, encodings_file=self.encodings_file)
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        face_recognition.face_locations.return_value = [(10, 30, 25, 5)]
+        face_recognition.face_locations.reset_mock()
+        face_recognition.face_encodings.return_value = [[0.1, 0.2, 0.3]]
+
+        encodings, rejected = recognizer.encode_batch([frame, frame], [(120, 10, 160, 50), (0, 0, 50, 50)])
+        self.assertIsNone(encodings[0])
+        self.assertIsNotNone(encodings[1])
+        self.assertEqual(rejected, [False, False])
+        # Only the box inside the frame is searched
+        self.assertEqual(face_recognition.face_locations.call_count, 1)
+
+    def test_head_region_is_downscaled_for_localization(self):
+        from recognition import face_recognizer as module
+        face_recognition, np = module.face_recognition, module.np
+
+        recognizer = FaceRecognizer(faces_dir=self.faces_dir, encodings_file=self.encodings_file,
+                                    head_fraction=0.5, locate_size=50)
+        frame = np.zeros((300, 300, 3), dtype=np.uint8)
+        face_recognition.face_locations.return_value = [(10, 30, 25, 5)]
+        face_recognition.face_encodings.return_value = [[0.1, 0.2, 0.3]]
+        face_recognition.face_encodings.reset_mock()
+        module.cv2.resize.reset_mock()
+
+        recognizer.encode_batch([frame], [(100, 0, 200, 200)])
+        # Head = top 100 px of the box, located at half size, encoded at full size
+        crop = module.cv2.resize.call_args[0][0]
+        self.assertEqual(crop.shape, (100, 100, 3))
+        self.assertEqual(module.cv2.resize.call_args[1]['fx'], 0.5)
+        self.assertEqual(face_recognition.face_encodings.call_args[0][1], [(20, 60, 50, 10)])
+
+    def test_quality_gate(self):
+        from recognition import face_recognizer as module
+        face_recognition, np = module.face_recognition, module.np
+
+        recognizer = FaceRecognizer(faces_dir=self.faces_dir, encodings_file=self.encodings_file,
+                                    min_face_size=40, min_sharpness=50.0, max_yaw=0.35)
+        recognizer.known_face_encodings = [[0.1, 0.2, 0.3]]
+        recognizer.known_face_names = ["TestPerson"]
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        face_recognition.face_encodings.return_value = [[0.1, 0.2, 0.3]]
+        face_recognition.face_landmarks.return_value = [
+            {'left_eye': [(20, 30), (30, 30)], 'right_eye': [(50, 30), (60, 30)], 'nose_tip': [(40, 50)]}]
+        module.cv2.Laplacian.return_value.var.return_value = 100.0
+
+        def recognize(location):
+            face_recognition.face_locations.return_value = [location]
+            face_recognition.face_encodings.reset_mock()
+            return recognizer.recognize_batch([frame], [None])[0]
+
+        self.assertEqual(recognize((10, 80, 80, 10)), "TestPerson")
+        # Too small: not encoded, no answer (retry later)
+        self.assertIsNone(recognize((10, 40, 30, 10)))
+        self.assertEqual(face_recognition.face_encodings.call_count, 0)
+        # Blurry
+        module.cv2.Laplacian.return_value.var.return_value = 10.0
+        self.assertIsNone(recognize((10, 80, 80, 10)))
+        module.cv2.Laplacian.return_value.var.return_value = 100.0
+        # Head turned: nose far from the middle of the eyes
+        face_recognition.face_landmarks.return_value[0]['nose_tip'] = [(60, 50)]
+        self.assertIsNone(recognize((10, 80, 80, 10)))
+        self.assertEqual(recognizer.rejected, {'size': 1, 'blur': 1, 'pose': 1})
+        self.assertEqual(recognizer.recognize_face(frame), "Unknown")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,84 @@
+import sys
+import os
+import glob
+import time
+import argparse
+import numpy as np
+import cv2
+
+# Add project root to path to import src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(current_dir)
+sys.path.append(root_dir)
+
+from src.detection.person_detector import PersonDetector
+
+def load_frames(limit):
+    """Snapshots if there are any, otherwise the zone reference frame."""
+    paths = sorted(glob.glob(os.path.join(root_dir, 'data', 'snapshots', '*.jpg')))[:limit]
+    if not paths:
+        paths = [os.path.join(root_dir, 'data', 'zonas', 'frame_referencia.jpg')]
+    frames = [cv2.imread(p) for p in paths]
+    return [f for f in frames if f is not None]
+
+def benchmark(detector, frames, batch_size, iterations, warmup=3):
+    batches = [[frames[(i * batch_size + j) % len(frames)] for j in range(batch_size)] for i in range(iterations)]
+
+    for batch in batches[:warmup]:
+        detector.detect_batch(batch)
+
+    latencies = []
+    people = 0
+    for batch in batches:
+        start = time.perf_counter()
+        results = detector.detect_batch(batch)
+        latencies.append((time.perf_counter() - start) * 1000)
+        people += sum(len(d) for d in results)
+
+    latencies = np.array(latencies)
+    return {
+        'batch_ms': latencies.mean(),
+        'p95_ms': np.percentile(latencies, 95),
+        'frame_ms': latencies.mean() / batch_size,
+        'people': people / (iterations * batch_size),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PersonDetector latency across backends.")
+    parser.add_argument('--model', default=None, help="PyTorch weights (default: bundled yolov8n.pt)")
+    parser.add_argument('--backends', default='pytorch,onnx,openvino')
+    parser.add_argument('--batch-sizes', default='1,4')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--frames', type=int, default=32, help="Max snapshots to load")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    if not frames:
+        print("❌ No frames found to benchmark.")
+        return
+    print(f"Loaded {len(frames)} frame(s) of size {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    rows = []
+    for backend in args.backends.split(','):
+        detector = PersonDetector(model_path=args.model, backend=backend)
+        if detector.backend != backend:
+            print(f"⚠️ Skipping {backend}: not available")
+            continue
+        for batch_size in [int(b) for b in args.batch_sizes.split(',')]:
+            result = benchmark(detector, frames, batch_size, args.iterations)
+            rows.append((backend, batch_size, result))
+
+    print()
+    print(f"{'backend':<10} {'batch':>5} {'batch ms':>10} {'p95 ms':>10} {'ms/frame':>10} {'people/frame':>13}")
+    for backend, batch_size, r in rows:
+        print(f"{backend:<10} {batch_size:>5} {r['batch_ms']:>10.1f} {r['p95_ms']:>10.1f} {r['frame_ms']:>10.1f} {r['people']:>13.2f}")
+
+    baseline = {b: r['frame_ms'] for backend, b, r in rows if backend == 'pytorch'}
+    if baseline:
+        print()
+        for backend, batch_size, r in rows:
+            if backend != 'pytorch' and batch_size in baseline:
+                print(f"{backend} batch {batch_size}: {baseline[batch_size] / r['frame_ms']:.2f}x vs pytorch")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+# Add project root to path to import src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(current_dir)
+sys.path.append(root_dir)
+
+from src.recognition.face_gallery import FaceGallery
+
+def legacy_match(encodings, names, query, tolerance):
+    """Previous per-face matching: compare_faces + face_distance over a list of arrays."""
+    matches = list(np.linalg.norm(np.array(encodings) - query, axis=1) <= tolerance)
+    distances = np.linalg.norm(np.array(encodings) - query, axis=1)
+    best = np.argmin(distances)
+    return names[best] if matches[best] else "Unknown"
+
+def queries_per_second(fn, queries, repeat):
+    fn(queries[:1])  # Warmup
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(queries)
+    return repeat * len(queries) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare face gallery matching throughput (faces/sec).")
+    parser.add_argument('--sizes', default='10,1000,50000', help="Gallery sizes (known faces)")
+    parser.add_argument('--queries', type=int, default=32, help="Faces matched per call")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--nprobe', type=int, default=8)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'gallery':>8} {'legacy':>12} {'exact':>12} {'ivf':>12} {'ivf build':>10} {'ivf recall':>11}")
+    for size in [int(n) for n in args.sizes.split(',')]:
+        encodings = [e for e in rng.normal(0, 0.1, (size, 128))]
+        names = [f"emp_{i}" for i in range(size)]
+        # Queries are noisy views of known faces
+        picks = rng.integers(0, size, args.queries)
+        queries = (np.array(encodings)[picks] + rng.normal(0, 0.02, (args.queries, 128))).astype(np.float32)
+
+        exact = FaceGallery(encodings, names)
+        start = time.perf_counter()
+        ivf = FaceGallery(encodings, names, index="ivf", nprobe=args.nprobe)
+        build = time.perf_counter() - start
+
+        def legacy(batch):
+            return [legacy_match(encodings, names, q, 0.6) for q in batch]
+
+        # The per-face list path is slow; keep its total work comparable
+        legacy_repeat = max(1, args.repeat * 1000 // max(size, 1000))
+        rates = [queries_per_second(legacy, queries, legacy_repeat),
+                 queries_per_second(exact.match, queries, args.repeat),
+                 queries_per_second(ivf.match, queries, args.repeat)]
+        recall = np.mean(np.array(ivf.search(queries)[0]) == np.array(exact.search(queries)[0]))
+        print(f"{size:>8,} " + " ".join(f"{r:>12,.0f}" for r in rates) + f" {build:>9.2f}s {recall:>10.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+# Add project root to path to import src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(current_dir)
+sys.path.append(root_dir)
+
+from src.zones.zone_checker import ZoneChecker
+from src.paths import get_user_data_path
+
+def lookups_per_second(fn, xs, ys, repeat):
+    fn(xs, ys)  # Warmup (and raster caches)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(xs, ys)
+    return repeat * len(xs) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare zone membership lookups/sec of ZoneChecker modes.")
+    parser.add_argument('--zones', default=None, help="Zones JSON (default: data/zonas/zonas.json)")
+    parser.add_argument('--tracks', default='1,30,1000', help="Points per call (tracks per frame)")
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    zones_path = args.zones or get_user_data_path("data/zonas/zonas.json")
+    shapely_checker = ZoneChecker(zones_path=zones_path)
+    raster_checker = ZoneChecker(zones_path=zones_path, mode="raster")
+    print(f"{len(shapely_checker.names)} zone(s), raster {raster_checker.raster.shape[1]}x{raster_checker.raster.shape[0]} "
+          f"({raster_checker.raster.nbytes / 1024:.0f} KiB, {raster_checker.raster.dtype})")
+
+    h, w = raster_checker.raster.shape
+    rng = np.random.default_rng(0)
+
+    def per_point(xs, ys):
+        for x, y in zip(xs, ys):
+            shapely_checker.check(x, y)
+
+    methods = [
+        ('check() per point', per_point),
+        ('check_batch shapely', shapely_checker.check_batch),
+        ('check_batch raster', raster_checker.check_batch),
+    ]
+
+    print()
+    print(f"{'method':<22} " + " ".join(f"{f'{n} pts':>14}" for n in args.tracks.split(',')))
+    for label, fn in methods:
+        rates = []
+        for n in [int(n) for n in args.tracks.split(',')]:
+            xs, ys = rng.uniform(0, w, n), rng.uniform(0, h, n)
+            # Per-point lookups are slow; keep their total work comparable
+            repeat = max(1, args.repeat // n) if fn is per_point else args.repeat
+            rates.append(lookups_per_second(fn, xs, ys, repeat))
+        print(f"{label:<22} " + " ".join(f"{r:>14,.0f}" for r in rates))
+
+if __name__ == "__main__":
+    main()
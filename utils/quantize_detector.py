@@ -0,0 +1,39 @@
+import sys
+import os
+import argparse
+
+# Add project root to path to import src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(current_dir)
+sys.path.append(root_dir)
+
+from src.detection.quantization import quantize_and_report
+from src.paths import get_bundled_resource_path, get_user_data_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an INT8 person detector calibrated on our snapshots and compare it with FP32.")
+    parser.add_argument('--model', default=get_bundled_resource_path("models/yolov8/yolov8n.pt"), help="FP32 PyTorch weights")
+    parser.add_argument('--snapshots', default=get_user_data_path("data/snapshots"), help="Calibration/evaluation images")
+    parser.add_argument('--calibration-images', type=int, default=200)
+    parser.add_argument('--eval-images', type=int, default=100)
+    parser.add_argument('--iou', type=float, default=0.5, help="IoU needed to count an FP32 person as found")
+    parser.add_argument('--confidence', type=float, default=0.4)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.snapshots):
+        print(f"Error: Snapshots folder '{args.snapshots}' not found.")
+        return
+
+    report = quantize_and_report(
+        args.model,
+        args.snapshots,
+        limit=args.calibration_images,
+        eval_limit=args.eval_images,
+        iou_threshold=args.iou,
+        confidence_threshold=args.confidence,
+    )
+    print("Use it with DETECTOR_BACKEND=onnx_int8" if report['recall'] is None or report['recall'] >= 0.95
+          else "⚠️ Recall dropped more than 5% against FP32; review before rolling out.")
+
+if __name__ == "__main__":
+    main()